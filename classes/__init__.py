@@ -1,11 +1,15 @@
 from .encryption import HardwareEncryption, PasswordEncryption, EncryptionConfig
 from .roblox_api import RobloxAPI
 from .account_manager import RobloxAccountManager
+from .cookie_importer import CookieImporter
+from .vault_export import VaultExporter
 
 __all__ = [
     'HardwareEncryption',
     'PasswordEncryption',
     'EncryptionConfig',
     'RobloxAPI',
-    'RobloxAccountManager'
+    'RobloxAccountManager',
+    'CookieImporter',
+    'VaultExporter'
 ]
@@ -12,16 +12,39 @@ import hashlib
 import shutil
 import traceback
 import threading
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import WebDriverException
-from webdriver_manager.chrome import ChromeDriverManager
 
 from .encryption import HardwareEncryption, PasswordEncryption, EncryptionConfig
 from .roblox_api import RobloxAPI
 
 
+# URL patterns blocked through DevTools while the login page loads.
+# Only third-party trackers, fonts and Roblox thumbnail/image CDNs are listed here,
+# the captcha provider and Roblox's own scripts/CSS must keep loading for login to work.
+DEFAULT_BLOCKED_URL_PATTERNS = [
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*googlesyndication.com*",
+    "*googleadservices.com*",
+    "*doubleclick.net*",
+    "*adservice.google.com*",
+    "*facebook.net*",
+    "*connect.facebook.com*",
+    "*hotjar.com*",
+    "*branch.io*",
+    "*ecsv2.roblox.com*",
+    "*metrics.roblox.com*",
+    "*ephemeralcounters.api.roblox.com*",
+    "*tr.rbxcdn.com*",
+    "*images.rbxcdn.com*",
+    "*.woff",
+    "*.woff2",
+    "*.ttf",
+    "*.otf",
+    "*.mp4",
+    "*.webm",
+]
+
+
 class RobloxAccountManager:
     
     def __init__(self, password=None):
@@ -52,7 +75,15 @@ class RobloxAccountManager:
         
         self.accounts = self.load_accounts()
         self.temp_profile_dir = None
-        
+        self.browser_sessions = {}
+        self.browser_sessions_lock = threading.Lock()
+
+        self.block_resources = True
+        self.blocked_url_patterns = list(DEFAULT_BLOCKED_URL_PATTERNS)
+        self.measure_page_load = False
+        self.page_load_reports = []
+        self._user_id_index = {}
+
     def load_accounts(self):
         """Load saved accounts from JSON file"""
         if os.path.exists(self.accounts_file):
@@ -111,16 +142,41 @@ class RobloxAccountManager:
             except:
                 pass
     
-    def setup_chrome_driver(self, browser_path=None):
+    def setup_chrome_driver(self, browser_path=None, block_resources=None, blocked_urls=None, measure=None, profile_dir=None, detach=False):
+        """
+        Create a Chrome driver with a temporary profile
+        block_resources: block non-essential requests through DevTools (defaults to self.block_resources)
+        blocked_urls: URL patterns to block (defaults to self.blocked_url_patterns)
+        measure: record network usage and page-ready time (defaults to self.measure_page_load)
+        profile_dir: use a persistent profile directory instead of a temporary one
+        detach: keep the browser open after the driver is released
+        """
+        # Selenium is imported here so the CLI and daemon start without it
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+        from selenium.webdriver.chrome.options import Options
+        from webdriver_manager.chrome import ChromeDriverManager
+
         print(f"[INFO] setup_chrome_driver called with browser_path: {browser_path}")
-        profile_dir = self.create_temp_profile()
+        persistent_profile = profile_dir is not None
+        if not persistent_profile:
+            profile_dir = self.create_temp_profile()
+
+        if block_resources is None:
+            block_resources = self.block_resources
+        if blocked_urls is None:
+            blocked_urls = self.blocked_url_patterns
+        if measure is None:
+            measure = self.measure_page_load
 
-        
         chrome_options = Options()
-        
+
         if browser_path:
             chrome_options.binary_location = browser_path
-        
+
+        if measure:
+            chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
         chrome_options.add_argument(f"--user-data-dir={profile_dir}")
         chrome_options.add_argument("--no-first-run")
         chrome_options.add_argument("--no-default-browser-check")
@@ -135,7 +191,8 @@ class RobloxAccountManager:
         chrome_options.add_argument("--disable-dev-tools")
         chrome_options.add_argument("--no-default-browser-check")
         chrome_options.add_argument("--disable-default-apps")
-        chrome_options.add_argument("--disable-web-security")
+        if not persistent_profile:
+            chrome_options.add_argument("--disable-web-security")
         chrome_options.add_experimental_option("excludeSwitches", ["enable-logging"])
         chrome_options.add_experimental_option('useAutomationExtension', False)
         
@@ -155,7 +212,10 @@ class RobloxAccountManager:
         chrome_options.add_argument("--disable-domain-reliability")
         chrome_options.add_argument("--disable-component-update")
         chrome_options.add_argument("--disable-background-networking")
-        chrome_options.add_argument("--aggressive-cache-discard")
+        if not persistent_profile:
+            chrome_options.add_argument("--aggressive-cache-discard")
+        if detach:
+            chrome_options.add_experimental_option("detach", True)
         
         try:
             if browser_path and "Chromium" in browser_path:
@@ -180,10 +240,13 @@ class RobloxAccountManager:
             driver.implicitly_wait(10)
             
             driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            
+
             sys.stderr.close()
             sys.stderr = original_stderr
-            
+
+            if block_resources and blocked_urls:
+                self.apply_request_blocking(driver, blocked_urls)
+
             return driver
         except Exception as e:
             if 'original_stderr' in locals():
@@ -192,8 +255,179 @@ class RobloxAccountManager:
             print("[INFO] Please make sure Google Chrome is installed on your system")
             traceback.print_exc()
             return None
+
+    def get_browser_profile_dir(self, username):
+        """Persistent Chrome profile directory for an account"""
+        profile_name = hashlib.sha256(username.encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.data_folder, "BrowserProfiles", profile_name)
     
+    def open_browser_session(self, username, browser_path=None, url="https://www.roblox.com/home"):
+        """
+        Open roblox.com in a browser already signed in as the account
+        The stored cookie is seeded through DevTools before the first navigation and the
+        per-account profile keeps its disk cache between opens
+        """
+        if username not in self.accounts:
+            print(f"[ERROR] Account '{username}' not found")
+            return False
+        
+        cookie = self.accounts[username].get('cookie')
+        if not cookie:
+            print(f"[ERROR] No cookie stored for {username}")
+            return False
+        
+        with self.browser_sessions_lock:
+            driver = self.browser_sessions.get(username)
+            if driver is not None:
+                try:
+                    driver.switch_to.window(driver.window_handles[-1])
+                    driver.get(url)
+                    print(f"[INFO] Reusing open browser session for {username}")
+                    return True
+                except Exception:
+                    self.browser_sessions.pop(username, None)
+        
+        profile_dir = self.get_browser_profile_dir(username)
+        os.makedirs(profile_dir, exist_ok=True)
+        
+        print(f"[INFO] Opening browser session for {username}...")
+        driver = self.setup_chrome_driver(
+            browser_path,
+            block_resources=False,
+            measure=False,
+            profile_dir=profile_dir,
+            detach=True
+        )
+        if not driver:
+            print("[ERROR] Could not start the browser. Close any window still using this account's profile and try again.")
+            return False
+        
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setCookie", {
+                "name": ".ROBLOSECURITY",
+                "value": cookie,
+                "domain": ".roblox.com",
+                "path": "/",
+                "secure": True,
+                "httpOnly": True,
+                "sameSite": "Lax",
+                "expires": int(time.time()) + 30 * 24 * 3600
+            })
+            driver.execute_cdp_cmd("Network.disable", {})
+            driver.get(url)
+        except Exception as e:
+            print(f"[ERROR] Failed to open browser session for {username}: {e}")
+            try:
+                driver.quit()
+            except:
+                pass
+            return False
+        
+        with self.browser_sessions_lock:
+            self.browser_sessions[username] = driver
+        
+        print(f"[SUCCESS] Opened {url} as {username}")
+        return True
+    
+    def apply_request_blocking(self, driver, patterns):
+        """Block requests matching the given URL patterns through DevTools"""
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(patterns)})
+            print(f"[INFO] Request blocking enabled ({len(patterns)} patterns)")
+            return True
+        except Exception as e:
+            print(f"[WARNING] Could not enable request blocking: {e}")
+            return False
+
+    def collect_page_load_report(self, driver, label=""):
+        """
+        Build a network/timing report for the page currently loaded in the driver
+        Requires the driver to be created with measure=True.
+        Bytes saved is an estimate: each blocked request is counted at the average
+        size of loaded requests of the same resource type.
+        """
+        report = {
+            'instance': label,
+            'requests_loaded': 0,
+            'requests_blocked': 0,
+            'bytes_transferred': 0,
+            'bytes_saved_estimate': 0,
+            'page_ready_ms': None,
+            'page_load_ms': None,
+            'blocked_by_type': {}
+        }
+
+        try:
+            timing = driver.execute_script("""
+                const nav = performance.getEntriesByType('navigation')[0];
+                if (!nav) return null;
+                return {ready: nav.domContentLoadedEventEnd, load: nav.loadEventEnd};
+            """)
+            if timing:
+                report['page_ready_ms'] = round(timing.get('ready') or 0)
+                report['page_load_ms'] = round(timing.get('load') or 0)
+        except Exception as e:
+            print(f"[WARNING] Could not read page timing: {e}")
+
+        try:
+            entries = driver.get_log("performance")
+        except Exception as e:
+            print(f"[WARNING] Performance log not available: {e}")
+            return report
+
+        request_types = {}
+        loaded_sizes = {}
+        blocked_types = []
+
+        for entry in entries:
+            try:
+                message = json.loads(entry['message'])['message']
+            except (KeyError, ValueError, TypeError):
+                continue
+
+            method = message.get('method')
+            params = message.get('params', {})
+            request_id = params.get('requestId')
+
+            if method == 'Network.requestWillBeSent':
+                request_types[request_id] = params.get('type', 'Other')
+            elif method == 'Network.loadingFinished':
+                resource_type = request_types.get(request_id, 'Other')
+                loaded_sizes.setdefault(resource_type, []).append(params.get('encodedDataLength', 0))
+            elif method == 'Network.loadingFailed' and params.get('blockedReason'):
+                blocked_types.append(params.get('type') or request_types.get(request_id, 'Other'))
+
+        all_sizes = [size for sizes in loaded_sizes.values() for size in sizes]
+        overall_average = (sum(all_sizes) / len(all_sizes)) if all_sizes else 0
+
+        report['requests_loaded'] = len(all_sizes)
+        report['bytes_transferred'] = int(sum(all_sizes))
+        report['requests_blocked'] = len(blocked_types)
+
+        saved = 0
+        for resource_type in blocked_types:
+            report['blocked_by_type'][resource_type] = report['blocked_by_type'].get(resource_type, 0) + 1
+            sizes = loaded_sizes.get(resource_type)
+            saved += (sum(sizes) / len(sizes)) if sizes else overall_average
+        report['bytes_saved_estimate'] = int(saved)
+
+        return report
+
+    def _print_page_load_report(self, report):
+        """Print a page load report to the console"""
+        print(
+            f"[INFO] Page load ({report['instance']}): ready {report['page_ready_ms']} ms, "
+            f"load {report['page_load_ms']} ms, "
+            f"{report['requests_loaded']} loaded / {report['requests_blocked']} blocked, "
+            f"{report['bytes_transferred'] / 1024:.1f} KB transferred, "
+            f"~{report['bytes_saved_estimate'] / 1024:.1f} KB saved"
+        )
+
     def wait_for_login(self, driver, timeout=300):
+        from selenium.common.exceptions import WebDriverException
+
         print("Please log into your Roblox account")
         
         detector_script = """
@@ -372,7 +606,15 @@ class RobloxAccountManager:
             except Exception as e:
                 print(f"[ERROR] Password capture failed: {e}")
             
-            print("[INFO] Fetching account info from browser...")
+            print("[INFO] Identifying account from cookie...")
+            identity = RobloxAPI.identify_cookie(roblosecurity_cookie)
+            if identity:
+                username = identity.get('username', 'Unknown')
+                user_id = identity.get('user_id', 0)
+                print(f"[SUCCESS] Username: {username} (ID: {user_id})")
+                return username, roblosecurity_cookie, user_id, captured_password
+            
+            print("[INFO] API lookup failed, fetching account info from browser...")
             try:
                 account_json = driver.execute_script("""
                     return fetch('/my/account/json')
@@ -389,16 +631,10 @@ class RobloxAccountManager:
                     print(f"[SUCCESS] Username: {username} (ID: {user_id})")
                     return username, roblosecurity_cookie, user_id, captured_password
             except Exception as e:
-                print(f"[ERROR] Browser fetch failed: {e}, falling back to API")
-            
-            print("[INFO] Getting username from API...")
-            username = RobloxAPI.get_username_from_api(roblosecurity_cookie)
-            
-            if not username:
-                username = "Unknown"
+                print(f"[ERROR] Browser fetch failed: {e}")
             
-            print(f"[SUCCESS] Username: {username}")
-            return username, roblosecurity_cookie, 0, captured_password
+            print("[SUCCESS] Username: Unknown")
+            return "Unknown", roblosecurity_cookie, 0, captured_password
             
         except Exception as e:
             print(f"[ERROR] Error extracting user info: {e}")
@@ -418,7 +654,8 @@ class RobloxAccountManager:
         
         success_count = 0
         drivers = []
-        
+        self.page_load_reports = []
+
         try:
             print(f"[INFO] Launching {amount} browser instance(s)...")
             
@@ -463,7 +700,12 @@ class RobloxAccountManager:
                                 time.sleep(2)
                             else:
                                 raise nav_error
-                    
+
+                    if self.measure_page_load:
+                        report = self.collect_page_load_report(driver, f"instance {i + 1}")
+                        self.page_load_reports.append(report)
+                        self._print_page_load_report(report)
+
                     if javascript:
                         print(f"[INFO] Executing Javascript for instance {i + 1}...")
                         try:
@@ -549,19 +791,17 @@ class RobloxAccountManager:
             return False, None
         
         try:
-            username = RobloxAPI.get_username_from_api(cookie)
-            if not username or username == "Unknown":
-                print("[ERROR] Failed to get username from cookie")
-                return False, None
-            
-            is_valid = RobloxAPI.validate_account(username, cookie)
-            if not is_valid:
+            identity = RobloxAPI.identify_cookie(cookie, use_cache=False)
+            if not identity or not identity.get('username') or identity['username'] == "Unknown":
                 print("[ERROR] Cookie is invalid or expired")
                 return False, None
             
+            username = identity['username']
             self.accounts[username] = {
                 'username': username,
                 'cookie': cookie,
+                'user_id': identity.get('user_id', 0),
+                'display_name': identity.get('display_name', ''),
                 'added_date': time.strftime('%Y-%m-%d %H:%M:%S'),
                 'note': ''
             }
@@ -577,7 +817,11 @@ class RobloxAccountManager:
     def delete_account(self, username):
         """Delete a saved account"""
         if username in self.accounts:
+            RobloxAPI.forget_cookie(self.accounts[username].get('cookie'))
             del self.accounts[username]
+            with self.browser_sessions_lock:
+                self.browser_sessions.pop(username, None)
+            shutil.rmtree(self.get_browser_profile_dir(username), ignore_errors=True)
             self.save_accounts()
             print(f"[SUCCESS] Deleted account: {username}")
             return True
@@ -585,6 +829,31 @@ class RobloxAccountManager:
             print(f"[ERROR] Account '{username}' not found")
             return False
     
+    def _rebuild_user_id_index(self, user_id_cache=None):
+        index = {}
+        if user_id_cache:
+            for username, user_id in user_id_cache.items():
+                if user_id and username in self.accounts:
+                    index[str(user_id)] = username
+        for username, account_data in self.accounts.items():
+            if isinstance(account_data, dict) and account_data.get('user_id'):
+                index[str(account_data['user_id'])] = username
+        self._user_id_index = index
+    
+    def find_username_by_user_id(self, user_id, user_id_cache=None):
+        """
+        Saved account for a Roblox user ID, using only local data
+        user_id_cache: optional username -> user ID map (settings['user_id_cache']) for accounts saved without an ID
+        """
+        if not user_id:
+            return None
+        key = str(user_id)
+        username = self._user_id_index.get(key)
+        if username is None or username not in self.accounts:
+            self._rebuild_user_id_index(user_id_cache)
+            username = self._user_id_index.get(key)
+        return username
+    
     def get_account_cookie(self, username):
         """Get cookie for a specific account"""
         if username in self.accounts:
@@ -0,0 +1,132 @@
+"""
+Account status store
+Latest presence, validation result and running PID per account, for the status column
+"""
+
+import time
+import threading
+
+
+PRESENCE_LABELS = {
+    0: "Offline",
+    1: "Online",
+    2: "In game",
+    3: "Studio",
+    4: "Invisible",
+}
+
+
+class AccountStatusStore:
+    """
+    Shared by everything that learns something about an account (auto-rejoin presence
+    checks, the status poller, validation, the process registry)
+    Writers can be on any thread; the UI collects changed accounts with take_dirty()
+    """
+
+    def __init__(self, presence_max_age=600):
+        self.presence_max_age = presence_max_age
+        self._status = {}
+        self._dirty = set()
+        self._lock = threading.Lock()
+
+    def _entry(self, account):
+        entry = self._status.get(account)
+        if entry is None:
+            entry = self._status[account] = {
+                'presence': None,
+                'place_id': None,
+                'presence_at': 0.0,
+                'valid': None,
+                'validated_at': 0.0,
+                'pid': None,
+            }
+        return entry
+
+    def _set(self, account, **values):
+        with self._lock:
+            self._set_locked(account, **values)
+
+    def _set_locked(self, account, **values):
+        entry = self._entry(account)
+        before = self._badge(entry)
+        entry.update(values)
+        if self._badge(entry) != before:
+            self._dirty.add(account)
+
+    def update_presence(self, account, presence, validated=False):
+        """
+        presence: a dict from RobloxAPI presence lookups, or None when the lookup failed
+        validated: the lookup used this account's own cookie, so it also proves the cookie works;
+        a lookup made with another account's cookie leaves the validation result alone
+        """
+        if not presence:
+            return
+        values = {
+            'presence': presence.get('status', 0),
+            'place_id': presence.get('place_id'),
+            'presence_at': time.time(),
+        }
+        if validated:
+            values['valid'] = True
+        self._set(account, **values)
+
+    def set_validation(self, account, valid):
+        self._set(account, valid=bool(valid), validated_at=time.time())
+
+    def sync_pids(self, pids_by_account):
+        """Replace running PIDs from {account: pid} for the accounts in the registry"""
+        with self._lock:
+            accounts = set(pids_by_account) | {account for account, entry in self._status.items() if entry['pid']}
+            for account in accounts:
+                pid = pids_by_account.get(account)
+                entry = self._status.get(account)
+                if entry is None or entry['pid'] != pid:
+                    self._set_locked(account, pid=pid)
+
+    def expire_stale(self):
+        """Drop presence results older than presence_max_age"""
+        cutoff = time.time() - self.presence_max_age
+        with self._lock:
+            for account, entry in list(self._status.items()):
+                if entry['presence'] is not None and entry['presence_at'] < cutoff:
+                    self._set_locked(account, presence=None, place_id=None)
+
+    def forget(self, account):
+        with self._lock:
+            if self._status.pop(account, None) is not None:
+                self._dirty.add(account)
+
+    def take_dirty(self):
+        """Accounts whose badge changed since the last call"""
+        with self._lock:
+            dirty = self._dirty
+            self._dirty = set()
+        return dirty
+
+    def mark_all_dirty(self):
+        with self._lock:
+            self._dirty.update(self._status.keys())
+
+    def get(self, account):
+        with self._lock:
+            entry = self._status.get(account)
+            return dict(entry) if entry else None
+
+    def badge(self, account):
+        with self._lock:
+            entry = self._status.get(account)
+            return self._badge(entry) if entry else ""
+
+    def _badge(self, entry):
+        if entry['valid'] is False:
+            return "✖ Expired"
+        presence = entry['presence']
+        if presence == 2:
+            return "● In game"
+        if entry['pid']:
+            return "● Running"
+        if presence is not None:
+            return ("○ " if presence == 0 else "● ") + PRESENCE_LABELS.get(presence, "Unknown")
+        if entry['valid']:
+            return "✓ Valid"
+        return ""
@@ -0,0 +1,279 @@
+"""
+Anti-AFK scheduler
+Gives every Roblox window its own due time and sends input to it through a delivery backend
+"""
+
+import time
+import heapq
+import threading
+
+from .app_logging import get_logger
+
+
+VK_CODES = {
+    'w': 0x57, 'a': 0x41, 's': 0x53, 'd': 0x44,
+    'space': 0x20, ' ': 0x20,
+    'shift': 0x10, 'ctrl': 0x11, 'alt': 0x12
+}
+
+# Successive multiples of the golden ratio (mod 1) stay evenly spread however many windows join
+PHASE_STEP = 0.6180339887
+
+logger = get_logger("anti_afk")
+
+
+def parse_action(action):
+    """('mouse', 'LMB'|'RMB'), ('key', vk_code) or None for an unknown action"""
+    if not action:
+        return None
+    if action.upper() in ('LMB', 'RMB'):
+        return ('mouse', action.upper())
+    if action.lower() in VK_CODES:
+        return ('key', VK_CODES[action.lower()])
+    if len(action) == 1:
+        return ('key', ord(action.upper()))
+    return None
+
+
+class ForegroundInputBackend:
+    """Brings the window forward, sends real input, then gives focus back"""
+
+    name = "foreground"
+
+    KEYEVENTF_KEYUP = 0x0002
+    SW_RESTORE = 9
+    SW_MINIMIZE = 6
+    MOUSE_FLAGS = {'LMB': (0x0002, 0x0004), 'RMB': (0x0008, 0x0010)}
+
+    def __init__(self, press_delay=0.015):
+        import ctypes
+        self.user32 = ctypes.windll.user32
+        self.kernel32 = ctypes.windll.kernel32
+        self.press_delay = press_delay
+
+    def _focus(self, hwnd):
+        current_thread_id = self.kernel32.GetCurrentThreadId()
+        target_thread_id = self.user32.GetWindowThreadProcessId(hwnd, None)
+        self.user32.AttachThreadInput(current_thread_id, target_thread_id, True)
+        self.user32.BringWindowToTop(hwnd)
+        self.user32.SetForegroundWindow(hwnd)
+        self.user32.AttachThreadInput(current_thread_id, target_thread_id, False)
+
+    def send(self, hwnd, action, amount):
+        user32 = self.user32
+        original_hwnd = user32.GetForegroundWindow()
+        was_minimized = user32.IsIconic(hwnd)
+        try:
+            if was_minimized:
+                user32.ShowWindow(hwnd, self.SW_RESTORE)
+                time.sleep(0.05)
+            self._focus(hwnd)
+            time.sleep(0.05)
+
+            for _ in range(amount):
+                if action[0] == 'mouse':
+                    down, up = self.MOUSE_FLAGS[action[1]]
+                    user32.mouse_event(down, 0, 0, 0, 0)
+                    time.sleep(self.press_delay)
+                    user32.mouse_event(up, 0, 0, 0, 0)
+                else:
+                    scan_code = user32.MapVirtualKeyW(action[1], 0)
+                    user32.keybd_event(action[1], scan_code, 0, 0)
+                    time.sleep(self.press_delay)
+                    user32.keybd_event(action[1], scan_code, self.KEYEVENTF_KEYUP, 0)
+        finally:
+            if was_minimized:
+                user32.ShowWindow(hwnd, self.SW_MINIMIZE)
+            if original_hwnd and original_hwnd != hwnd:
+                try:
+                    self._focus(original_hwnd)
+                except Exception:
+                    pass
+        return True
+
+
+class PostMessageInputBackend:
+    """Posts key and mouse messages straight to the window, without taking focus"""
+
+    name = "background"
+
+    WM_KEYDOWN = 0x0100
+    WM_KEYUP = 0x0101
+    WM_LBUTTONDOWN = 0x0201
+    WM_LBUTTONUP = 0x0202
+    WM_RBUTTONDOWN = 0x0204
+    WM_RBUTTONUP = 0x0205
+    MK_LBUTTON = 0x0001
+    MK_RBUTTON = 0x0002
+
+    def __init__(self, press_delay=0.015):
+        import ctypes
+        self.user32 = ctypes.windll.user32
+        self.press_delay = press_delay
+
+    def _key_lparam(self, vk_code, key_up):
+        scan_code = self.user32.MapVirtualKeyW(vk_code, 0)
+        lparam = 1 | (scan_code << 16)
+        if key_up:
+            lparam |= (1 << 30) | (1 << 31)
+        return lparam
+
+    def send(self, hwnd, action, amount):
+        post = self.user32.PostMessageW
+        for _ in range(amount):
+            if action[0] == 'mouse':
+                if action[1] == 'LMB':
+                    down, up, wparam = self.WM_LBUTTONDOWN, self.WM_LBUTTONUP, self.MK_LBUTTON
+                else:
+                    down, up, wparam = self.WM_RBUTTONDOWN, self.WM_RBUTTONUP, self.MK_RBUTTON
+                if not post(hwnd, down, wparam, 0):
+                    return False
+                time.sleep(self.press_delay)
+                post(hwnd, up, 0, 0)
+            else:
+                if not post(hwnd, self.WM_KEYDOWN, action[1], self._key_lparam(action[1], False)):
+                    return False
+                time.sleep(self.press_delay)
+                post(hwnd, self.WM_KEYUP, action[1], self._key_lparam(action[1], True))
+        return True
+
+
+class FakeInputBackend:
+    """Records deliveries instead of sending input"""
+
+    name = "fake"
+
+    def __init__(self):
+        self.sent = []
+
+    def send(self, hwnd, action, amount):
+        self.sent.append((time.time(), hwnd, action, amount))
+        return True
+
+
+def create_input_backend(mode="foreground"):
+    if mode == "background":
+        return PostMessageInputBackend()
+    return ForegroundInputBackend()
+
+
+class AntiAfkScheduler:
+    """
+    Keeps a due time per Roblox window in a heap and only touches windows that are due
+    New windows get phases spread over the interval, so input is sent a window at a time
+    instead of to the whole fleet at once
+    window_source: callable returning {pid: [hwnd, ...]} for running clients
+    """
+
+    def __init__(self, window_source, backend, settings, discovery_interval=5.0):
+        self.window_source = window_source
+        self.backend = backend
+        self.settings = settings
+        self.discovery_interval = discovery_interval
+        self._heap = []
+        self._due = {}
+        self._phase = 0.0
+        self._sequence = 0
+        self._last_discovery = 0.0
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @property
+    def interval(self):
+        return max(1, self.settings.get("anti_afk_interval_minutes", 10)) * 60
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="AntiAfkScheduler")
+        self._thread.start()
+
+    def stop(self, timeout=2):
+        self._stop_event.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=timeout)
+        self._thread = None
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _push(self, key, due):
+        self._due[key] = due
+        self._sequence += 1
+        heapq.heappush(self._heap, (due, self._sequence, key))
+
+    def discover(self, now=None):
+        """Add new windows with spread-out first due times and forget closed ones"""
+        now = now if now is not None else time.time()
+        self._last_discovery = now
+        windows = self.window_source() or {}
+        live = {(pid, hwnd) for pid, hwnds in windows.items() for hwnd in hwnds}
+
+        for key in list(self._due.keys()):
+            if key not in live:
+                del self._due[key]
+
+        added = 0
+        for key in sorted(live - set(self._due.keys())):
+            self._phase = (self._phase + PHASE_STEP) % 1.0
+            self._push(key, now + self.interval * self._phase)
+            added += 1
+        if added:
+            logger.info("[Anti-AFK] Scheduling %s new Roblox window(s), %s tracked", added, len(self._due))
+        return added
+
+    def next_due(self):
+        while self._heap:
+            due, _, key = self._heap[0]
+            if self._due.get(key) == due:
+                return due
+            heapq.heappop(self._heap)
+        return None
+
+    def run_due(self, now=None):
+        """Send input to every window whose time has come, returns how many were touched"""
+        now = now if now is not None else time.time()
+        action = parse_action(self.settings.get("anti_afk_key", "w"))
+        if action is None:
+            logger.warning("[Anti-AFK] Unknown action: %s", self.settings.get('anti_afk_key'))
+            return 0
+        amount = max(1, int(self.settings.get("anti_afk_key_amount", 1) or 1))
+        interval = self.interval
+
+        sent = 0
+        while self._heap and self._heap[0][0] <= now and not self._stop_event.is_set():
+            due, _, key = heapq.heappop(self._heap)
+            if self._due.get(key) != due:
+                continue
+            pid, hwnd = key
+            try:
+                if self.backend.send(hwnd, action, amount):
+                    sent += 1
+                    logger.debug("[Anti-AFK] Sent '%s' x%s to PID %s", self.settings.get('anti_afk_key', 'w'), amount, pid)
+                else:
+                    logger.warning("[Anti-AFK] Could not deliver input to PID %s", pid)
+            except Exception as e:
+                logger.error("[Anti-AFK] Error on PID %s: %s", pid, e)
+
+            next_time = due + interval
+            if next_time <= now:
+                next_time = now + interval
+            self._push(key, next_time)
+        return sent
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                now = time.time()
+                if now - self._last_discovery >= self.discovery_interval:
+                    self.discover(now)
+                self.run_due()
+                due = self.next_due()
+            except Exception as e:
+                logger.exception("[Anti-AFK] Error: %s", e)
+                due = None
+            wake = self._last_discovery + self.discovery_interval
+            if due is not None:
+                wake = min(wake, due)
+            self._stop_event.wait(max(0.05, wake - time.time()))
@@ -0,0 +1,305 @@
+"""
+Application logging
+Structured log records with a component and account, written off the calling thread
+to size-rotated files and the console view
+"""
+
+import os
+import re
+import json
+import queue
+import logging
+import logging.handlers
+import threading
+from datetime import datetime
+
+
+ROOT_LOGGER = "ram"
+
+# Existing print prefixes mapped to a level and/or component
+PREFIX_LEVELS = {
+    "[INFO]": logging.INFO,
+    "[SUCCESS]": logging.INFO,
+    "[WARNING]": logging.WARNING,
+    "[ERROR]": logging.ERROR,
+    "[FAILED]": logging.ERROR,
+}
+PREFIX_COMPONENTS = {
+    "[Auto-Rejoin]": "auto_rejoin",
+    "[Anti-AFK]": "anti_afk",
+}
+
+PREFIX_PATTERN = re.compile(r"^\s*(\[[^\]]+\])\s*(?:\[([^\]]+)\]\s*)?")
+LEVEL_WORDS = {
+    "warning:": logging.WARNING,
+    "error": logging.ERROR,
+    "failed": logging.ERROR,
+}
+
+
+def get_logger(component):
+    """Logger for one component, e.g. get_logger("auto_rejoin").info("...", extra={'account': name})"""
+    return logging.getLogger(f"{ROOT_LOGGER}.{component}")
+
+
+class _SkipPrinted(logging.Filter):
+    """For handlers writing to a stream that print() already echoes to"""
+
+    def filter(self, record):
+        return not getattr(record, 'printed', False)
+
+
+class _PrintHandler(logging.Handler):
+    """Until AppLogging takes over, records come out on stdout like the print() lines they replace"""
+
+    def emit(self, record):
+        try:
+            print(self.format(record))
+        except Exception:
+            self.handleError(record)
+
+
+def _install_default_handler():
+    logger = logging.getLogger(ROOT_LOGGER)
+    if not logger.handlers:
+        handler = _PrintHandler()
+        handler.addFilter(_SkipPrinted())
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+
+
+_install_default_handler()
+
+
+def parse_print_line(text, default_level=logging.INFO):
+    """
+    Map a legacy print line to (level, component, account)
+    "[Auto-Rejoin] [alice] Error: ..." -> (ERROR, "auto_rejoin", "alice")
+    """
+    level = default_level
+    component = "app"
+    account = None
+
+    match = PREFIX_PATTERN.match(text)
+    if not match:
+        return level, component, account
+
+    prefix = match.group(1)
+    if prefix in PREFIX_LEVELS:
+        level = PREFIX_LEVELS[prefix]
+    elif prefix in PREFIX_COMPONENTS:
+        component = PREFIX_COMPONENTS[prefix]
+        account = match.group(2)
+        rest = text[match.end():].lower()
+        for word, word_level in LEVEL_WORDS.items():
+            if rest.startswith(word):
+                level = word_level
+                break
+    return level, component, account
+
+
+class _RecordDefaults(logging.Filter):
+    """Fills in component and account for records that did not set them"""
+
+    def filter(self, record):
+        if not hasattr(record, 'component'):
+            name = record.name
+            record.component = name[len(ROOT_LOGGER) + 1:] if name.startswith(ROOT_LOGGER + ".") else "app"
+        if not hasattr(record, 'account'):
+            record.account = None
+        return True
+
+
+class JsonLineFormatter(logging.Formatter):
+    """One JSON object per line, so log files can be filtered and analysed afterwards"""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'component': record.component,
+            'message': record.getMessage(),
+            'thread': record.threadName,
+        }
+        if record.account:
+            entry['account'] = record.account
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class ConsoleViewHandler(logging.Handler):
+    """Hands formatted lines to the console view callback"""
+
+    def __init__(self, callback):
+        super().__init__()
+        self.callback = callback
+
+    def emit(self, record):
+        try:
+            timestamp = datetime.fromtimestamp(record.created).strftime("%H:%M:%S")
+            message = record.getMessage()
+            if record.exc_text:
+                message = f"{message}\n{record.exc_text}"
+            self.callback(f"[{timestamp}] {message}\n")
+        except Exception:
+            self.handleError(record)
+
+
+class _LogQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves formatting to the listener thread
+    The stock prepare() formats the record on the calling thread
+    """
+
+    def prepare(self, record):
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        record.exc_text = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class AppLogging:
+    """
+    Owns the queue, listener and handlers behind the "ram" logger tree
+    Callers only pay for a level check and a queue put; files and the console are written
+    by the listener thread. Levels can be set per component ("auto_rejoin", "anti_afk", ...)
+    """
+
+    def __init__(self, log_folder, max_bytes=2 * 1024 * 1024, backup_count=5, level="INFO", component_levels=None):
+        self.log_folder = log_folder
+        self.log_file = os.path.join(log_folder, "account_manager.log")
+        self.queue = queue.Queue(-1)
+        self.logger = logging.getLogger(ROOT_LOGGER)
+        self.logger.propagate = False
+        self.handlers = []
+        self.listener = None
+
+        try:
+            os.makedirs(log_folder, exist_ok=True)
+            file_handler = logging.handlers.RotatingFileHandler(
+                self.log_file, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8', delay=True
+            )
+            file_handler.setFormatter(JsonLineFormatter())
+            self.handlers.append(file_handler)
+        except Exception as e:
+            self.file_error = e
+        else:
+            self.file_error = None
+
+        self._queue_handler = _LogQueueHandler(self.queue)
+        self._queue_handler.addFilter(_RecordDefaults())
+        self.logger.handlers = [self._queue_handler]
+        self.set_levels(level, component_levels)
+
+    def set_levels(self, level="INFO", component_levels=None):
+        """Root level plus optional {"component": "LEVEL"} overrides"""
+        self.logger.setLevel(self._level(level, logging.INFO))
+        for component, component_level in (component_levels or {}).items():
+            get_logger(component).setLevel(self._level(component_level, logging.NOTSET))
+
+    @staticmethod
+    def _level(value, default):
+        if isinstance(value, int):
+            return value
+        level = logging.getLevelName(str(value).upper())
+        return level if isinstance(level, int) else default
+
+    def add_console(self, callback, level=logging.NOTSET, include_prints=True):
+        """include_prints=False leaves out print() lines, for a stream print() already writes to"""
+        handler = ConsoleViewHandler(callback)
+        handler.setLevel(level)
+        if not include_prints:
+            handler.addFilter(_SkipPrinted())
+        self.handlers.append(handler)
+        if self.listener is not None:
+            self.stop()
+            self.start()
+
+    def start(self):
+        if self.listener is not None:
+            return
+        self.listener = logging.handlers.QueueListener(self.queue, *self.handlers, respect_handler_level=True)
+        self.listener.start()
+
+    def stop(self):
+        """Write out everything still queued"""
+        if self.listener is None:
+            return
+        self.listener.stop()
+        self.listener = None
+        for handler in self.handlers:
+            try:
+                handler.flush()
+            except Exception:
+                pass
+
+    def close(self):
+        self.stop()
+        for handler in self.handlers:
+            try:
+                handler.close()
+            except Exception:
+                pass
+        self.logger.handlers = []
+        _install_default_handler()
+
+    def log_print(self, text, default_level=logging.INFO):
+        """Bridge for print(): classify the line by its prefix and log it"""
+        message = text.rstrip("\n")
+        if not message.strip():
+            return
+        level, component, account = parse_print_line(message, default_level)
+        logger = self.logger if component == "app" else get_logger(component)
+        if logger.isEnabledFor(level):
+            logger.log(level, message, extra={'component': component, 'account': account, 'printed': True})
+
+
+class PrintStream:
+    """
+    File-like stand-in for sys.stdout/sys.stderr
+    Complete lines go to the logging queue and are echoed to the original stream.
+    A "Traceback (most recent call last):" block is held until its final exception line
+    and logged as one ERROR record
+    """
+
+    TRACEBACK_HEADER = "Traceback (most recent call last):"
+
+    def __init__(self, app_logging, passthrough=None, default_level=logging.INFO):
+        self.app_logging = app_logging
+        self.passthrough = passthrough
+        self.default_level = default_level
+        self._partial = ""
+        self._traceback = None
+        self._lock = threading.Lock()
+
+    def write(self, text):
+        if self.passthrough:
+            self.passthrough.write(text)
+        with self._lock:
+            self._partial += text
+            lines = self._partial.split("\n")
+            self._partial = lines.pop()
+            for line in lines:
+                self._line(line)
+
+    def _line(self, line):
+        if self._traceback is not None:
+            self._traceback.append(line)
+            if line and not line[0].isspace():
+                self.app_logging.log_print("\n".join(self._traceback), logging.ERROR)
+                self._traceback = None
+            return
+        if line.startswith(self.TRACEBACK_HEADER):
+            self._traceback = [line]
+        elif line.strip():
+            self.app_logging.log_print(line, self.default_level)
+
+    def flush(self):
+        if self.passthrough:
+            self.passthrough.flush()
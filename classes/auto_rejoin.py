@@ -0,0 +1,1011 @@
+"""
+Auto-Rejoin supervisor
+Drives every auto-rejoin account from a single scheduler thread
+"""
+
+import os
+import json
+import time
+import heapq
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import psutil
+
+from .roblox_api import RobloxAPI
+from .process_watcher import ProcessWatcher
+from .process_registry import RobloxProcessRegistry
+from .log_index import RobloxLogIndex
+from .server_affinity import ServerAffinityCache
+from .app_logging import get_logger
+
+
+ROBLOX_PROCESS_NAME = "robloxplayerbeta.exe"
+
+logger = get_logger("auto_rejoin")
+
+LAUNCHING = "launching"
+VERIFYING = "verifying"
+IN_GAME = "in-game"
+DISCONNECTED = "disconnected"
+BACKOFF = "backoff"
+STOPPED = "stopped"
+
+
+class RejoinSession:
+    """Per-account auto-rejoin state"""
+
+    def __init__(self, account, config):
+        self.account = account
+        self.config = dict(config)
+        self.state = LAUNCHING
+        self.user_id = None
+        self.cookie = None
+        self.pid = None
+        self.retry_count = 0
+        self.failed_checks = 0
+        self.process_exited = False
+        self.last_game_id = ''
+        self.target_job_id = ''
+        self.generation = 0
+        self.busy = False
+        self.next_due = 0.0
+        self.interval = self.config.get('check_interval', 10)
+        self.stable_checks = 0
+        self.rate_limit_strikes = 0
+
+
+class RejoinMetrics:
+    """Counters and timings for one account, kept across stop/start"""
+
+    def __init__(self):
+        self.state = STOPPED
+        self.state_since = time.time()
+        self.in_game_seconds = 0.0
+        self.rejoins = 0
+        self.launches = 0
+        self.launch_failures = 0
+        self.last_launch_latency = None
+        self.avg_launch_latency = None
+        self.presence_checks = 0
+        self.last_presence_latency = None
+        self.avg_presence_latency = None
+        self.presence_requests = 0
+        self.rate_limited = 0
+        self.last_error = None
+        self.last_error_at = None
+
+    @staticmethod
+    def _average(current, sample, weight=0.2):
+        return sample if current is None else current + (sample - current) * weight
+
+    def enter_state(self, state):
+        now = time.time()
+        if self.state == IN_GAME:
+            self.in_game_seconds += now - self.state_since
+        if state != self.state:
+            self.state = state
+            self.state_since = now
+
+    def record_launch(self, latency, success):
+        self.launches += 1
+        if success:
+            self.last_launch_latency = latency
+            self.avg_launch_latency = self._average(self.avg_launch_latency, latency)
+        else:
+            self.launch_failures += 1
+
+    def record_presence(self, latency, status_code):
+        self.presence_requests += 1
+        if status_code == 200:
+            self.presence_checks += 1
+            self.last_presence_latency = latency
+            self.avg_presence_latency = self._average(self.avg_presence_latency, latency)
+        elif status_code == 429:
+            self.rate_limited += 1
+
+    def record_error(self, message):
+        self.last_error = message
+        self.last_error_at = time.time()
+
+    def snapshot(self):
+        now = time.time()
+        in_game = self.in_game_seconds
+        if self.state == IN_GAME:
+            in_game += now - self.state_since
+        return {
+            'state': self.state,
+            'state_for': round(now - self.state_since, 1),
+            'time_in_game': round(in_game, 1),
+            'rejoins': self.rejoins,
+            'launches': self.launches,
+            'launch_failures': self.launch_failures,
+            'last_launch_latency': self.last_launch_latency,
+            'avg_launch_latency': self.avg_launch_latency,
+            'presence_checks': self.presence_checks,
+            'last_presence_latency': self.last_presence_latency,
+            'avg_presence_latency': self.avg_presence_latency,
+            'requests': {
+                'presence': self.presence_requests,
+                'launch': self.launches,
+                'rate_limited': self.rate_limited
+            },
+            'last_error': self.last_error,
+            'last_error_at': self.last_error_at
+        }
+
+
+class CadencePolicy:
+    """
+    Decides how long an account waits between presence checks
+    Stable accounts are checked less and less often, launches and suspected
+    disconnects are checked sooner, and failures back off exponentially with jitter
+    """
+
+    def __init__(self, max_interval=120, growth=1.5, stable_after=3, suspect_interval=5, backoff_cap=300, jitter=0.15):
+        self.max_interval = max_interval
+        self.growth = growth
+        self.stable_after = stable_after
+        self.suspect_interval = suspect_interval
+        self.backoff_cap = backoff_cap
+        self.jitter = jitter
+
+    def _jittered(self, delay):
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def stable(self, session):
+        """Account confirmed in game, stretch the interval once it has been stable for a while"""
+        base = session.config.get('check_interval', 10)
+        session.stable_checks += 1
+        session.rate_limit_strikes = 0
+        if session.stable_checks > self.stable_after:
+            session.interval = min(max(base, self.max_interval), session.interval * self.growth)
+        else:
+            session.interval = base
+        return self._jittered(session.interval)
+
+    def suspect(self, session):
+        """A check failed, look again soon"""
+        base = session.config.get('check_interval', 10)
+        session.stable_checks = 0
+        session.interval = base
+        return self._jittered(min(base, self.suspect_interval))
+
+    def after_launch(self, session, grace):
+        """Client just launched, give it time to join then check at the base interval"""
+        session.stable_checks = 0
+        session.interval = session.config.get('check_interval', 10)
+        return grace
+
+    def backoff(self, session, attempt, minimum=0):
+        """Exponential backoff from the base interval with jitter, at least `minimum` seconds"""
+        base = session.config.get('check_interval', 10)
+        delay = min(self.backoff_cap, base * (2 ** max(0, attempt - 1)))
+        delay = random.uniform(delay / 2, delay)
+        session.interval = max(minimum, delay)
+        return session.interval
+
+
+class PendingLaunch:
+    """A launch waiting for its client process to appear"""
+
+    def __init__(self, account, user_id):
+        self.account = account
+        self.user_id = user_id
+        self.launched_at = time.time()
+        self.pid = None
+        self.claimed = threading.Event()
+
+
+class AutoRejoinSupervisor:
+    """
+    Runs auto-rejoin for many accounts with one scheduler thread
+    Each account is a small state machine (launching, verifying, in-game,
+    disconnected, backoff, stopped) whose steps run on a bounded worker pool
+    """
+
+    MAX_CONSECUTIVE_FAILS = 2
+    LAUNCH_GRACE_SECONDS = 10
+    ATTRIBUTION_TIMEOUT_SECONDS = 45
+    ATTRIBUTION_POLL_SECONDS = 0.5
+    LAUNCH_CLOCK_SLACK = 2.0
+
+    CHECKPOINT_DELAY_SECONDS = 2.0
+    DEFAULT_CONCURRENT_LAUNCHES = 4
+    LAUNCH_SLOT_RETRY_SECONDS = 1.0
+
+    def __init__(self, manager, configs, settings, save_settings=None, settings_lock=None, max_workers=None, max_concurrent_launches=None, watcher=None, registry=None, log_index=None, state_file=None, affinity=None, status_store=None):
+        self.manager = manager
+        self.configs = configs
+        self.settings = settings
+        self.save_settings = save_settings
+        # Shared with whoever serializes settings, so the user ID cache is never written mid-dump
+        self.settings_lock = settings_lock or threading.RLock()
+        self.sessions = {}
+        self.metrics = {}
+        self.tracked_pids = {}
+
+        self._lock = threading.RLock()
+        self._wakeup = threading.Condition(self._lock)
+        self._queue = []
+        self._sequence = 0
+        self._running = False
+        self._scheduler_thread = None
+        # Launches hold a worker while they run, keep spare workers so presence checks are not starved.
+        # Steps never wait for a launch slot, they are rescheduled instead
+        if max_concurrent_launches is None:
+            max_concurrent_launches = settings.get('auto_rejoin_max_concurrent_launches', self.DEFAULT_CONCURRENT_LAUNCHES)
+        max_concurrent_launches = max(1, int(max_concurrent_launches))
+        if max_workers is None:
+            max_workers = max_concurrent_launches + 4
+        self.max_concurrent_launches = max_concurrent_launches
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="AutoRejoin")
+        self._launch_slots = threading.BoundedSemaphore(max_concurrent_launches)
+        self._pending_launches = {}
+        self._unclaimed = {}
+        self._claimed_logs = set()
+        self._rate_limited_until = 0.0
+        self._checkpoint_timer = None
+        self._checkpoint_lock = threading.Lock()
+        self._shutting_down = False
+        self._stale = {}
+
+        data_folder = getattr(manager, 'data_folder', None) or "AccountManagerData"
+        self.state_file = state_file or os.path.join(data_folder, "auto_rejoin_state.json")
+        self.affinity = affinity or ServerAffinityCache(os.path.join(data_folder, "server_affinity.json"))
+        self.status_store = status_store
+
+        self.cadence = CadencePolicy(max_interval=settings.get('auto_rejoin_max_interval', 120))
+        self.set_request_budget(settings.get('auto_rejoin_requests_per_minute', 60))
+        
+        self.registry = registry or RobloxProcessRegistry()
+        self.log_index = log_index or RobloxLogIndex()
+        self.registry.subscribe(self._on_registry_event)
+        self.watcher = watcher or ProcessWatcher()
+        self.watcher.subscribe(self._on_process_exit)
+
+    def set_request_budget(self, requests_per_minute):
+        """Cap presence checks across all accounts"""
+        rate = max(1, requests_per_minute) / 60.0
+        RobloxAPI.request_budget.set_rate(rate, burst=max(1, min(10, int(requests_per_minute) // 12)))
+
+    def _ensure_scheduler(self):
+        if self._scheduler_thread and self._scheduler_thread.is_alive():
+            return
+        self._running = True
+        self._scheduler_thread = threading.Thread(target=self._scheduler_loop, daemon=True, name="AutoRejoinScheduler")
+        self._scheduler_thread.start()
+
+    def _schedule(self, session, delay):
+        """Queue the next step for a session, called with the lock held or from a worker"""
+        with self._lock:
+            if session.state == STOPPED or self.sessions.get(session.account) is not session:
+                return
+            session.next_due = time.time() + max(0.0, delay)
+            self._sequence += 1
+            heapq.heappush(self._queue, (session.next_due, self._sequence, session.account, session.generation))
+            self._wakeup.notify()
+
+    def _scheduler_loop(self):
+        while True:
+            with self._lock:
+                while self._running and (not self._queue or self._queue[0][0] > time.time()):
+                    timeout = self._queue[0][0] - time.time() if self._queue else None
+                    self._wakeup.wait(timeout)
+                if not self._running:
+                    return
+
+                due, _, account, generation = heapq.heappop(self._queue)
+                session = self.sessions.get(account)
+                if session is None or session.generation != generation or session.state == STOPPED or session.busy:
+                    continue
+                session.busy = True
+
+            self._executor.submit(self._run_step, session)
+
+    def _run_step(self, session):
+        delay = None
+        try:
+            delay = self._step(session)
+        except Exception as e:
+            logger.exception("[Auto-Rejoin] [%s] Error: %s", session.account, e, extra={'account': session.account})
+            self._metrics_for(session.account).record_error(str(e))
+            delay = self.cadence.suspect(session)
+        finally:
+            with self._lock:
+                session.busy = False
+                if delay is not None and session.process_exited and session.state in (VERIFYING, IN_GAME):
+                    delay = 0
+            if delay is not None:
+                self._schedule(session, delay)
+
+    def _set_state(self, session, state):
+        changed = session.state != state
+        session.state = state
+        self._metrics_for(session.account).enter_state(state)
+        if changed:
+            self._mark_dirty()
+
+    def _metrics_for(self, account):
+        with self._lock:
+            metrics = self.metrics.get(account)
+            if metrics is None:
+                metrics = self.metrics[account] = RejoinMetrics()
+            return metrics
+    
+    def _track_pid(self, account, pid):
+        self.tracked_pids[account] = pid
+        session = self.sessions.get(account)
+        self.registry.set_account(pid, account, session.user_id if session else None)
+        self.watcher.watch(pid, account)
+        self._mark_dirty()
+
+    def _mark_dirty(self):
+        """Schedule a checkpoint write, coalescing bursts of changes into one write"""
+        with self._checkpoint_lock:
+            if self._shutting_down or self._checkpoint_timer is not None:
+                return
+            self._checkpoint_timer = threading.Timer(self.CHECKPOINT_DELAY_SECONDS, self._flush_checkpoint)
+            self._checkpoint_timer.daemon = True
+            self._checkpoint_timer.start()
+
+    def _flush_checkpoint(self):
+        with self._checkpoint_lock:
+            self._checkpoint_timer = None
+        try:
+            self.save_state()
+            self.affinity.save()
+        except Exception as e:
+            logger.warning("[Auto-Rejoin] Warning: Could not save auto-rejoin state: %s", e)
+
+    def save_state(self):
+        """Write account -> PID, create time, job ID and retry counters for every session"""
+        with self._lock:
+            accounts = {}
+            for account, session in self.sessions.items():
+                pid = self.tracked_pids.get(account) or session.pid
+                record = self.registry.get(pid) if pid else None
+                accounts[account] = {
+                    'pid': pid,
+                    'create_time': record.create_time if record else None,
+                    'job_id': session.last_game_id or '',
+                    'retries': session.retry_count,
+                    'user_id': session.user_id,
+                    'state': session.state,
+                    'active': session.state != STOPPED
+                }
+            state = {'version': 1, 'saved_at': time.time(), 'accounts': accounts}
+
+        temp_file = self.state_file + ".tmp"
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2)
+        os.replace(temp_file, self.state_file)
+
+    def load_state(self):
+        if not os.path.exists(self.state_file):
+            return {}
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            accounts = state.get('accounts', {}) if isinstance(state, dict) else {}
+            return accounts if isinstance(accounts, dict) else {}
+        except Exception as e:
+            logger.warning("[Auto-Rejoin] Warning: Could not read auto-rejoin state: %s", e)
+            return {}
+
+    def resume(self, relaunch=False):
+        """
+        Resume the accounts that were active when the manager last closed
+        Saved PIDs are checked against one process scan, so running clients are
+        monitored again without user ID lookups or log scans
+        Accounts whose client is gone are only relaunched with relaunch=True, otherwise they
+        are kept for relaunch_stale() (the user may have closed them on purpose)
+        Returns (resumed, stale) account lists
+        """
+        saved = self.load_state()
+        if not saved:
+            return [], []
+
+        live = {}
+        try:
+            self.registry.get_pids(max_age=0)
+            live = {record.pid: record for record in self.registry.records()}
+        except Exception as e:
+            logger.warning("[Auto-Rejoin] Warning: Could not scan Roblox processes: %s", e)
+
+        resumed = []
+        stale = {}
+        for account, entry in saved.items():
+            if not isinstance(entry, dict) or not entry.get('active'):
+                continue
+            if account not in self.configs or account not in self.manager.accounts:
+                continue
+
+            pid = entry.get('pid')
+            record = live.get(pid) if pid else None
+            saved_create_time = entry.get('create_time')
+            alive = record is not None and (
+                not saved_create_time or not record.create_time
+                or abs(record.create_time - saved_create_time) <= 1.0
+            )
+            if alive and (record.account is None or record.account == account):
+                with self._lock:
+                    self.tracked_pids[account] = pid
+                self.registry.set_account(pid, account, entry.get('user_id'))
+                resumed.append(account)
+                self.start(account, restore=entry)
+            else:
+                stale[account] = dict(entry, pid=None)
+
+        with self._lock:
+            self._stale = stale
+        if relaunch:
+            self.relaunch_stale()
+
+        if resumed or stale:
+            logger.info("[Auto-Rejoin] Resumed %s running account(s) from saved state, %s without a client %s",
+                        len(resumed), len(stale), 'will relaunch' if relaunch else 'not relaunched')
+        return resumed, list(stale)
+
+    def relaunch_stale(self):
+        """Start the resumed accounts whose client was no longer running"""
+        with self._lock:
+            stale = self._stale
+            self._stale = {}
+        for account, entry in stale.items():
+            self.start(account, restore=entry)
+        return list(stale)
+    
+    def _on_process_exit(self, pid, account):
+        """Called by the process watcher the moment a tracked client exits"""
+        with self._lock:
+            if self.tracked_pids.get(account) == pid:
+                del self.tracked_pids[account]
+            session = self.sessions.get(account)
+            if session is None or session.pid != pid or session.state not in (VERIFYING, IN_GAME):
+                return
+            session.process_exited = True
+            self._metrics_for(account).record_error(f"Roblox process {pid} exited")
+            if session.busy:
+                return
+            session.generation += 1
+            self._set_state(session, DISCONNECTED)
+        logger.info("[Auto-Rejoin] [%s] Roblox process %s exited", account, pid, extra={'account': account})
+        self._schedule(session, 0)
+
+    def start(self, account, restore=None):
+        """
+        Start supervising an account
+        restore: checkpoint entry from resume(), lets a running client be verified straight away
+        """
+        if account not in self.configs:
+            logger.warning("[Auto-Rejoin] No config found for %s", account, extra={'account': account})
+            return False
+
+        with self._lock:
+            existing = self.sessions.get(account)
+            if existing and existing.state != STOPPED:
+                logger.info("[Auto-Rejoin] Already running for %s", account, extra={'account': account})
+                return False
+
+            session = RejoinSession(account, self.configs[account])
+            if account in self.tracked_pids:
+                self.watcher.watch(self.tracked_pids[account], account)
+            if existing:
+                session.generation = existing.generation + 1
+            delay = random.uniform(0.5, 3.0)
+            if restore:
+                session.last_game_id = restore.get('job_id') or ''
+                session.retry_count = int(restore.get('retries') or 0)
+                account_data = self.manager.accounts.get(account, {})
+                if restore.get('user_id') and account_data.get('cookie'):
+                    session.user_id = restore['user_id']
+                    session.cookie = account_data['cookie']
+                    session.pid = self.tracked_pids.get(account)
+                    session.state = VERIFYING if session.pid else LAUNCHING
+                delay = random.uniform(0.0, 1.0)
+            self.sessions[account] = session
+            self._metrics_for(account).enter_state(session.state)
+            self._ensure_scheduler()
+            self._schedule(session, delay)
+            self._mark_dirty()
+
+        logger.info("[Auto-Rejoin] Started for %s", account, extra={'account': account})
+        return True
+
+    def stop(self, account):
+        """Stop supervising an account"""
+        with self._lock:
+            session = self.sessions.get(account)
+            if session is None:
+                return
+            self._set_state(session, STOPPED)
+            session.generation += 1
+            if session.pid:
+                self.watcher.unwatch(session.pid)
+            self._wakeup.notify()
+        logger.info("[Auto-Rejoin] Stopped for %s", account, extra={'account': account})
+
+    def stop_all(self):
+        for account in list(self.sessions.keys()):
+            if self.is_active(account):
+                self.stop(account)
+
+    def shutdown(self):
+        """Checkpoint active sessions, then stop the scheduler and worker pool"""
+        with self._checkpoint_lock:
+            self._shutting_down = True
+            if self._checkpoint_timer is not None:
+                self._checkpoint_timer.cancel()
+                self._checkpoint_timer = None
+        try:
+            self.save_state()
+            self.affinity.save()
+        except Exception as e:
+            logger.warning("[Auto-Rejoin] Warning: Could not save auto-rejoin state: %s", e)
+        self.stop_all()
+        self.watcher.stop()
+        with self._lock:
+            self._running = False
+            self._wakeup.notify_all()
+        self._executor.shutdown(wait=False)
+
+    def is_active(self, account):
+        session = self.sessions.get(account)
+        return session is not None and session.state != STOPPED
+
+    def active_accounts(self):
+        return [account for account in self.sessions if self.is_active(account)]
+
+    def get_state(self, account):
+        session = self.sessions.get(account)
+        return session.state if session else STOPPED
+
+    def metrics_snapshot(self, account=None):
+        """
+        Per-account metrics merged with the current cadence
+        Returns {account: {...}}, or one account's dict when account is given
+        """
+        cadence = self.cadence_snapshot()
+        with self._lock:
+            accounts = [account] if account is not None else list(self.metrics.keys())
+            result = {}
+            for name in accounts:
+                metrics = self.metrics.get(name)
+                if metrics is None:
+                    continue
+                entry = metrics.snapshot()
+                entry.update({
+                    'active': self.is_active(name),
+                    'interval': cadence.get(name, {}).get('interval'),
+                    'next_check_in': cadence.get(name, {}).get('next_check_in'),
+                    'retries': cadence.get(name, {}).get('retries', 0)
+                })
+                result[name] = entry
+        if account is not None:
+            return result.get(account)
+        return result
+
+    def cadence_snapshot(self):
+        """Current check interval and time to the next step for every session"""
+        now = time.time()
+        with self._lock:
+            return {
+                account: {
+                    'state': session.state,
+                    'interval': round(session.interval, 1),
+                    'next_check_in': max(0.0, round(session.next_due - now, 1)) if session.state != STOPPED else None,
+                    'stable_checks': session.stable_checks,
+                    'retries': session.retry_count
+                }
+                for account, session in self.sessions.items()
+            }
+
+    def _get_user_id(self, account):
+        account_data = self.manager.accounts.get(account, {})
+        if account_data.get('user_id'):
+            return account_data['user_id']
+
+        with self.settings_lock:
+            cached = (self.settings.get('user_id_cache') or {}).get(account)
+        if cached:
+            return cached
+
+        user_id = RobloxAPI.get_user_id_from_username(account, use_cache=False)
+        if not user_id:
+            return None
+        with self.settings_lock:
+            self.settings.setdefault('user_id_cache', {})[account] = user_id
+        if self.save_settings:
+            try:
+                self.save_settings()
+            except Exception as e:
+                logger.warning("[Auto-Rejoin] Warning: Could not save user ID cache: %s", e)
+        return user_id
+
+    def _step(self, session):
+        """Advance one account's state machine, returns the delay until its next step"""
+        account = session.account
+        config = session.config
+
+        if session.user_id is None:
+            if not config.get('place_id'):
+                logger.warning("[Auto-Rejoin] Invalid configuration for %s", account, extra={'account': account})
+                self._set_state(session, STOPPED)
+                return None
+            if account not in self.manager.accounts:
+                logger.warning("[Auto-Rejoin] Account %s not found", account, extra={'account': account})
+                self._set_state(session, STOPPED)
+                return None
+
+            session.cookie = self.manager.accounts[account].get('cookie')
+            session.user_id = self._get_user_id(account)
+            if not session.user_id:
+                logger.warning("[Auto-Rejoin] Could not get user ID for %s", account, extra={'account': account})
+                self._set_state(session, STOPPED)
+                return None
+
+            logger.info("[Auto-Rejoin] Started monitoring %s for game %s", account, config.get('place_id'), extra={'account': account})
+            if account in self.tracked_pids:
+                session.pid = self.tracked_pids[account]
+                logger.info("[Auto-Rejoin] [%s] Using pre-matched PID %s", account, session.pid, extra={'account': account})
+                self._set_state(session, VERIFYING)
+                return 0
+            logger.info("[Auto-Rejoin] [%s] No pre-matched PID - launching game...", account, extra={'account': account})
+            self._set_state(session, LAUNCHING)
+
+        if session.state in (LAUNCHING, BACKOFF):
+            return self._step_launch(session)
+
+        if session.state == DISCONNECTED:
+            session.failed_checks = 0
+            logger.info("[Auto-Rejoin] [%s] Disconnection detected! Rejoining... (Attempt %s/%s)", account, session.retry_count + 1, config.get('max_retries', 5), extra={'account': account})
+            self._close_tracked_process(session)
+            self._record_job_outcome(session, False)
+            self._metrics_for(account).rejoins += 1
+            self._set_state(session, LAUNCHING)
+            return self._step_launch(session)
+
+        return self._step_verify(session)
+
+    def _step_launch(self, session):
+        account = session.account
+        config = session.config
+        max_retries = config.get('max_retries', 5)
+
+        if not self._launch_slots.acquire(blocking=False):
+            return self.LAUNCH_SLOT_RETRY_SECONDS + random.uniform(0, 0.5)
+        try:
+            if session.state == STOPPED:
+                return None
+            session.retry_count += 1
+            job_id, source = self._choose_job_id(session)
+            session.target_job_id = job_id
+            if job_id:
+                logger.info("[Auto-Rejoin] [%s] Rejoining server %s (%s)", account, job_id, source, extra={'account': account})
+            launch_started = time.time()
+            success = self._launch_and_track_pid(account, config.get('place_id'), config.get('private_server', ''), job_id)
+        finally:
+            self._launch_slots.release()
+
+        metrics = self._metrics_for(account)
+        metrics.record_launch(time.time() - launch_started, success)
+        if session.state == STOPPED:
+            return None
+
+        if success:
+            session.pid = self.tracked_pids.get(account)
+            logger.info("[Auto-Rejoin] [%s] Rejoin attempt successful", account, extra={'account': account})
+            session.retry_count = 0
+            self._set_state(session, VERIFYING)
+            return self.cadence.after_launch(session, self.LAUNCH_GRACE_SECONDS)
+
+        if session.retry_count >= max_retries:
+            logger.warning("[Auto-Rejoin] [%s] Max retries (%s) reached. Stopping.", account, max_retries, extra={'account': account})
+            metrics.record_error(f"Max retries ({max_retries}) reached")
+            self._set_state(session, STOPPED)
+            return None
+
+        metrics.record_error(f"Launch attempt {session.retry_count} failed")
+        self._record_job_outcome(session, False)
+        self._refresh_server_list(config.get('place_id'))
+        self._set_state(session, BACKOFF)
+        delay = self.cadence.backoff(session, session.retry_count)
+        logger.warning("[Auto-Rejoin] [%s] Launch failed, retrying in %.0fs", account, delay, extra={'account': account})
+        return delay
+
+    def _step_verify(self, session):
+        account = session.account
+        config = session.config
+        place_id = config.get('place_id')
+        
+        if session.process_exited:
+            logger.info("[Auto-Rejoin] [%s] Roblox process exited", account, extra={'account': account})
+            self._set_state(session, DISCONNECTED)
+            return 0
+
+        wait = max(RobloxAPI.request_budget.try_acquire(), self._rate_limited_until - time.time())
+        if wait > 0:
+            return wait + random.uniform(0, 1)
+
+        metrics = self._metrics_for(account)
+        request_started = time.time()
+        presence, status_code, retry_after = RobloxAPI.get_presence_with_status(session.user_id, session.cookie)
+        metrics.record_presence(time.time() - request_started, status_code)
+        if self.status_store is not None:
+            self.status_store.update_presence(account, presence, validated=True)
+
+        if status_code == 429:
+            session.rate_limit_strikes += 1
+            delay = self.cadence.backoff(session, session.rate_limit_strikes, minimum=retry_after or 0)
+            with self._lock:
+                self._rate_limited_until = max(self._rate_limited_until, time.time() + (retry_after or delay))
+            logger.warning("[Auto-Rejoin] [%s] Presence API rate limited, next check in %.0fs", account, delay, extra={'account': account})
+            metrics.record_error("Presence API rate limited")
+            return delay
+        if status_code is not None and status_code != 200:
+            logger.warning("[Auto-Rejoin] [%s] Presence API returned status %s", account, status_code, extra={'account': account})
+            metrics.record_error(f"Presence API returned status {status_code}")
+        elif status_code is None:
+            metrics.record_error("Presence request failed")
+
+        if config.get('check_presence', True):
+            in_game = False
+            if presence and presence.get('in_game'):
+                try:
+                    in_game = int(presence.get('place_id')) == int(place_id)
+                except (ValueError, TypeError):
+                    in_game = False
+            logger.debug("[Auto-Rejoin] [%s] Presence check - in_game: %s, expected: %s", account, in_game, place_id, extra={'account': account})
+        else:
+            in_game = bool(presence and presence.get('in_game'))
+            if presence:
+                logger.debug("[Auto-Rejoin] [%s] Presence check (any game mode) - in_game: %s, place_id: %s", account, in_game, presence.get('place_id'), extra={'account': account})
+
+        if in_game:
+            game_id = presence.get('game_id')
+            if session.target_job_id:
+                self._record_job_outcome(session, session.target_job_id == game_id)
+            # In "any game" mode the account can be in another place, whose job IDs must not
+            # be remembered as servers of the configured place
+            try:
+                in_place = int(presence.get('place_id')) == int(place_id)
+            except (ValueError, TypeError):
+                in_place = False
+            if game_id and in_place:
+                self.affinity.record_seen(place_id, game_id, account)
+                session.last_game_id = game_id
+            session.failed_checks = 0
+            session.retry_count = 0
+            self._set_state(session, IN_GAME)
+            delay = self.cadence.stable(session)
+            logger.debug("[Auto-Rejoin] [%s] Still in game %s, next check in %.0fs", account, place_id, delay, extra={'account': account})
+            return delay
+
+        session.failed_checks += 1
+        if session.failed_checks < self.MAX_CONSECUTIVE_FAILS:
+            reason = "Presence API failed" if presence is None else "Presence check failed"
+            logger.info("[Auto-Rejoin] [%s] %s (%s/%s), will verify next check", account, reason, session.failed_checks, self.MAX_CONSECUTIVE_FAILS, extra={'account': account})
+            self._set_state(session, VERIFYING)
+            return self.cadence.suspect(session)
+
+        if presence is None:
+            logger.warning("[Auto-Rejoin] [%s] Presence API returned None", account, extra={'account': account})
+        self._record_job_outcome(session, False)
+        self._set_state(session, DISCONNECTED)
+        return 0
+
+    def _choose_job_id(self, session):
+        """
+        Server to rejoin, from cached data only: the configured job ID, the best
+        remembered server for this account, then the smallest cached public server
+        Returns (job_id, source), job_id is '' to let Roblox pick
+        """
+        config = session.config
+        if config.get('job_id'):
+            return config['job_id'], "configured"
+        place_id = config.get('place_id')
+        job_id = self.affinity.best_job(place_id, session.account)
+        if job_id:
+            return job_id, "last known server"
+        job_id = self.affinity.smallest_cached(place_id)
+        if job_id:
+            return job_id, "smallest cached server"
+        return '', None
+
+    def _record_job_outcome(self, session, success):
+        if not session.target_job_id:
+            return
+        self.affinity.record_outcome(session.config.get('place_id'), session.target_job_id, session.account, success)
+        session.target_job_id = ''
+        self._mark_dirty()
+
+    def _refresh_server_list(self, place_id):
+        """Refresh the cached server list after a failed launch, within the request budget"""
+        age = self.affinity.server_list_age(place_id)
+        if not place_id or (age is not None and age < self.affinity.server_list_ttl):
+            return
+        if RobloxAPI.request_budget.try_acquire() > 0:
+            return
+        servers = RobloxAPI.get_public_servers(place_id)
+        if servers:
+            self.affinity.set_server_list(place_id, servers)
+            self._mark_dirty()
+
+    def _close_tracked_process(self, session):
+        old_pid = self.tracked_pids.pop(session.account, None)
+        already_exited = session.process_exited
+        session.pid = None
+        session.process_exited = False
+        if not old_pid:
+            return
+        self.watcher.unwatch(old_pid)
+        if already_exited:
+            return
+        try:
+            process = psutil.Process(old_pid)
+            if process.name().lower() == ROBLOX_PROCESS_NAME:
+                process.kill()
+                process.wait(timeout=3)
+            logger.info("[Auto-Rejoin] [%s] Closed old Roblox instance (PID: %s)", session.account, old_pid, extra={'account': session.account})
+        except psutil.NoSuchProcess:
+            pass
+        except Exception as e:
+            logger.error("[Auto-Rejoin] [%s] Error closing instance (PID: %s): %s", session.account, old_pid, e, extra={'account': session.account})
+
+    def _launch_and_track_pid(self, account, place_id, private_server, job_id):
+        """
+        Launch the client and wait until its process is attributed to this account
+        Other launches run at the same time, each finishes as soon as its own PID is identified
+        """
+        session = self.sessions.get(account)
+        pending = PendingLaunch(account, session.user_id if session else None)
+
+        with self._lock:
+            self._pending_launches[account] = pending
+            self.registry.acquire("auto_rejoin_launch", self.ATTRIBUTION_POLL_SECONDS)
+
+        try:
+            launcher_pref = self.settings.get("roblox_launcher", "default")
+            success = self.manager.launch_roblox(account, place_id, private_server, launcher_pref, job_id)
+
+            if not success:
+                return False
+
+            logger.info("[Auto-Rejoin] [%s] Game launched successfully", account, extra={'account': account})
+
+            deadline = time.time() + self.ATTRIBUTION_TIMEOUT_SECONDS
+            while not pending.claimed.wait(self.ATTRIBUTION_POLL_SECONDS):
+                if time.time() >= deadline or (session is not None and session.state == STOPPED):
+                    break
+                self._attribute_unclaimed()
+
+            if pending.pid is None:
+                logger.warning("[Auto-Rejoin] [%s] No new Roblox process identified within %ss", account, self.ATTRIBUTION_TIMEOUT_SECONDS, extra={'account': account})
+                return False
+
+            self._track_pid(account, pending.pid)
+            logger.info("[Auto-Rejoin] [%s] Successfully tracked PID %s (%.1fs after launch)", account, pending.pid, time.time() - pending.launched_at, extra={'account': account})
+            return True
+        finally:
+            with self._lock:
+                if self._pending_launches.get(account) is pending:
+                    del self._pending_launches[account]
+                if not self._pending_launches:
+                    self.registry.release("auto_rejoin_launch")
+                    self._unclaimed.clear()
+
+    def _user_id_for_record(self, record, used_logs=None):
+        """User ID of a client from its startup log, cached on the registry record"""
+        if record.user_id is None:
+            user_id, _ = self.log_index.user_id_for_process(record.create_time, used_logs)
+            if user_id:
+                record.user_id = str(user_id)
+        return record.user_id
+
+    def _on_registry_event(self, event, record):
+        """Collect processes that appear while launches are pending"""
+        with self._lock:
+            if event == 'removed':
+                self._unclaimed.pop(record.pid, None)
+                return
+            if not self._pending_launches:
+                return
+            self._unclaimed[record.pid] = record
+        self._attribute_unclaimed()
+
+    def _attribute_unclaimed(self):
+        """Match new processes to pending launches by log user ID, or by launch time when only one launch is waiting"""
+        with self._lock:
+            candidates = sorted(self._unclaimed.values(), key=lambda r: r.create_time or 0)
+
+        for record in candidates:
+            with self._lock:
+                waiting = [p for p in self._pending_launches.values() if p.pid is None]
+                if not waiting or record.pid not in self._unclaimed:
+                    return
+                if record.pid in self.tracked_pids.values():
+                    self._unclaimed.pop(record.pid, None)
+                    continue
+                eligible = [p for p in waiting if not record.create_time or record.create_time >= p.launched_at - self.LAUNCH_CLOCK_SLACK]
+                if not eligible:
+                    self._unclaimed.pop(record.pid, None)
+                    continue
+
+            self._user_id_for_record(record, self._claimed_logs)
+
+            with self._lock:
+                if record.pid not in self._unclaimed:
+                    continue
+                waiting = [p for p in self._pending_launches.values() if p.pid is None]
+                eligible = [p for p in eligible if p in waiting]
+
+                match = None
+                if record.user_id:
+                    match = next((p for p in eligible if p.user_id and str(p.user_id) == record.user_id), None)
+                    if match is None and not any(p.user_id is None for p in eligible):
+                        self._unclaimed.pop(record.pid, None)
+                        continue
+                if match is None and len(waiting) == 1 and len(eligible) == 1:
+                    match = eligible[0]
+                if match is None:
+                    continue
+
+                match.pid = record.pid
+                self._unclaimed.pop(record.pid, None)
+                match.claimed.set()
+
+    def match_pids(self, accounts):
+        """Match running Roblox PIDs to accounts before monitoring starts"""
+        logger.info("[Auto-Rejoin] Starting global PID matching for %s account(s)...", len(accounts))
+
+        account_user_ids = {}
+        for account in accounts:
+            user_id = self._get_user_id(account)
+            if user_id:
+                account_user_ids[account] = str(user_id)
+                logger.debug("[Auto-Rejoin] %s -> User ID: %s", account, user_id, extra={'account': account})
+            else:
+                logger.warning("[Auto-Rejoin] %s -> Could not get user ID", account, extra={'account': account})
+
+        all_pids = self.registry.get_pids(max_age=0)
+        logger.info("[Auto-Rejoin] Found %s Roblox process(es)", len(all_pids))
+
+        if not all_pids:
+            return {}
+
+        used_logs = set()
+        pid_user_ids = {}
+        tracked = set(self.tracked_pids.values())
+        for pid in all_pids:
+            if pid in tracked:
+                logger.debug("[Auto-Rejoin] PID %s already tracked, skipping", pid)
+                continue
+
+            record = self.registry.get(pid)
+            user_id = self._user_id_for_record(record, used_logs) if record else None
+            if user_id:
+                pid_user_ids[pid] = str(user_id)
+                logger.debug("[Auto-Rejoin] PID %s -> User ID: %s", pid, user_id)
+            else:
+                logger.debug("[Auto-Rejoin] PID %s -> Could not extract user ID", pid)
+
+        matches = {}
+        for account, account_user_id in account_user_ids.items():
+            if account in self.tracked_pids:
+                continue
+
+            for pid, pid_user_id in pid_user_ids.items():
+                if account_user_id == pid_user_id:
+                    matches[account] = pid
+                    self._track_pid(account, pid)
+                    logger.info("[Auto-Rejoin] MATCHED: %s (user %s) -> PID %s", account, account_user_id, pid, extra={'account': account})
+                    del pid_user_ids[pid]
+                    break
+
+        unmatched = [acc for acc in accounts if acc not in matches and acc not in self.tracked_pids]
+        if unmatched:
+            logger.info("[Auto-Rejoin] Unmatched accounts (will launch new): %s", unmatched)
+
+        return matches
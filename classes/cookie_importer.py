@@ -0,0 +1,212 @@
+"""
+Bulk cookie importer
+Parses cookie dumps from files or the clipboard and verifies them concurrently
+"""
+
+import re
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .roblox_api import RobloxAPI
+
+
+COOKIE_PREFIX = "_|WARNING:-DO-NOT-SHARE-THIS."
+COOKIE_PATTERN = re.compile(r"_\|WARNING:-DO-NOT-SHARE-THIS\.[^|]*\|_[^\s,;\"'\]\}]+")
+JSON_COOKIE_KEYS = ("cookie", "Cookie", ".ROBLOSECURITY", "roblosecurity", "value")
+
+
+class CookieImporter:
+    """
+    Import many .ROBLOSECURITY cookies into a RobloxAccountManager at once
+    Verification draws from RobloxAPI.request_budget, so an import running next to
+    auto-rejoin stays within the rate the rest of the app keeps to
+    """
+
+    def __init__(self, manager, max_workers=8, max_retries=3, limiter=None):
+        self.manager = manager
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.limiter = limiter or RobloxAPI.request_budget
+
+    @staticmethod
+    def read_file(path):
+        """Read an import file, tolerating a UTF-8 BOM"""
+        with open(path, 'r', encoding='utf-8-sig', errors='replace') as f:
+            return f.read()
+
+    @staticmethod
+    def parse(text):
+        """
+        Yield (line, cookie_or_None, source) for every entry in a newline, CSV or JSON blob
+        cookie is None for lines that contain no recognisable cookie
+        """
+        text = (text or "").strip()
+        if not text:
+            return
+
+        if text[0] in "[{":
+            try:
+                data = json.loads(text)
+            except ValueError:
+                data = None
+
+            if data is not None:
+                if isinstance(data, dict):
+                    items = list(data.values()) if not any(k in data for k in JSON_COOKIE_KEYS) else [data]
+                elif isinstance(data, list):
+                    items = data
+                else:
+                    items = []
+
+                for index, item in enumerate(items, 1):
+                    value = item
+                    if isinstance(item, dict):
+                        value = next((item[k] for k in JSON_COOKIE_KEYS if isinstance(item.get(k), str)), "")
+                    match = COOKIE_PATTERN.search(value) if isinstance(value, str) else None
+                    yield index, match.group(0) if match else None, f"entry {index}"
+                return
+
+        for line_number, line in enumerate(text.splitlines(), 1):
+            if not line.strip():
+                continue
+            matches = COOKIE_PATTERN.findall(line)
+            if not matches:
+                yield line_number, None, line.strip()[:40]
+                continue
+            for cookie in matches:
+                yield line_number, cookie, f"line {line_number}"
+
+    def _verify(self, cookie):
+        """Resolve a cookie, retrying with backoff when rate limited"""
+        delay = 2.0
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire()
+            try:
+                identity, status_code = RobloxAPI.fetch_cookie_identity(cookie)
+            except Exception as e:
+                if attempt >= self.max_retries:
+                    return None, f"request failed: {e}"
+                time.sleep(delay)
+                delay *= 2
+                continue
+
+            if identity:
+                return identity, None
+            if status_code == 429 and attempt < self.max_retries:
+                time.sleep(delay)
+                delay *= 2
+                continue
+            if status_code == 401:
+                return None, "invalid or expired"
+            return None, f"HTTP {status_code}"
+
+        return None, "rate limited"
+
+    def run(self, text, progress_callback=None):
+        """
+        Parse, deduplicate, verify and store cookies from text
+        Returns a list of per-entry result dicts ordered by line
+        """
+        existing = {}
+        for username, data in self.manager.accounts.items():
+            if isinstance(data, dict) and data.get('cookie'):
+                existing[data['cookie']] = username
+
+        results = []
+        pending = []
+        seen = set()
+
+        for line, cookie, source in self.parse(text):
+            result = {'line': line, 'source': source, 'status': '', 'username': None, 'message': ''}
+            results.append(result)
+
+            if cookie is None:
+                result['status'] = 'invalid_format'
+                result['message'] = "no cookie found"
+            elif cookie in seen:
+                result['status'] = 'duplicate'
+                result['message'] = "duplicate in import"
+            elif cookie in existing:
+                seen.add(cookie)
+                result['status'] = 'exists'
+                result['username'] = existing[cookie]
+                result['message'] = "already saved"
+            else:
+                seen.add(cookie)
+                pending.append((result, cookie))
+
+        total = len(pending)
+        done = 0
+        accepted = []
+
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, total)) as executor:
+                futures = {executor.submit(self._verify, cookie): (result, cookie) for result, cookie in pending}
+                for future in as_completed(futures):
+                    result, cookie = futures[future]
+                    try:
+                        identity, error = future.result()
+                    except Exception as e:
+                        identity, error = None, str(e)
+
+                    if identity:
+                        result['status'] = 'imported'
+                        result['username'] = identity.get('username')
+                        accepted.append((result, cookie, identity))
+                    else:
+                        result['status'] = 'failed'
+                        result['message'] = error or "verification failed"
+
+                    done += 1
+                    if progress_callback:
+                        progress_callback(done, total)
+
+        if accepted:
+            added_date = time.strftime('%Y-%m-%d %H:%M:%S')
+            for result, cookie, identity in sorted(accepted, key=lambda item: item[0]['line']):
+                username = identity['username']
+                account = self.manager.accounts.get(username)
+                if account:
+                    account['cookie'] = cookie
+                    account['user_id'] = identity.get('user_id', 0)
+                    account['display_name'] = identity.get('display_name', '')
+                    result['status'] = 'updated'
+                    result['message'] = "cookie replaced"
+                else:
+                    self.manager.accounts[username] = {
+                        'username': username,
+                        'cookie': cookie,
+                        'user_id': identity.get('user_id', 0),
+                        'display_name': identity.get('display_name', ''),
+                        'added_date': added_date,
+                        'note': ''
+                    }
+            self.manager.save_accounts()
+
+        results.sort(key=lambda r: r['line'])
+        return results
+
+    @staticmethod
+    def summarize(results):
+        """Count results by status"""
+        counts = {}
+        for result in results:
+            counts[result['status']] = counts.get(result['status'], 0) + 1
+        return counts
+
+    @staticmethod
+    def print_report(results):
+        """Print one line per imported entry"""
+        for result in results:
+            status = result['status']
+            if status in ('imported', 'updated'):
+                prefix = "[SUCCESS]"
+            elif status in ('exists', 'duplicate'):
+                prefix = "[INFO]"
+            else:
+                prefix = "[ERROR]"
+            detail = result['username'] or ""
+            if result['message']:
+                detail = f"{detail} ({result['message']})" if detail else result['message']
+            print(f"{prefix} {result['source']}: {status} {detail}".rstrip())
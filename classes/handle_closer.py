@@ -0,0 +1,341 @@
+"""
+Handle closer
+Closes the ROBLOX_singletonEvent handle inside new clients so several instances can run
+"""
+
+import os
+import re
+import time
+import subprocess
+
+
+SINGLETON_EVENT_NAME = "ROBLOX_singletonEvent"
+
+
+class NativeHandleBackend:
+    """
+    Enumerates a process's handles in-process with ntdll and closes matching ones
+    with DuplicateHandle(DUPLICATE_CLOSE_SOURCE), no helper processes involved
+    """
+
+    name = "native"
+    min_retry_interval = 0.1
+
+    PROCESS_DUP_HANDLE = 0x0040
+    PROCESS_QUERY_INFORMATION = 0x0400
+    DUPLICATE_CLOSE_SOURCE = 0x1
+    DUPLICATE_SAME_ACCESS = 0x2
+    PROCESS_HANDLE_INFORMATION = 51
+    OBJECT_NAME_INFORMATION = 1
+    OBJECT_TYPE_INFORMATION = 2
+    STATUS_INFO_LENGTH_MISMATCH = 0xC0000004
+    STATUS_BUFFER_OVERFLOW = 0x80000005
+
+    def __init__(self, object_type="Event"):
+        import ctypes
+        from ctypes import wintypes
+
+        self.ctypes = ctypes
+        self.wintypes = wintypes
+        self.object_type = object_type
+        self._type_index = None
+
+        self.kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        self.ntdll = ctypes.WinDLL("ntdll")
+
+        class UNICODE_STRING(ctypes.Structure):
+            _fields_ = [
+                ("Length", wintypes.USHORT),
+                ("MaximumLength", wintypes.USHORT),
+                ("Buffer", ctypes.c_void_p),
+            ]
+
+        class PROCESS_HANDLE_TABLE_ENTRY_INFO(ctypes.Structure):
+            _fields_ = [
+                ("HandleValue", wintypes.HANDLE),
+                ("HandleCount", ctypes.c_size_t),
+                ("PointerCount", ctypes.c_size_t),
+                ("GrantedAccess", wintypes.ULONG),
+                ("ObjectTypeIndex", wintypes.ULONG),
+                ("HandleAttributes", wintypes.ULONG),
+                ("Reserved", wintypes.ULONG),
+            ]
+
+        class PROCESS_HANDLE_SNAPSHOT_INFORMATION(ctypes.Structure):
+            _fields_ = [
+                ("NumberOfHandles", ctypes.c_size_t),
+                ("Reserved", ctypes.c_size_t),
+            ]
+
+        self.UNICODE_STRING = UNICODE_STRING
+        self.ENTRY = PROCESS_HANDLE_TABLE_ENTRY_INFO
+        self.SNAPSHOT = PROCESS_HANDLE_SNAPSHOT_INFORMATION
+
+        self.kernel32.OpenProcess.restype = wintypes.HANDLE
+        self.kernel32.OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+        self.kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+        self.kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+        self.kernel32.DuplicateHandle.argtypes = [
+            wintypes.HANDLE, wintypes.HANDLE, wintypes.HANDLE,
+            ctypes.POINTER(wintypes.HANDLE), wintypes.DWORD, wintypes.BOOL, wintypes.DWORD
+        ]
+        self.ntdll.NtQueryInformationProcess.restype = wintypes.LONG
+        self.ntdll.NtQueryInformationProcess.argtypes = [
+            wintypes.HANDLE, wintypes.ULONG, ctypes.c_void_p, wintypes.ULONG, ctypes.POINTER(wintypes.ULONG)
+        ]
+        self.ntdll.NtQueryObject.restype = wintypes.LONG
+        self.ntdll.NtQueryObject.argtypes = [
+            wintypes.HANDLE, wintypes.ULONG, ctypes.c_void_p, wintypes.ULONG, ctypes.POINTER(wintypes.ULONG)
+        ]
+
+    def _status(self, value):
+        return value & 0xFFFFFFFF
+
+    def _query(self, function, handle, info_class, size):
+        """Call an NtQuery* function, growing the buffer until it fits"""
+        ctypes = self.ctypes
+        while True:
+            buffer = ctypes.create_string_buffer(size)
+            needed = self.wintypes.ULONG(0)
+            status = self._status(function(handle, info_class, buffer, size, ctypes.byref(needed)))
+            if status in (self.STATUS_INFO_LENGTH_MISMATCH, self.STATUS_BUFFER_OVERFLOW):
+                size = max(size * 2, needed.value + 1024)
+                continue
+            if status != 0:
+                raise OSError(f"NTSTATUS 0x{status:08X}")
+            return buffer
+
+    def _handle_entries(self, process):
+        buffer = self._query(self.ntdll.NtQueryInformationProcess, process, self.PROCESS_HANDLE_INFORMATION, 0x4000)
+        header = self.SNAPSHOT.from_buffer(buffer)
+        entries = (self.ENTRY * header.NumberOfHandles).from_buffer(buffer, self.ctypes.sizeof(self.SNAPSHOT))
+        return [(entry.HandleValue, entry.ObjectTypeIndex) for entry in entries]
+
+    def _object_string(self, handle, info_class):
+        buffer = self._query(self.ntdll.NtQueryObject, handle, info_class, 0x400)
+        value = self.UNICODE_STRING.from_buffer(buffer)
+        if not value.Buffer or not value.Length:
+            return ""
+        return self.ctypes.wstring_at(value.Buffer, value.Length // 2)
+
+    def close_handles(self, pid, object_name=SINGLETON_EVENT_NAME):
+        """Close every handle in pid whose object name ends with object_name, returns how many were closed"""
+        ctypes = self.ctypes
+        wintypes = self.wintypes
+        process = self.kernel32.OpenProcess(self.PROCESS_DUP_HANDLE | self.PROCESS_QUERY_INFORMATION, False, pid)
+        if not process:
+            raise OSError(f"OpenProcess failed for PID {pid} (error {ctypes.get_last_error()})")
+
+        current = self.kernel32.GetCurrentProcess()
+        closed = 0
+        try:
+            for handle_value, type_index in self._handle_entries(process):
+                if self._type_index is not None and type_index != self._type_index:
+                    continue
+
+                local = wintypes.HANDLE()
+                if not self.kernel32.DuplicateHandle(process, handle_value, current, ctypes.byref(local), 0, False, self.DUPLICATE_SAME_ACCESS):
+                    continue
+                try:
+                    if self._type_index is None:
+                        if self._object_string(local, self.OBJECT_TYPE_INFORMATION) != self.object_type:
+                            continue
+                        self._type_index = type_index
+                    name = self._object_string(local, self.OBJECT_NAME_INFORMATION)
+                except OSError:
+                    continue
+                finally:
+                    self.kernel32.CloseHandle(local)
+
+                if name.endswith("\\" + object_name):
+                    if self.kernel32.DuplicateHandle(process, handle_value, None, None, 0, False, self.DUPLICATE_CLOSE_SOURCE):
+                        closed += 1
+        finally:
+            self.kernel32.CloseHandle(process)
+        return closed
+
+
+class Handle64Backend:
+    """Sysinternals handle64.exe, used when the native backend is unavailable"""
+
+    name = "handle64"
+    # Every lookup starts a helper process and walks the whole handle table
+    min_retry_interval = 1.0
+    HANDLE_PATTERN = re.compile(r"([0-9A-F]+):.*ROBLOX_singletonEvent", re.IGNORECASE)
+
+    def __init__(self, path):
+        self.path = path
+        self.creationflags = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+
+    def _run(self, args, capture=False):
+        return subprocess.run(
+            [self.path, "-accepteula"] + args,
+            stdout=subprocess.PIPE if capture else subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            stdin=subprocess.DEVNULL,
+            text=True,
+            timeout=5,
+            creationflags=self.creationflags
+        )
+
+    def close_handles(self, pid, object_name=SINGLETON_EVENT_NAME):
+        proc = self._run(["-p", str(pid), "-a", object_name], capture=True)
+        closed = 0
+        for line in (proc.stdout or "").splitlines():
+            if object_name not in line:
+                continue
+            match = self.HANDLE_PATTERN.search(line)
+            if match:
+                self._run(["-p", str(pid), "-c", match.group(1), "-y"])
+                closed += 1
+        return closed
+
+
+class FakeHandleBackend:
+    """Simulated clients for exercising the closer without Windows"""
+
+    name = "fake"
+    min_retry_interval = 0.0
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.processes = {}
+        self.calls = 0
+
+    def spawn(self, pid, ready_after_calls=0):
+        """A client whose singleton handle appears after `ready_after_calls` lookups"""
+        self.processes[pid] = {'ready_after': ready_after_calls, 'open': True, 'calls': 0}
+
+    def kill(self, pid):
+        self.processes.pop(pid, None)
+
+    def exists(self, pid):
+        return pid in self.processes
+
+    def is_open(self, pid):
+        return self.processes.get(pid, {}).get('open', False)
+
+    def close_handles(self, pid, object_name=SINGLETON_EVENT_NAME):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        process = self.processes.get(pid)
+        if process is None:
+            raise OSError(f"No such process {pid}")
+        process['calls'] += 1
+        if process['calls'] <= process['ready_after'] or not process['open']:
+            return 0
+        process['open'] = False
+        return 1
+
+
+class HandleCloser:
+    """
+    Closes a client's singleton handle with the first working backend
+    A backend that raises is skipped from then on; a backend that finds nothing is retried
+    until timeout, since a slow-starting client may not have created the handle yet.
+    Retries are spaced by retry_interval or the backend's min_retry_interval, whichever is longer
+    """
+
+    def __init__(self, backends, timeout=6.0, retry_interval=0.1, object_name=SINGLETON_EVENT_NAME, process_exists=None):
+        self.backends = list(backends)
+        self.timeout = timeout
+        self.retry_interval = retry_interval
+        self.object_name = object_name
+        self.process_exists = process_exists or _pid_exists
+        self._failed = set()
+
+    @property
+    def available(self):
+        return any(backend.name not in self._failed for backend in self.backends)
+
+    def describe(self):
+        return ", ".join(backend.name for backend in self.backends if backend.name not in self._failed) or "none"
+
+    def close_singleton(self, pid, create_time=None):
+        """
+        Returns (closed, backend_name, elapsed_seconds)
+        A client created more than timeout seconds ago gets a single lookup: its handle is either
+        there already or was closed before (e.g. clients replayed when monitoring starts)
+        """
+        started = time.perf_counter()
+        deadline = started + self.timeout
+        if create_time and time.time() - create_time > self.timeout:
+            deadline = started
+        attempt = 0
+        while True:
+            for backend in self.backends:
+                if backend.name in self._failed:
+                    continue
+                try:
+                    if backend.close_handles(pid, self.object_name):
+                        return True, backend.name, time.perf_counter() - started
+                    interval = max(self.retry_interval, getattr(backend, 'min_retry_interval', 0.0))
+                    break
+                except Exception as e:
+                    if attempt == 0:
+                        print(f"[WARNING] {backend.name} handle backend failed for PID:{pid}: {e}")
+                    if not self.process_exists(pid):
+                        return False, None, time.perf_counter() - started
+                    if isinstance(e, (OSError, subprocess.SubprocessError)):
+                        self._failed.add(backend.name)
+            else:
+                return False, None, time.perf_counter() - started
+            attempt += 1
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0 or not self.process_exists(pid):
+                return False, None, time.perf_counter() - started
+            time.sleep(min(interval, remaining))
+
+
+def _pid_exists(pid):
+    try:
+        import psutil
+        return psutil.pid_exists(pid)
+    except ImportError:
+        return True
+
+
+def create_default_closer(handle64_path=None, **kwargs):
+    """Native backend on Windows with handle64.exe as fallback when it is available"""
+    backends = []
+    if os.name == 'nt':
+        try:
+            backends.append(NativeHandleBackend())
+        except (ImportError, OSError, AttributeError) as e:
+            print(f"[WARNING] Native handle backend unavailable: {e}")
+    if handle64_path:
+        backends.append(Handle64Backend(handle64_path))
+    return HandleCloser(backends, **kwargs)
+
+
+def run_timing_harness(clients=50, ready_after_calls=2, latency=0.0005, retry_interval=0.005):
+    """
+    Time the closer against simulated clients
+    Each fake client only exposes its handle after a few lookups, like a client still starting up
+    """
+    backend = FakeHandleBackend(latency=latency)
+    closer = HandleCloser([backend], retry_interval=retry_interval, process_exists=backend.exists)
+    timings = []
+    for pid in range(1000, 1000 + clients):
+        backend.spawn(pid, ready_after_calls=ready_after_calls)
+        closed, _, elapsed = closer.close_singleton(pid)
+        if not closed:
+            print(f"[FAILED] Handle not closed for PID:{pid}")
+        timings.append(elapsed * 1000)
+
+    timings.sort()
+    result = {
+        'clients': clients,
+        'lookups': backend.calls,
+        'median_ms': round(timings[len(timings) // 2], 2),
+        'max_ms': round(timings[-1], 2),
+        'total_ms': round(sum(timings), 2)
+    }
+    print(f"[INFO] Closed {clients} handles: median {result['median_ms']}ms, max {result['max_ms']}ms, "
+          f"{result['lookups']} lookups")
+    return result
+
+
+if __name__ == "__main__":
+    run_timing_harness()
@@ -0,0 +1,343 @@
+"""
+Headless services
+The account manager, auto-rejoin, anti-AFK and Roblox process tracking without Tk,
+shared by daemon.py and the command-line interface
+"""
+
+import os
+import sys
+import json
+import time
+import getpass
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .encryption import EncryptionConfig
+from .roblox_api import RobloxAPI
+
+
+DATA_FOLDER = "AccountManagerData"
+PASSWORD_ENV = "RAM_PASSWORD"
+
+
+def resolve_password(password=None, password_file=None, data_folder=DATA_FOLDER):
+    """
+    Password for a password-encrypted vault, or None when the vault does not need one
+    Tries the argument, then password_file, then $RAM_PASSWORD, then a terminal prompt
+    """
+    config = EncryptionConfig(os.path.join(data_folder, "encryption_config.json"))
+    if not config.is_encryption_enabled() or config.get_encryption_method() != 'password':
+        return None
+    if password:
+        return password
+    if password_file:
+        with open(password_file, 'r', encoding='utf-8') as f:
+            return f.read().strip()
+    if os.environ.get(PASSWORD_ENV):
+        return os.environ[PASSWORD_ENV]
+    if sys.stdin and sys.stdin.isatty():
+        return getpass.getpass("Vault password: ")
+    raise ValueError(f"Vault is password-encrypted, pass --password-file or set {PASSWORD_ENV}")
+
+
+class HeadlessApp:
+    """
+    What the desktop app runs, minus the window
+    Settings are shared with the desktop app (ui_settings.json), so the daemon should not
+    run while the window is open
+    """
+
+    HANDLE_WORKERS = 4
+
+    def __init__(self, password=None, settings_file=None):
+        RobloxAPI.show_dialogs = False
+
+        from .account_manager import RobloxAccountManager
+        self.manager = RobloxAccountManager(password=password)
+        self.data_folder = self.manager.data_folder
+        self.settings_file = settings_file or os.path.join(self.data_folder, "ui_settings.json")
+        self.settings = self._load_settings()
+        self._loaded_settings = json.dumps(self.settings, sort_keys=True)
+        # Held by anything that changes settings from a worker thread and while they are serialized
+        self.settings_lock = threading.RLock()
+
+        self.registry = None
+        self.log_index = None
+        self.window_index = None
+        self.auto_rejoin = None
+        self.anti_afk = None
+        self.handle_closer = None
+        self.multi_roblox_handle = None
+        self._handle_pool = None
+        self._closing_pids = set()
+        self._closing_lock = threading.Lock()
+        self.started_at = time.time()
+
+    def _load_settings(self):
+        try:
+            if os.path.exists(self.settings_file):
+                with open(self.settings_file, 'r') as f:
+                    return json.load(f)
+        except Exception as e:
+            print(f"[WARNING] Could not read settings, using defaults: {e}")
+        return {}
+
+    def save_settings(self, force_immediate=False):
+        with self.settings_lock:
+            try:
+                temp_file = self.settings_file + ".tmp"
+                with open(temp_file, 'w') as f:
+                    json.dump(self.settings, f, indent=2)
+                os.replace(temp_file, self.settings_file)
+            except Exception as e:
+                print(f"[ERROR] Failed to save settings: {e}")
+
+    @property
+    def launcher(self):
+        return self.settings.get("roblox_launcher", "default")
+
+    def start_services(self, rejoin=True, anti_afk=None, multi_roblox=None):
+        """
+        Start process tracking and the long-running subsystems
+        anti_afk / multi_roblox default to what is enabled in the settings
+        """
+        from .process_registry import RobloxProcessRegistry
+        from .log_index import RobloxLogIndex
+        from .window_index import WindowIndex, create_default_window_source
+
+        self.registry = RobloxProcessRegistry()
+        self.log_index = RobloxLogIndex()
+        self.window_index = WindowIndex(create_default_window_source(), self.registry)
+
+        if multi_roblox is None:
+            multi_roblox = self.settings.get("enable_multi_roblox", False)
+        if anti_afk is None:
+            anti_afk = self.settings.get("anti_afk_enabled", False)
+
+        if multi_roblox:
+            self.enable_multi_roblox()
+
+        if rejoin:
+            from .auto_rejoin import AutoRejoinSupervisor
+            self.auto_rejoin = AutoRejoinSupervisor(
+                self.manager,
+                self.settings.setdefault("auto_rejoin_configs", {}),
+                self.settings,
+                save_settings=self.save_settings,
+                settings_lock=self.settings_lock,
+                registry=self.registry,
+                log_index=self.log_index
+            )
+            self.auto_rejoin.resume(relaunch=self.settings.get("auto_rejoin_relaunch_on_start") is True)
+
+        if anti_afk:
+            self.start_anti_afk()
+
+    def enable_multi_roblox(self):
+        """Multi Roblox without prompts: the singleton closer in handle64 mode, the mutex otherwise"""
+        if os.name != 'nt':
+            print("[WARNING] Multi Roblox is only available on Windows")
+            return False
+
+        mutex = None
+        if self.settings.get("multi_roblox_method", "default") == "handle64":
+            from .handle_closer import create_default_closer
+            handle64_path = os.path.join(self.data_folder, 'handle64.exe')
+            closer = create_default_closer(handle64_path if os.path.exists(handle64_path) else None)
+            if closer.available:
+                self.handle_closer = closer
+                # Launch bursts queue here instead of starting a thread per client
+                self._handle_pool = ThreadPoolExecutor(max_workers=self.HANDLE_WORKERS, thread_name_prefix="HandleCloser")
+                self.registry.subscribe(self._on_process_event, replay=True)
+                self.registry.acquire("handle64", 0.4)
+                print(f"[INFO] Multi Roblox activated (handle backends: {closer.describe()})")
+            else:
+                print("[INFO] No handle backend available. Falling back to default method.")
+
+        if self.handle_closer is None:
+            import win32event
+            mutex = win32event.CreateMutex(None, True, "ROBLOX_singletonEvent")
+            print("[INFO] Multi Roblox activated (mutex mode).")
+
+        cookie_file = None
+        cookies_path = os.path.join(os.getenv('LOCALAPPDATA', ''), r'Roblox\LocalStorage\RobloxCookies.dat')
+        if os.path.exists(cookies_path):
+            try:
+                import msvcrt
+                cookie_file = open(cookies_path, 'r+b')
+                msvcrt.locking(cookie_file.fileno(), msvcrt.LK_NBLCK, os.path.getsize(cookies_path))
+                print("[SUCCESS] Error 773 fix applied.")
+            except OSError:
+                print("[WARNING] Could not lock RobloxCookies.dat. It may already be locked.")
+
+        self.multi_roblox_handle = {'mutex': mutex, 'file': cookie_file}
+        return True
+
+    def _on_process_event(self, event, record):
+        pool = self._handle_pool
+        if event != 'added' or self.handle_closer is None or pool is None:
+            return
+
+        def close():
+            try:
+                closed, backend, elapsed = self.handle_closer.close_singleton(record.pid, record.create_time)
+            except Exception as e:
+                print(f"[FAILED] Handle not closed for PID:{record.pid}: {e}")
+                return
+            finally:
+                with self._closing_lock:
+                    self._closing_pids.discard(record.pid)
+            if closed:
+                print(f"[SUCCESS] Closed handle event for PID:{record.pid} ({backend}, {elapsed * 1000:.0f}ms)")
+            else:
+                print(f"[FAILED] Handle not closed for PID:{record.pid}")
+
+        with self._closing_lock:
+            self._closing_pids.add(record.pid)
+        try:
+            pool.submit(close)
+        except RuntimeError:
+            # Shutting down
+            with self._closing_lock:
+                self._closing_pids.discard(record.pid)
+
+    def wait_for_new_clients(self, known_pids, count, timeout=60.0):
+        """
+        Block until count clients that are not in known_pids are running and none of their
+        singleton handles is still being closed, so Multi Roblox stays in effect while they start
+        Returns the new PIDs seen
+        """
+        deadline = time.time() + timeout
+        new_pids = set()
+        while True:
+            new_pids = set(self.registry.get_pids(max_age=0.25)) - set(known_pids)
+            with self._closing_lock:
+                busy = bool(self._closing_pids)
+            if (len(new_pids) >= count and not busy) or time.time() >= deadline:
+                return new_pids
+            time.sleep(0.25)
+
+    def _list_roblox_windows(self):
+        return self.window_index.all_windows(max_age=5.0)
+
+    def start_anti_afk(self):
+        from .anti_afk import AntiAfkScheduler, create_input_backend
+        if self.anti_afk and self.anti_afk.is_running():
+            return True
+        backend = create_input_backend(self.settings.get("anti_afk_delivery", "foreground"))
+        self.window_index.start()
+        self.anti_afk = AntiAfkScheduler(self._list_roblox_windows, backend, self.settings)
+        self.anti_afk.start()
+        print(f"[Anti-AFK] Started ({backend.name} input)")
+        return True
+
+    def stop_anti_afk(self):
+        if self.anti_afk and self.anti_afk.is_running():
+            self.anti_afk.stop()
+            print("[Anti-AFK] Stopped")
+        self.anti_afk = None
+
+    def accounts(self):
+        """Account list without cookies or passwords"""
+        result = []
+        for username, data in self.manager.accounts.items():
+            data = data if isinstance(data, dict) else {}
+            result.append({
+                'username': username,
+                'user_id': data.get('user_id'),
+                'note': data.get('note', ''),
+            })
+        return result
+
+    def launch(self, usernames, place_id="", private_server="", job_id="", concurrency=1, delay=0.0):
+        """Launch several accounts, returns [{'account', 'success', 'error'}] in input order"""
+        missing = [username for username in usernames if username not in self.manager.accounts]
+        results = {username: {'account': username, 'success': False, 'error': 'Account not found'} for username in missing}
+        pending = [username for username in usernames if username not in results]
+        start_lock = threading.Lock()
+        last_start = [0.0]
+
+        def launch_one(username):
+            if delay:
+                with start_lock:
+                    wait = last_start[0] + delay - time.time()
+                    if wait > 0:
+                        time.sleep(wait)
+                    last_start[0] = time.time()
+            try:
+                success = self.manager.launch_roblox(username, str(place_id or ""), private_server or "", self.launcher, job_id or "")
+                return {'account': username, 'success': bool(success), 'error': None if success else 'Launch failed'}
+            except Exception as e:
+                return {'account': username, 'success': False, 'error': str(e)}
+
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+            for result in pool.map(launch_one, pending):
+                results[result['account']] = result
+        return [results[username] for username in usernames]
+
+    def join_user(self, usernames, target_username, concurrency=1, delay=0.0):
+        """Launch accounts into the server target_username is playing in"""
+        user_id = RobloxAPI.get_user_id_from_username(target_username)
+        if not user_id:
+            return {'error': f"User '{target_username}' not found", 'results': []}
+
+        cookie = self.manager.get_account_cookie(usernames[0]) if usernames else None
+        if not cookie:
+            return {'error': "Failed to get account cookie", 'results': []}
+
+        presence = RobloxAPI.get_player_presence(user_id, cookie)
+        if not presence:
+            return {'error': f"Failed to get presence for '{target_username}'", 'results': []}
+        if not presence.get('in_game') or not presence.get('place_id'):
+            return {'error': f"'{target_username}' is not currently in a game", 'results': []}
+
+        place_id = str(presence.get('place_id'))
+        job_id = str(presence.get('game_id') or '')
+        results = self.launch(usernames, place_id, "", job_id, concurrency=concurrency, delay=delay)
+        return {'error': None, 'place_id': place_id, 'job_id': job_id, 'results': results}
+
+    def status(self):
+        pids = sorted(self.registry.get_pids(max_age=5.0)) if self.registry else []
+        return {
+            'uptime': round(time.time() - self.started_at),
+            'accounts': len(self.manager.accounts),
+            'roblox_pids': pids,
+            'auto_rejoin': self.auto_rejoin.active_accounts() if self.auto_rejoin else [],
+            'anti_afk': bool(self.anti_afk and self.anti_afk.is_running()),
+            'multi_roblox': self.multi_roblox_handle is not None,
+        }
+
+    def shutdown(self):
+        self.stop_anti_afk()
+        if self.auto_rejoin:
+            self.auto_rejoin.shutdown()
+        if self.window_index:
+            self.window_index.stop()
+        if self.registry and self.handle_closer:
+            self.registry.release("handle64")
+        if self._handle_pool:
+            self._handle_pool.shutdown(wait=False, cancel_futures=True)
+            self._handle_pool = None
+        if self.multi_roblox_handle:
+            cookie_file = self.multi_roblox_handle.get('file')
+            if cookie_file:
+                try:
+                    cookie_file.close()
+                except Exception:
+                    pass
+            mutex = self.multi_roblox_handle.get('mutex')
+            if mutex:
+                try:
+                    import win32api
+                    import win32event
+                    win32event.ReleaseMutex(mutex)
+                    win32api.CloseHandle(mutex)
+                except Exception:
+                    pass
+            self.multi_roblox_handle = None
+        RobloxAPI.restore_installers()
+        # Short CLI runs leave the settings alone unless something changed them
+        with self.settings_lock:
+            changed = json.dumps(self.settings, sort_keys=True) != self._loaded_settings
+        if changed:
+            self.save_settings()
@@ -0,0 +1,162 @@
+"""
+Roblox log index
+Incrementally indexes the Roblox logs folder so clients can be matched to user IDs
+"""
+
+import os
+import re
+import time
+import bisect
+import calendar
+import threading
+
+
+LOG_TIMESTAMP_PATTERN = re.compile(r'(\d{8}T\d{6}Z)')
+JOIN_PATTERN = re.compile(r"Joining game '([0-9a-fA-F\-]+)' place (\d+)")
+USERID_PATTERN = re.compile(r'userid:\s*(\d+)')
+
+
+def default_logs_dir():
+    return os.path.join(os.getenv("LOCALAPPDATA") or "", "Roblox", "logs")
+
+
+class RobloxLogEntry:
+    """Header fields of one client log"""
+
+    def __init__(self, path, started_at):
+        self.path = path
+        self.started_at = started_at
+        self.user_id = None
+        self.place_id = None
+        self.job_id = None
+        self.parsed = False
+
+
+class RobloxLogIndex:
+    """
+    Keeps a start-time ordered index of *_last.log files
+    New files are picked up by an incremental directory scan, and each header is read once
+    """
+
+    HEADER_BYTES = 50000
+    SETTLE_SECONDS = 60
+
+    def __init__(self, logs_dir=None, min_refresh_interval=0.5):
+        self.logs_dir = logs_dir or default_logs_dir()
+        self.min_refresh_interval = min_refresh_interval
+        self._entries = {}
+        self._starts = []
+        self._lock = threading.RLock()
+        self._dir_mtime = None
+        self._last_refresh = 0.0
+
+    @staticmethod
+    def parse_timestamp(filename):
+        """UTC start time encoded in a log filename, as epoch seconds"""
+        match = LOG_TIMESTAMP_PATTERN.search(filename)
+        if not match:
+            return None
+        try:
+            return float(calendar.timegm(time.strptime(match.group(1), "%Y%m%dT%H%M%SZ")))
+        except ValueError:
+            return None
+
+    def refresh(self, force=False):
+        """Index files added since the last scan, skipping the scan when the folder is unchanged"""
+        with self._lock:
+            now = time.time()
+            if not force and now - self._last_refresh < self.min_refresh_interval:
+                return
+            self._last_refresh = now
+
+            try:
+                dir_mtime = os.stat(self.logs_dir).st_mtime_ns
+            except OSError:
+                return
+            if not force and dir_mtime == self._dir_mtime:
+                return
+            self._dir_mtime = dir_mtime
+
+            seen = set()
+            try:
+                with os.scandir(self.logs_dir) as it:
+                    for dir_entry in it:
+                        name = dir_entry.name
+                        if not name.endswith("_last.log"):
+                            continue
+                        seen.add(dir_entry.path)
+                        if dir_entry.path in self._entries:
+                            continue
+                        started_at = self.parse_timestamp(name)
+                        if started_at is None:
+                            continue
+                        self._entries[dir_entry.path] = RobloxLogEntry(dir_entry.path, started_at)
+                        bisect.insort(self._starts, (started_at, dir_entry.path))
+            except OSError as e:
+                print(f"[WARNING] Could not scan Roblox logs: {e}")
+                return
+
+            if len(seen) < len(self._entries):
+                for path in [p for p in self._entries if p not in seen]:
+                    entry = self._entries.pop(path)
+                    index = bisect.bisect_left(self._starts, (entry.started_at, path))
+                    if index < len(self._starts) and self._starts[index] == (entry.started_at, path):
+                        del self._starts[index]
+
+    def _parse_header(self, entry):
+        """Read user/place/job from the start of a log, once it has them"""
+        if entry.parsed:
+            return entry
+        try:
+            with open(entry.path, "r", encoding="utf-8", errors="ignore") as f:
+                content = f.read(self.HEADER_BYTES)
+        except OSError:
+            return entry
+
+        match = USERID_PATTERN.search(content)
+        if match:
+            entry.user_id = match.group(1)
+        match = JOIN_PATTERN.search(content)
+        if match:
+            entry.job_id = match.group(1)
+            entry.place_id = match.group(2)
+
+        if (entry.user_id and entry.place_id) or time.time() - entry.started_at > self.SETTLE_SECONDS:
+            entry.parsed = True
+        return entry
+
+    def entries_between(self, start, end):
+        """Log entries whose start time falls in [start, end]"""
+        with self._lock:
+            lo = bisect.bisect_left(self._starts, (start, ""))
+            hi = bisect.bisect_right(self._starts, (end, "￿"))
+            return [self._entries[path] for _, path in self._starts[lo:hi]]
+
+    def find_for_process(self, create_time, exclude=None, window=(-1.0, 10.0)):
+        """
+        Log opened by a client created at create_time (epoch seconds)
+        Returns the closest entry with a user ID, skipping paths in exclude
+        """
+        if not create_time:
+            return None
+        self.refresh()
+        candidates = self.entries_between(create_time + window[0], create_time + window[1])
+        candidates.sort(key=lambda e: abs(e.started_at - create_time))
+
+        for entry in candidates:
+            if exclude and entry.path in exclude:
+                continue
+            with self._lock:
+                self._parse_header(entry)
+            if entry.user_id:
+                if exclude is not None:
+                    exclude.add(entry.path)
+                return entry
+        return None
+
+    def user_id_for_process(self, create_time, exclude=None):
+        """(user_id, log_path) for a client, or (None, None)"""
+        entry = self.find_for_process(create_time, exclude)
+        if entry:
+            return entry.user_id, entry.path
+        return None, None
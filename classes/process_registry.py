@@ -0,0 +1,201 @@
+"""
+Roblox process registry
+One shared scan of RobloxPlayerBeta.exe processes for every monitor in the app
+"""
+
+import time
+import threading
+
+
+ROBLOX_PROCESS_NAME = "robloxplayerbeta.exe"
+
+
+class PsutilProcessSource:
+    """Lists running Roblox clients with psutil"""
+
+    def __init__(self, process_name=ROBLOX_PROCESS_NAME):
+        import psutil
+        self.psutil = psutil
+        self.process_name = process_name
+
+    def scan(self):
+        """Return {pid: create_time} for every running client"""
+        found = {}
+        for proc in self.psutil.process_iter(["pid", "name", "create_time"]):
+            try:
+                name = proc.info["name"]
+                if name and name.lower() == self.process_name:
+                    found[proc.info["pid"]] = proc.info["create_time"] or 0.0
+            except (self.psutil.NoSuchProcess, self.psutil.AccessDenied):
+                continue
+        return found
+
+
+class FakeProcessSource:
+    """Scripted process list for exercising the registry without Roblox"""
+
+    def __init__(self):
+        self.processes = {}
+
+    def spawn(self, pid, create_time=None):
+        self.processes[pid] = create_time if create_time is not None else time.time()
+
+    def kill(self, pid):
+        self.processes.pop(pid, None)
+
+    def scan(self):
+        return dict(self.processes)
+
+
+class RobloxProcessRecord:
+    """What the app knows about one running client"""
+
+    def __init__(self, pid, create_time):
+        self.pid = pid
+        self.create_time = create_time
+        self.account = None
+        self.user_id = None
+        self.hwnds = []
+        self.first_seen = time.time()
+
+
+class RobloxProcessRegistry:
+    """
+    Keeps the set of running Roblox clients up to date from a single scanning thread
+    Consumers acquire() the registry with the scan interval they need and subscribe()
+    to ('added', record) / ('removed', record) events instead of scanning themselves
+    """
+
+    def __init__(self, source=None):
+        self._source = source
+        self._records = {}
+        self._subscribers = []
+        self._holders = {}
+        self._lock = threading.RLock()
+        self._scan_lock = threading.Lock()
+        self._wake_event = threading.Event()
+        self._thread = None
+        self._last_scan = 0.0
+
+    @property
+    def source(self):
+        if self._source is None:
+            self._source = PsutilProcessSource()
+        return self._source
+
+    def subscribe(self, callback, replay=False):
+        """Receive callback(event, record); replay sends 'added' for clients already running"""
+        with self._lock:
+            self._subscribers.append(callback)
+            existing = list(self._records.values()) if replay else []
+        for record in existing:
+            self._notify(callback, 'added', record)
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def acquire(self, consumer, interval):
+        """Keep the scanner running at least every `interval` seconds for this consumer"""
+        with self._lock:
+            self._holders[consumer] = interval
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True, name="RobloxProcessRegistry")
+                self._thread.start()
+        self._wake_event.set()
+
+    def release(self, consumer):
+        with self._lock:
+            self._holders.pop(consumer, None)
+        self._wake_event.set()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._holders:
+                    self._thread = None
+                    return
+                interval = min(self._holders.values())
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"[WARNING] Process registry scan failed: {e}")
+                interval = max(interval, 1.0)
+            self._wake_event.wait(interval)
+            self._wake_event.clear()
+
+    def refresh(self):
+        """Scan once and publish added/removed events, returns the live pid set"""
+        with self._scan_lock:
+            current = self.source.scan()
+            added = []
+            removed = []
+            with self._lock:
+                for pid, record in list(self._records.items()):
+                    create_time = current.get(pid)
+                    if create_time is None or (record.create_time and create_time and abs(create_time - record.create_time) > 1.0):
+                        removed.append(self._records.pop(pid))
+                for pid, create_time in current.items():
+                    if pid not in self._records:
+                        record = RobloxProcessRecord(pid, create_time)
+                        self._records[pid] = record
+                        added.append(record)
+                self._last_scan = time.time()
+                subscribers = list(self._subscribers)
+                pids = set(self._records.keys())
+
+        for record in removed:
+            for callback in subscribers:
+                self._notify(callback, 'removed', record)
+        for record in added:
+            for callback in subscribers:
+                self._notify(callback, 'added', record)
+        return pids
+
+    def _notify(self, callback, event, record):
+        try:
+            callback(event, record)
+        except Exception as e:
+            print(f"[ERROR] Process registry subscriber failed on PID {record.pid}: {e}")
+
+    def get_pids(self, max_age=None):
+        """
+        Live Roblox PIDs
+        max_age: rescan first if the last scan is older than this many seconds
+        """
+        if max_age is not None and time.time() - self._last_scan > max_age:
+            return self.refresh()
+        with self._lock:
+            return set(self._records.keys())
+
+    def get(self, pid):
+        with self._lock:
+            return self._records.get(pid)
+
+    def records(self):
+        with self._lock:
+            return list(self._records.values())
+
+    def find_account(self, account):
+        with self._lock:
+            for record in self._records.values():
+                if record.account == account:
+                    return record
+        return None
+
+    def set_account(self, pid, account, user_id=None):
+        with self._lock:
+            record = self._records.get(pid)
+            if record is None:
+                return False
+            record.account = account
+            if user_id is not None:
+                record.user_id = str(user_id)
+            return True
+
+    def set_windows(self, pid, hwnds):
+        with self._lock:
+            record = self._records.get(pid)
+            if record is not None:
+                record.hwnds = list(hwnds)
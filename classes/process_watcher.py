@@ -0,0 +1,297 @@
+"""
+Process exit watcher
+Waits on tracked PIDs and reports exits as soon as they happen
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class FakeProcessBackend:
+    """In-memory processes for exercising the watcher without real clients"""
+
+    def __init__(self):
+        self._alive = set()
+        self._changed = threading.Condition()
+
+    def spawn(self, pid):
+        with self._changed:
+            self._alive.add(pid)
+
+    def kill(self, pid):
+        with self._changed:
+            self._alive.discard(pid)
+            self._changed.notify_all()
+
+    def add(self, pid):
+        return pid in self._alive
+
+    def remove(self, pid):
+        pass
+
+    def wake(self):
+        with self._changed:
+            self._changed.notify_all()
+
+    def wait(self, pids, timeout):
+        with self._changed:
+            exited = {pid for pid in pids if pid not in self._alive}
+            if not exited:
+                self._changed.wait(timeout)
+                exited = {pid for pid in pids if pid not in self._alive}
+            return exited
+
+
+class PsutilProcessBackend:
+    """Uses psutil.wait_procs, checking create_time so reused PIDs are not mistaken for the client"""
+
+    def __init__(self, poll_interval=0.25):
+        import psutil
+        self.psutil = psutil
+        self.poll_interval = poll_interval
+        self._processes = {}
+        self._lock = threading.Lock()
+        self._wake_event = threading.Event()
+
+    def add(self, pid):
+        try:
+            process = self.psutil.Process(pid)
+            process.create_time()
+        except (self.psutil.NoSuchProcess, self.psutil.AccessDenied):
+            return False
+        with self._lock:
+            self._processes[pid] = process
+        return True
+
+    def remove(self, pid):
+        with self._lock:
+            self._processes.pop(pid, None)
+
+    def wake(self):
+        self._wake_event.set()
+
+    def wait(self, pids, timeout):
+        with self._lock:
+            tracked = dict(self._processes)
+        processes = [tracked[pid] for pid in pids if pid in tracked]
+        exited = {pid for pid in pids if pid not in tracked}
+        remaining = timeout
+        while processes and not exited and remaining > 0 and not self._wake_event.is_set():
+            step = min(self.poll_interval, remaining)
+            gone, processes = self.psutil.wait_procs(processes, timeout=step)
+            exited.update(process.pid for process in gone)
+            for process in list(processes):
+                if not process.is_running():
+                    exited.add(process.pid)
+            remaining -= step
+        self._wake_event.clear()
+        return exited
+
+
+class Win32ProcessBackend:
+    """
+    Blocks in WaitForMultipleObjects on process handles, up to 63 per call plus a wake event
+    With more than 63 processes each chunk is waited on by its own thread, so every exit is
+    seen straight away; the first chunk to return releases the others
+    """
+
+    CHUNK_SIZE = 63
+    MAX_WAITERS = 32
+
+    def __init__(self):
+        import win32api
+        import win32con
+        import win32event
+        self.win32api = win32api
+        self.win32con = win32con
+        self.win32event = win32event
+        self._handles = {}
+        self._lock = threading.Lock()
+        self._waiting = False
+        self._closing = []
+        self._waiters = None
+        self._wake_event = win32event.CreateEvent(None, True, False, None)
+
+    def add(self, pid):
+        try:
+            handle = self.win32api.OpenProcess(self.win32con.SYNCHRONIZE, False, pid)
+        except Exception:
+            return False
+        with self._lock:
+            self._handles[pid] = handle
+        return True
+
+    def remove(self, pid):
+        with self._lock:
+            handle = self._handles.pop(pid, None)
+            if handle is not None and self._waiting:
+                # Closing a handle that is being waited on is undefined, close it after the wait
+                self._closing.append(handle)
+                handle = None
+        if handle is not None:
+            self._close(handle)
+
+    def _close(self, handle):
+        try:
+            self.win32api.CloseHandle(handle)
+        except Exception:
+            pass
+
+    def wake(self):
+        self.win32event.SetEvent(self._wake_event)
+
+    def _wait_chunk(self, chunk, events, milliseconds, done_event=None):
+        pids = [pid for pid, _ in chunk]
+        handles = [handle for _, handle in chunk]
+        try:
+            result = self.win32event.WaitForMultipleObjects(handles + events, False, milliseconds)
+            index = result - self.win32event.WAIT_OBJECT_0
+            exited = set()
+            if 0 <= index < len(chunk):
+                exited.add(pids[index])
+                for pid, handle in chunk:
+                    if self.win32event.WaitForSingleObject(handle, 0) == self.win32event.WAIT_OBJECT_0:
+                        exited.add(pid)
+            return exited
+        finally:
+            if done_event is not None:
+                self.win32event.SetEvent(done_event)
+
+    def wait(self, pids, timeout):
+        milliseconds = int(timeout * 1000)
+        with self._lock:
+            tracked = [(pid, self._handles[pid]) for pid in pids if pid in self._handles]
+            self._waiting = True
+
+        try:
+            if not tracked:
+                self.win32event.WaitForSingleObject(self._wake_event, milliseconds)
+                return set()
+
+            if len(tracked) <= self.CHUNK_SIZE:
+                return self._wait_chunk(tracked, [self._wake_event], milliseconds)
+
+            # One slot fewer per chunk, each waiter also holds the shared done event
+            size = self.CHUNK_SIZE - 1
+            chunks = [tracked[i:i + size] for i in range(0, len(tracked), size)]
+
+            if self._waiters is None:
+                self._waiters = ThreadPoolExecutor(max_workers=self.MAX_WAITERS, thread_name_prefix="ProcessWait")
+            done_event = self.win32event.CreateEvent(None, True, False, None)
+            try:
+                futures = [
+                    self._waiters.submit(self._wait_chunk, chunk, [self._wake_event, done_event], milliseconds, done_event)
+                    for chunk in chunks
+                ]
+                exited = set()
+                for future in futures:
+                    exited.update(future.result())
+                return exited
+            finally:
+                self._close(done_event)
+        finally:
+            # The wake event is manual-reset so every chunk waiter sees it; watched PIDs are
+            # re-read by the caller after this returns, so clearing it here loses nothing
+            self.win32event.ResetEvent(self._wake_event)
+            with self._lock:
+                self._waiting = False
+                closing = self._closing
+                self._closing = []
+            for handle in closing:
+                self._close(handle)
+
+
+def create_default_backend():
+    """Win32 wait handles on Windows, psutil elsewhere"""
+    if os.name == 'nt':
+        try:
+            return Win32ProcessBackend()
+        except ImportError:
+            pass
+    return PsutilProcessBackend()
+
+
+class ProcessWatcher:
+    """
+    Watches PIDs on one background thread and calls subscribers with (pid, tag) when a process exits
+    """
+
+    def __init__(self, backend=None, wait_timeout=1.0):
+        self.backend = backend or create_default_backend()
+        self.wait_timeout = wait_timeout
+        self._watched = {}
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def subscribe(self, callback):
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def watch(self, pid, tag=None):
+        """Start watching a PID, an already-dead PID is reported straight away"""
+        with self._lock:
+            self._watched[pid] = tag
+            added = self.backend.add(pid)
+        if not added:
+            self._emit({pid})
+            return False
+        self._ensure_thread()
+        self.backend.wake()
+        return True
+
+    def unwatch(self, pid):
+        with self._lock:
+            self._watched.pop(pid, None)
+            self.backend.remove(pid)
+        self.backend.wake()
+
+    def is_watched(self, pid):
+        return pid in self._watched
+
+    def _ensure_thread(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="ProcessWatcher")
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        self.backend.wake()
+
+    def _emit(self, pids):
+        events = []
+        with self._lock:
+            for pid in pids:
+                if pid in self._watched:
+                    events.append((pid, self._watched.pop(pid)))
+                    self.backend.remove(pid)
+            subscribers = list(self._subscribers)
+
+        for pid, tag in events:
+            for callback in subscribers:
+                try:
+                    callback(pid, tag)
+                except Exception as e:
+                    print(f"[ERROR] Process exit handler failed for PID {pid}: {e}")
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            with self._lock:
+                pids = list(self._watched.keys())
+            try:
+                exited = self.backend.wait(pids, self.wait_timeout)
+            except Exception as e:
+                print(f"[ERROR] Process watcher wait failed: {e}")
+                self._stop_event.wait(self.wait_timeout)
+                continue
+            if exited:
+                self._emit(exited)
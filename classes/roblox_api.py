@@ -5,13 +5,55 @@ Handles authentication, info, and game launching
 
 import os
 import time
+import hashlib
 import random
 import requests
 import subprocess
 import shutil
 import threading
 from pathlib import Path
-from tkinter import messagebox
+from requests.adapters import HTTPAdapter
+
+
+class RateLimiter:
+    """Token bucket shared by threads, acquire() blocks until a request may be sent"""
+    
+    def __init__(self, rate, burst=1):
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_time = (1 - self._tokens) / self.rate
+            time.sleep(wait_time)
+    
+    def try_acquire(self):
+        """Take a token without blocking, returns 0 on success or the seconds until one is available"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+    
+    def set_rate(self, rate, burst=None):
+        with self._lock:
+            self.rate = float(rate)
+            if burst is not None:
+                self.burst = max(1, int(burst))
+                self._tokens = min(self._tokens, self.burst)
 
 
 class RobloxAPI:
@@ -32,6 +74,107 @@ class RobloxAPI:
                     time.sleep(wait_time)
             cls._last_request_time = time.time()
     
+    _session = None
+    _session_lock = threading.Lock()
+    _identity_cache = {}
+    _identity_lock = threading.Lock()
+    _csrf_tokens = {}
+    _csrf_lock = threading.Lock()
+    
+    # Shared budget for background polling (auto-rejoin presence checks), in requests per second
+    request_budget = RateLimiter(rate=1.0, burst=5)
+    
+    # Headless entry points turn this off so errors are only printed
+    show_dialogs = True
+    
+    @classmethod
+    def _show_error(cls, title, message):
+        """Error dialog for the desktop app; tkinter is only imported when a dialog is shown"""
+        if not cls.show_dialogs:
+            print(f"[ERROR] {title}: {' '.join(message.split())}")
+            return
+        try:
+            from tkinter import messagebox
+            messagebox.showerror(title, message)
+        except Exception:
+            print(f"[ERROR] {title}: {' '.join(message.split())}")
+    
+    @classmethod
+    def get_session(cls):
+        """Shared HTTP session so repeated calls reuse pooled connections"""
+        with cls._session_lock:
+            if cls._session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+                session.mount('https://', adapter)
+                cls._session = session
+            return cls._session
+    
+    @staticmethod
+    def _cookie_key(cookie):
+        return hashlib.sha256(cookie.encode('utf-8')).hexdigest()
+    
+    @classmethod
+    def fetch_cookie_identity(cls, cookie):
+        """Request the authenticated user for a cookie, returns (identity, status_code)"""
+        response = cls.get_session().get(
+            'https://users.roblox.com/v1/users/authenticated',
+            headers={'Cookie': f'.ROBLOSECURITY={cookie}'},
+            timeout=5
+        )
+        
+        key = cls._cookie_key(cookie)
+        if response.status_code == 200:
+            user_data = response.json()
+            identity = {
+                'user_id': user_data.get('id', 0),
+                'username': user_data.get('name', 'Unknown'),
+                'display_name': user_data.get('displayName', '')
+            }
+            with cls._identity_lock:
+                cls._identity_cache[key] = identity
+            return identity, response.status_code
+        
+        if response.status_code == 401:
+            cls.forget_cookie(cookie)
+        
+        return None, response.status_code
+    
+    @classmethod
+    def identify_cookie(cls, cookie, use_cache=True):
+        """
+        Resolve a .ROBLOSECURITY cookie to its user_id, username and display_name
+        Results are cached per cookie until Roblox rejects it
+        """
+        if not cookie:
+            return None
+        
+        if use_cache:
+            with cls._identity_lock:
+                cached = cls._identity_cache.get(cls._cookie_key(cookie))
+            if cached:
+                return dict(cached)
+        
+        try:
+            identity, status_code = cls.fetch_cookie_identity(cookie)
+            if identity:
+                return dict(identity)
+            print(f"[ERROR] Cookie lookup failed: HTTP {status_code}")
+        except Exception as e:
+            print(f"[ERROR] Error identifying cookie: {e}")
+        
+        return None
+    
+    @classmethod
+    def forget_cookie(cls, cookie):
+        """Drop a cookie from the identity and CSRF caches"""
+        if cookie:
+            key = cls._cookie_key(cookie)
+            with cls._identity_lock:
+                cls._identity_cache.pop(key, None)
+            with cls._csrf_lock:
+                cls._csrf_tokens.pop(key, None)
+    
     @staticmethod
     def detect_custom_launcher():
         """Detect if Bloxstrap or Fishstrap is installed and return launcher path"""
@@ -134,7 +277,7 @@ class RobloxAPI:
             return private_server_input
         else:
             print("[ERROR] Wrong Format, Private Server ID must contain only numbers")
-            messagebox.showerror(
+            RobloxAPI._show_error(
                 "Wrong Format",
                 "Private Server ID must contain only numbers.\n\n"
                 f"Invalid input: {private_server_input}\n\n"
@@ -145,23 +288,9 @@ class RobloxAPI:
     @staticmethod
     def get_username_from_api(roblosecurity_cookie):
         """Get username using Roblox API"""
-        try:
-            headers = {
-                'Cookie': f'.ROBLOSECURITY={roblosecurity_cookie}'
-            }
-            
-            response = requests.get(
-                'https://users.roblox.com/v1/users/authenticated',
-                headers=headers,
-                timeout=3
-            )
-            
-            if response.status_code == 200:
-                user_data = response.json()
-                return user_data.get('name', 'Unknown')
-            
-        except Exception as e:
-            print(f"[ERROR] Error getting username from API: {e}")
+        identity = RobloxAPI.identify_cookie(roblosecurity_cookie)
+        if identity:
+            return identity.get('username', 'Unknown')
         
         return "Unknown"
     
@@ -282,54 +411,102 @@ class RobloxAPI:
         
         return None
     
+    @classmethod
+    def _get_cached_csrf(cls, cookie):
+        key = cls._cookie_key(cookie)
+        with cls._csrf_lock:
+            token = cls._csrf_tokens.get(key)
+        if token:
+            return token
+        token = cls.get_csrf_token(cookie)
+        if token:
+            with cls._csrf_lock:
+                cls._csrf_tokens[key] = token
+        return token
+    
     @staticmethod
-    def get_player_presence(user_id, cookie):
-        """Get player's current presence (online status and game info)"""
-        url = "https://presence.roblox.com/v1/presence/users"
-        
-        csrf_token = RobloxAPI.get_csrf_token(cookie)
-        if not csrf_token:
-            print("[ERROR] Failed to get CSRF token")
-            return None
-        
-        headers = {
-            'Cookie': f'.ROBLOSECURITY={cookie}',
-            'Content-Type': 'application/json',
-            'X-CSRF-TOKEN': csrf_token
+    def _parse_presence_entry(presence):
+        result = {
+            'user_id': presence.get('userId'),
+            'in_game': presence.get('userPresenceType') == 2,
+            'status': presence.get('userPresenceType', 0),
+            'last_location': presence.get('lastLocation', 'Unknown')
         }
         
-        payload = {
-            "userIds": [user_id]
-        }
+        if presence.get('userPresenceType') == 2:
+            result['place_id'] = presence.get('placeId')
+            result['root_place_id'] = presence.get('rootPlaceId')
+            result['universe_id'] = presence.get('universeId')
+            result['game_id'] = presence.get('gameId')
+        
+        return result
+    
+    @classmethod
+    def get_presences_with_status(cls, user_ids, cookie):
+        """
+        Batched presence lookup, returns ({user_id: presence}, status_code, retry_after)
+        The CSRF token is cached per cookie and only refreshed when the API rejects it
+        status_code is None when the request itself failed
+        """
+        url = "https://presence.roblox.com/v1/presence/users"
+        payload = {"userIds": [int(user_id) for user_id in user_ids]}
         
         try:
-            response = requests.post(url, headers=headers, json=payload, timeout=5)
+            csrf_token = cls._get_cached_csrf(cookie)
+            if not csrf_token:
+                return {}, None, None
+            
+            for _ in range(2):
+                headers = {
+                    'Cookie': f'.ROBLOSECURITY={cookie}',
+                    'Content-Type': 'application/json',
+                    'X-CSRF-TOKEN': csrf_token
+                }
+                response = cls.get_session().post(url, headers=headers, json=payload, timeout=5)
+                
+                new_token = response.headers.get('x-csrf-token')
+                if response.status_code == 403 and new_token and new_token != csrf_token:
+                    with cls._csrf_lock:
+                        cls._csrf_tokens[cls._cookie_key(cookie)] = new_token
+                    csrf_token = new_token
+                    continue
+                break
             
             if response.status_code == 200:
-                data = response.json()
-                if data.get('userPresences') and len(data['userPresences']) > 0:
-                    presence = data['userPresences'][0]
-                    
-                    result = {
-                        'user_id': presence.get('userId'),
-                        'in_game': presence.get('userPresenceType') == 2,
-                        'status': presence.get('userPresenceType', 0),
-                        'last_location': presence.get('lastLocation', 'Unknown')
-                    }
-                    
-                    if presence.get('userPresenceType') == 2:
-                        result['place_id'] = presence.get('placeId')
-                        result['root_place_id'] = presence.get('rootPlaceId')
-                        result['universe_id'] = presence.get('universeId')
-                        result['game_id'] = presence.get('gameId')
-                    
-                    return result
-            else:
-                print(f"[ERROR] Presence API returned status {response.status_code}")
+                presences = {}
+                for entry in response.json().get('userPresences', []):
+                    presence = cls._parse_presence_entry(entry)
+                    presences[str(presence['user_id'])] = presence
+                return presences, 200, None
+            
+            if response.status_code == 401:
+                with cls._csrf_lock:
+                    cls._csrf_tokens.pop(cls._cookie_key(cookie), None)
+            
+            retry_after = None
+            if response.status_code == 429:
+                try:
+                    retry_after = float(response.headers.get('retry-after'))
+                except (TypeError, ValueError):
+                    retry_after = None
+            return {}, response.status_code, retry_after
         except Exception as e:
             print(f"[ERROR] Failed to get player presence: {e}")
-        
-        return None
+            return {}, None, None
+    
+    @classmethod
+    def get_presence_with_status(cls, user_id, cookie):
+        """Presence lookup for polling loops, returns (presence, status_code, retry_after)"""
+        presences, status_code, retry_after = cls.get_presences_with_status([user_id], cookie)
+        return presences.get(str(user_id)), status_code, retry_after
+    
+    @staticmethod
+    def get_player_presence(user_id, cookie):
+        """Get player's current presence (online status and game info)"""
+        presence, status_code, _ = RobloxAPI.get_presence_with_status(user_id, cookie)
+        if status_code is not None and status_code != 200:
+            print(f"[ERROR] Presence API returned status {status_code}")
+        return presence
     
     @staticmethod
     def get_auth_ticket(roblosecurity_cookie):
@@ -369,39 +546,44 @@ class RobloxAPI:
             return None
     
     @staticmethod
-    def get_smallest_server(place_id):
-        """Get the game server with the smallest player count for a given place ID"""
+    def get_public_servers(place_id):
+        """Public servers for a place sorted by player count, as a list of {id, playing, max_players}, or None on failure"""
         try:
             url = f"https://games.roblox.com/v1/games/{place_id}/servers/Public?sortOrder=Asc&limit=100"
             headers = {
                 "User-Agent": "Roblox/WinInet"
             }
             
-            response = requests.get(url, headers=headers, timeout=5)
+            response = RobloxAPI.get_session().get(url, headers=headers, timeout=5)
             
             if response.status_code == 200:
-                data = response.json()
-                servers = data.get('data', [])
-                
-                if servers:
-                    available_servers = [s for s in servers if s.get('playing', 0) < s.get('maxPlayers', 100)]
-                    
-                    if available_servers:
-                        smallest = min(available_servers, key=lambda x: x.get('playing', 0))
-                        return smallest.get('id')
-                    else:
-                        smallest = min(servers, key=lambda x: x.get('playing', 0))
-                        return smallest.get('id')
-                else:
-                    print("[WARNING] No servers found for place")
-                    return None
-            else:
-                print(f"[ERROR] Failed to get servers: HTTP {response.status_code}")
-                return None
-                
+                servers = response.json().get('data', [])
+                return [
+                    {
+                        'id': server.get('id'),
+                        'playing': server.get('playing', 0),
+                        'max_players': server.get('maxPlayers', 100)
+                    }
+                    for server in servers if server.get('id')
+                ]
+            print(f"[ERROR] Failed to get servers: HTTP {response.status_code}")
         except Exception as e:
-            print(f"[ERROR] Failed to get smallest server: {e}")
+            print(f"[ERROR] Failed to get servers: {e}")
+        return None
+    
+    @staticmethod
+    def get_smallest_server(place_id):
+        """Get the game server with the smallest player count for a given place ID"""
+        servers = RobloxAPI.get_public_servers(place_id)
+        if servers is None:
+            return None
+        if not servers:
+            print("[WARNING] No servers found for place")
             return None
+        
+        available_servers = [s for s in servers if s['playing'] < s['max_players']]
+        smallest = min(available_servers or servers, key=lambda x: x['playing'])
+        return smallest['id']
     
     
     @staticmethod
@@ -475,12 +657,12 @@ class RobloxAPI:
             if launcher_preference == "bloxstrap":
                 local_appdata = os.getenv('LOCALAPPDATA')
                 if not local_appdata:
-                    messagebox.showerror("Error", "Could not find LOCALAPPDATA directory.")
+                    RobloxAPI._show_error("Error", "Could not find LOCALAPPDATA directory.")
                     return False
                 
                 bloxstrap_path = Path(local_appdata) / 'Bloxstrap' / 'Bloxstrap.exe'
                 if not bloxstrap_path.exists():
-                    messagebox.showerror(
+                    RobloxAPI._show_error(
                         "Bloxstrap Not Found",
                         f"Bloxstrap is not installed.\n\nExpected location:\n{bloxstrap_path}\n\nPlease install Bloxstrap or select a different launcher."
                     )
@@ -493,12 +675,12 @@ class RobloxAPI:
             elif launcher_preference == "fishstrap":
                 local_appdata = os.getenv('LOCALAPPDATA')
                 if not local_appdata:
-                    messagebox.showerror("Error", "Could not find LOCALAPPDATA directory.")
+                    RobloxAPI._show_error("Error", "Could not find LOCALAPPDATA directory.")
                     return False
                 
                 fishstrap_path = Path(local_appdata) / 'Fishstrap' / 'Fishstrap.exe'
                 if not fishstrap_path.exists():
-                    messagebox.showerror(
+                    RobloxAPI._show_error(
                         "Fishstrap Not Found",
                         f"Fishstrap is not installed.\n\nExpected location:\n{fishstrap_path}\n\nPlease install Fishstrap or select a different launcher."
                     )
@@ -511,12 +693,12 @@ class RobloxAPI:
             elif launcher_preference == "froststrap":
                 local_appdata = os.getenv('LOCALAPPDATA')
                 if not local_appdata:
-                    messagebox.showerror("Error", "Could not find LOCALAPPDATA directory.")
+                    RobloxAPI._show_error("Error", "Could not find LOCALAPPDATA directory.")
                     return False
                 
                 froststrap_path = Path(local_appdata) / 'Froststrap' / 'Froststrap.exe'
                 if not froststrap_path.exists():
-                    messagebox.showerror(
+                    RobloxAPI._show_error(
                         "Froststrap Not Found",
                         f"Froststrap is not installed.\n\nExpected location:\n{froststrap_path}\n\nPlease install Froststrap or select a different launcher."
                     )
@@ -531,12 +713,12 @@ class RobloxAPI:
                 
                 local_appdata = os.getenv('LOCALAPPDATA')
                 if not local_appdata:
-                    messagebox.showerror("Error", "Could not find LOCALAPPDATA directory.")
+                    RobloxAPI._show_error("Error", "Could not find LOCALAPPDATA directory.")
                     return False
                 
                 versions_dir = Path(local_appdata) / 'Roblox' / 'Versions'
                 if not versions_dir.exists():
-                    messagebox.showerror(
+                    RobloxAPI._show_error(
                         "Roblox Client Not Found",
                         f"Roblox client directory not found.\n\nExpected location:\n{versions_dir}\n\nPlease install Roblox or select a different launcher."
                     )
@@ -544,7 +726,7 @@ class RobloxAPI:
                 
                 version_folders = [d for d in versions_dir.iterdir() if d.is_dir() and d.name.startswith('version-')]
                 if not version_folders:
-                    messagebox.showerror(
+                    RobloxAPI._show_error(
                         "Roblox Client Not Found",
                         f"No Roblox version found in:\n{versions_dir}\n\nPlease reinstall Roblox or select a different launcher."
                     )
@@ -554,7 +736,7 @@ class RobloxAPI:
                 client_path = latest_version / 'RobloxPlayerBeta.exe'
                 
                 if not client_path.exists():
-                    messagebox.showerror(
+                    RobloxAPI._show_error(
                         "Roblox Client Not Found",
                         f"RobloxPlayerBeta.exe not found in:\n{latest_version}\n\nPlease reinstall Roblox or select a different launcher."
                     )
@@ -571,24 +753,16 @@ class RobloxAPI:
                 
         except Exception as e:
             print(f"[ERROR] Failed to launch Roblox: {e}")
-            messagebox.showerror("Launch Error", f"Failed to launch Roblox:\n\n{str(e)}")
+            RobloxAPI._show_error("Launch Error", f"Failed to launch Roblox:\n\n{str(e)}")
             return False
     
     @staticmethod
     def validate_account(username, cookie):
         """Validate if an account's cookie is still valid and show detailed token info"""
         try:
-            headers = {
-                'Cookie': f'.ROBLOSECURITY={cookie}'
-            }
+            identity, status_code = RobloxAPI.fetch_cookie_identity(cookie)
             
-            response = requests.get(
-                'https://users.roblox.com/v1/users/authenticated',
-                headers=headers,
-                timeout=3
-            )
-            
-            is_valid = response.status_code == 200
+            is_valid = identity is not None
             
             print(f"[INFO] Valid: {'Yes' if is_valid else 'No'}")
             
@@ -602,19 +776,15 @@ class RobloxAPI:
             else:
                 print("[INFO] Token: (No token found)")
             
-            if is_valid and response.status_code == 200:
-                try:
-                    user_data = response.json()
-                    print(f"[INFO] User ID: {user_data.get('id', 'Unknown')}")
-                    print(f"[INFO] Display Name: {user_data.get('displayName', 'Unknown')}")
-                    print(f"[INFO] Username: {user_data.get('name', 'Unknown')}")
-                except:
-                    print("[ERROR] Additional info: Could not retrieve user details")
+            if is_valid:
+                print(f"[INFO] User ID: {identity.get('user_id', 'Unknown')}")
+                print(f"[INFO] Display Name: {identity.get('display_name', 'Unknown')}")
+                print(f"[INFO] Username: {identity.get('username', 'Unknown')}")
             else:
-                print(f"[INFO] Status Code: {response.status_code}")
-                if response.status_code == 401:
+                print(f"[INFO] Status Code: {status_code}")
+                if status_code == 401:
                     print("[ERROR] Reason: Token expired or invalid")
-                elif response.status_code == 403:
+                elif status_code == 403:
                     print("[ERROR] Reason: Access forbidden")
                 else:
                     print("[ERROR] Reason: Unknown error")
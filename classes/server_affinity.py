@@ -0,0 +1,198 @@
+"""
+Server affinity cache
+Remembers which servers each account recently joined or failed to join, per place
+"""
+
+import os
+import json
+import time
+import threading
+
+
+class ServerAffinityCache:
+    """
+    Per-place record of recent job IDs with join outcomes, plus a cached public server list
+    Picking a rejoin target only reads this cache, it never calls the API
+    """
+
+    def __init__(self, path, max_age=1800, failure_cooldown=300, server_list_ttl=180, max_servers_per_place=25):
+        self.path = path
+        self.max_age = max_age
+        self.failure_cooldown = failure_cooldown
+        self.server_list_ttl = server_list_ttl
+        self.max_servers_per_place = max_servers_per_place
+        self._places = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self._places = data.get('places', {}) or {}
+        except Exception as e:
+            print(f"[WARNING] Could not load server affinity cache: {e}")
+            self._places = {}
+
+    def save(self):
+        """Write the cache if anything changed, dropping stale servers first"""
+        with self._lock:
+            if not self._dirty:
+                return
+            self._prune()
+            data = {'version': 1, 'places': self._places}
+            payload = json.dumps(data, indent=2)
+            self._dirty = False
+
+        temp_file = self.path + ".tmp"
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            f.write(payload)
+        os.replace(temp_file, self.path)
+
+    def _place(self, place_id):
+        return self._places.setdefault(str(place_id), {'servers': {}, 'server_list': None})
+
+    def _server(self, place_id, job_id):
+        servers = self._place(place_id)['servers']
+        server = servers.get(job_id)
+        if server is None:
+            server = servers[job_id] = {
+                'last_seen': 0.0,
+                'last_success': 0.0,
+                'last_failure': 0.0,
+                'successes': 0,
+                'failures': 0,
+                'accounts': {}
+            }
+        return server
+
+    def _prune(self):
+        now = time.time()
+        for place_id in list(self._places.keys()):
+            place = self._places[place_id]
+            servers = place.get('servers', {})
+            for job_id in list(servers.keys()):
+                server = servers[job_id]
+                if now - max(server['last_seen'], server['last_success'], server['last_failure']) > self.max_age:
+                    del servers[job_id]
+            if len(servers) > self.max_servers_per_place:
+                newest = sorted(servers, key=lambda j: servers[j]['last_seen'], reverse=True)
+                for job_id in newest[self.max_servers_per_place:]:
+                    del servers[job_id]
+            server_list = place.get('server_list')
+            if server_list and now - server_list.get('fetched_at', 0) > self.max_age:
+                place['server_list'] = None
+            if not servers and not place.get('server_list'):
+                del self._places[place_id]
+
+    def record_seen(self, place_id, job_id, account):
+        """Account's presence showed it in this server"""
+        if not place_id or not job_id:
+            return
+        now = time.time()
+        with self._lock:
+            server = self._server(place_id, job_id)
+            server['last_seen'] = now
+            server['accounts'][account] = now
+            self._dirty = True
+
+    def record_outcome(self, place_id, job_id, account, success):
+        """Result of a launch that targeted job_id"""
+        if not place_id or not job_id:
+            return
+        now = time.time()
+        with self._lock:
+            server = self._server(place_id, job_id)
+            if success:
+                server['successes'] += 1
+                server['last_success'] = now
+                server['last_seen'] = now
+                server['accounts'][account] = now
+            else:
+                server['failures'] += 1
+                server['last_failure'] = now
+            self._dirty = True
+
+    def best_job(self, place_id, account, exclude=()):
+        """
+        Best remembered server for a rejoin, or None
+        Prefers the server this account was last in, then servers with the best
+        recent join record; servers that just failed are skipped for a cooldown
+        """
+        now = time.time()
+        with self._lock:
+            place = self._places.get(str(place_id))
+            if not place:
+                return None
+
+            best_job_id = None
+            best_score = None
+            for job_id, server in place['servers'].items():
+                if job_id in exclude:
+                    continue
+                last_good = max(server['last_seen'], server['last_success'])
+                if now - last_good > self.max_age:
+                    continue
+                if server['last_failure'] > last_good and now - server['last_failure'] < self.failure_cooldown:
+                    continue
+
+                account_seen = server['accounts'].get(account, 0)
+                score = (
+                    1 if account_seen and now - account_seen < self.max_age else 0,
+                    server['successes'] - 2 * server['failures'],
+                    last_good
+                )
+                if best_score is None or score > best_score:
+                    best_job_id = job_id
+                    best_score = score
+            return best_job_id
+
+    def set_server_list(self, place_id, servers):
+        """Cache a public server list from RobloxAPI.get_public_servers"""
+        with self._lock:
+            self._place(place_id)['server_list'] = {
+                'fetched_at': time.time(),
+                'servers': [
+                    [server['id'], server.get('playing', 0), server.get('max_players', 100)]
+                    for server in servers
+                ]
+            }
+            self._dirty = True
+
+    def server_list_age(self, place_id):
+        with self._lock:
+            place = self._places.get(str(place_id))
+            server_list = place.get('server_list') if place else None
+            if not server_list:
+                return None
+            return time.time() - server_list.get('fetched_at', 0)
+
+    def smallest_cached(self, place_id, exclude=()):
+        """Smallest non-full server from a fresh cached list, skipping recently failed ones"""
+        age = self.server_list_age(place_id)
+        if age is None or age > self.server_list_ttl:
+            return None
+
+        now = time.time()
+        with self._lock:
+            place = self._places[str(place_id)]
+            failed = {
+                job_id for job_id, server in place['servers'].items()
+                if now - server['last_failure'] < self.failure_cooldown
+            }
+            candidates = [
+                entry for entry in place['server_list']['servers']
+                if entry[0] not in exclude and entry[0] not in failed and entry[1] < entry[2]
+            ]
+            if not candidates:
+                return None
+            return min(candidates, key=lambda entry: entry[1])[0]
+
+    def snapshot(self, place_id):
+        with self._lock:
+            place = self._places.get(str(place_id))
+            return json.loads(json.dumps(place)) if place else None
@@ -0,0 +1,185 @@
+"""
+Task executor
+Bounded worker pools for background work, with results handed back to the Tk thread
+"""
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, CancelledError
+
+
+class TaskHandle:
+    """
+    A submitted task
+    cancel() drops it if it has not started; a running task can poll `cancelled`
+    and its result callback is never delivered once it has been cancelled or superseded
+    """
+
+    def __init__(self, key=None):
+        self.key = key
+        self.future = None
+        self._cancelled = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        self._cancelled.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    def done(self):
+        return self.future is not None and self.future.done()
+
+    def result(self, timeout=None):
+        return self.future.result(timeout)
+
+
+class TaskExecutor:
+    """
+    One place for UI background work
+    - pools: network (API calls, downloads), disk (settings writes, one at a time so they
+      land in order), process (launching Roblox), browser (login/browser sessions, which can
+      stay open for minutes), handles (singleton handle closing, kept apart so it is never
+      queued behind slow work); each is bounded so bursts queue instead of spawning threads
+    - key: a keyed submit cancels the previous task with the same key ("latest wins")
+    - call_ui: run a callable on the Tk thread; all callbacks go through one queue drained
+      by a single Tk timer. A keyed call_ui replaces a still-pending call with the same key
+    """
+
+    DEFAULT_POOLS = {'network': 6, 'disk': 1, 'process': 4, 'browser': 4, 'handles': 4}
+
+    def __init__(self, pool_sizes=None, drain_interval_ms=30):
+        sizes = dict(self.DEFAULT_POOLS)
+        sizes.update(pool_sizes or {})
+        self.pools = {
+            name: ThreadPoolExecutor(max_workers=size, thread_name_prefix=f"{name}-task")
+            for name, size in sizes.items()
+        }
+        self.drain_interval_ms = drain_interval_ms
+        self._keyed = {}
+        self._keyed_lock = threading.Lock()
+        self._ui_queue = queue.Queue()
+        self._ui_pending = {}
+        self._ui_lock = threading.Lock()
+        self._root = None
+        self._shutdown = False
+
+    def attach(self, root):
+        """Start draining UI callbacks on root's event loop"""
+        self._root = root
+        self._schedule_drain()
+
+    def _schedule_drain(self):
+        if self._root is None or self._shutdown:
+            return
+        try:
+            self._root.after(self.drain_interval_ms, self._drain_loop)
+        except Exception:
+            self._root = None
+
+    def _drain_loop(self):
+        self.drain_ui()
+        self._schedule_drain()
+
+    def submit(self, pool, fn, *args, key=None, on_result=None, on_error=None, **kwargs):
+        """
+        Run fn(*args, **kwargs) on a pool, returns a TaskHandle
+        on_result(value) / on_error(exception) are called on the Tk thread, and only if the
+        task was not cancelled or superseded by a newer task with the same key
+        """
+        handle = TaskHandle(key)
+        if self._shutdown:
+            handle.cancel()
+            return handle
+
+        if key is not None:
+            with self._keyed_lock:
+                previous = self._keyed.get(key)
+                self._keyed[key] = handle
+            if previous is not None:
+                previous.cancel()
+
+        def run():
+            if handle.cancelled:
+                raise CancelledError()
+            return fn(*args, **kwargs)
+
+        handle.future = self.pools[pool].submit(run)
+        if handle.cancelled:
+            handle.future.cancel()
+        handle.future.add_done_callback(lambda future: self._finished(handle, on_result, on_error))
+        return handle
+
+    def _finished(self, handle, on_result, on_error):
+        if handle.key is not None:
+            with self._keyed_lock:
+                if self._keyed.get(handle.key) is handle:
+                    del self._keyed[handle.key]
+        if handle.cancelled or handle.future.cancelled():
+            return
+
+        error = handle.future.exception()
+        if error is not None:
+            if isinstance(error, CancelledError):
+                return
+            if on_error is not None:
+                self.call_ui(self._deliver, handle, on_error, error)
+            else:
+                print(f"[ERROR] Background task failed: {error}")
+        elif on_result is not None:
+            self.call_ui(self._deliver, handle, on_result, handle.future.result())
+
+    @staticmethod
+    def _deliver(handle, callback, value):
+        if not handle.cancelled:
+            callback(value)
+
+    def cancel(self, key):
+        with self._keyed_lock:
+            handle = self._keyed.pop(key, None)
+        if handle is not None:
+            handle.cancel()
+
+    def call_ui(self, fn, *args, key=None):
+        """Queue fn(*args) for the Tk thread, safe from any thread"""
+        if key is None:
+            self._ui_queue.put((fn, args))
+            return
+        with self._ui_lock:
+            queued = key in self._ui_pending
+            self._ui_pending[key] = (fn, args)
+        if not queued:
+            self._ui_queue.put((None, key))
+
+    def drain_ui(self, max_items=500):
+        """Run queued UI callbacks, call on the Tk thread"""
+        for _ in range(max_items):
+            try:
+                fn, args = self._ui_queue.get_nowait()
+            except queue.Empty:
+                return
+            if fn is None:
+                with self._ui_lock:
+                    fn, args = self._ui_pending.pop(args, (None, None))
+                if fn is None:
+                    continue
+            try:
+                fn(*args)
+            except Exception as e:
+                print(f"[ERROR] UI callback failed: {e}")
+
+    def shutdown(self, wait=False):
+        """Stop accepting work and drop tasks that have not started"""
+        self._shutdown = True
+        with self._keyed_lock:
+            handles = list(self._keyed.values())
+            self._keyed.clear()
+        for handle in handles:
+            handle.cancel()
+        for pool in self.pools.values():
+            try:
+                pool.shutdown(wait=wait, cancel_futures=True)
+            except TypeError:
+                pool.shutdown(wait=wait)
@@ -0,0 +1,221 @@
+"""
+Vault export and backup
+Streams accounts into a gzip archive of individually encrypted JSON lines
+"""
+
+import os
+import json
+import gzip
+import time
+import uuid
+import hashlib
+
+from .encryption import PasswordEncryption
+
+
+ARCHIVE_FORMAT = "ram-vault-archive"
+ARCHIVE_VERSION = 1
+
+
+def _record_id(username):
+    return hashlib.sha256(username.encode('utf-8')).hexdigest()[:32]
+
+
+def _fingerprint(username, account_data):
+    payload = json.dumps([username, account_data], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class VaultExporter:
+    """Write selected accounts to a portable password-encrypted archive"""
+
+    def __init__(self, manager, state_file=None):
+        self.manager = manager
+        self.state_file = state_file or os.path.join(manager.data_folder, "backup_state.json")
+
+    def load_state(self):
+        """Load fingerprints recorded by the last backup"""
+        if os.path.exists(self.state_file):
+            try:
+                with open(self.state_file, 'r', encoding='utf-8') as f:
+                    state = json.load(f)
+                if isinstance(state, dict):
+                    state.setdefault('fingerprints', {})
+                    return state
+            except:
+                pass
+        return {'fingerprints': {}}
+
+    @staticmethod
+    def baseline_key(usernames=None, note_filter=None):
+        """Filtered exports keep their own incremental baseline, "" is the unfiltered one"""
+        if not usernames and not note_filter:
+            return ""
+        return json.dumps([sorted(usernames or []), note_filter or ""], ensure_ascii=False)
+
+    @staticmethod
+    def get_baseline(state, key=""):
+        """Fingerprints and last backup of one baseline, the unfiltered one lives at the top level"""
+        if key == "":
+            return state
+        return state.setdefault('baselines', {}).setdefault(key, {'fingerprints': {}})
+
+    def save_state(self, state):
+        temp_file = self.state_file + ".tmp"
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2)
+        os.replace(temp_file, self.state_file)
+
+    def select_usernames(self, usernames=None, note_filter=None):
+        """Accounts matching an explicit username list and/or a note substring"""
+        names = list(self.manager.accounts.keys())
+        if usernames:
+            wanted = set(usernames)
+            names = [name for name in names if name in wanted]
+        if note_filter:
+            needle = note_filter.lower()
+            names = [
+                name for name in names
+                if needle in str(self.manager.accounts[name].get('note', '')).lower()
+            ]
+        return sorted(names)
+
+    def export(self, path, password, usernames=None, note_filter=None, incremental=False):
+        """
+        Export accounts to path, encrypting every record separately
+        incremental: only write records changed since the last backup with the same filter, plus
+        tombstones for accounts that were deleted or no longer match
+        Returns a summary dict
+        """
+        if not password:
+            raise ValueError("An archive password is required")
+
+        state = self.load_state()
+        baseline = self.get_baseline(state, self.baseline_key(usernames, note_filter))
+        previous = baseline.get('fingerprints', {}) if incremental else {}
+        encryptor = PasswordEncryption(password)
+        backup_id = uuid.uuid4().hex
+
+        header = {
+            'type': 'header',
+            'format': ARCHIVE_FORMAT,
+            'version': ARCHIVE_VERSION,
+            'backup_id': backup_id,
+            'base_backup_id': baseline.get('last_backup_id') if incremental else None,
+            'incremental': bool(incremental),
+            'created': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'salt': encryptor.get_salt_b64()
+        }
+
+        fingerprints = dict(previous)
+        written = 0
+        unchanged = 0
+        deleted = 0
+        temp_path = path + ".part"
+
+        try:
+            with gzip.open(temp_path, 'wt', encoding='utf-8') as archive:
+                archive.write(json.dumps(header) + "\n")
+
+                selected = self.select_usernames(usernames, note_filter)
+                for username in selected:
+                    account_data = self.manager.accounts.get(username)
+                    if not isinstance(account_data, dict):
+                        continue
+
+                    record_id = _record_id(username)
+                    fingerprint = _fingerprint(username, account_data)
+                    fingerprints[record_id] = fingerprint
+
+                    if previous.get(record_id) == fingerprint:
+                        unchanged += 1
+                        continue
+
+                    payload = json.dumps({'username': username, 'data': account_data}, ensure_ascii=False)
+                    record = {'type': 'account', 'id': record_id}
+                    record.update(encryptor.encrypt_data(payload))
+                    archive.write(json.dumps(record) + "\n")
+                    written += 1
+
+                if incremental:
+                    live_ids = {_record_id(name) for name in selected}
+                    for record_id in sorted(previous):
+                        if record_id not in live_ids:
+                            archive.write(json.dumps({'type': 'deleted', 'id': record_id}) + "\n")
+                            fingerprints.pop(record_id, None)
+                            deleted += 1
+
+                archive.write(json.dumps({'type': 'end', 'records': written, 'deleted': deleted}) + "\n")
+
+            os.replace(temp_path, path)
+        except:
+            if os.path.exists(temp_path):
+                try:
+                    os.remove(temp_path)
+                except:
+                    pass
+            raise
+
+        baseline['fingerprints'] = fingerprints
+        baseline['last_backup_id'] = backup_id
+        baseline['last_backup_time'] = header['created']
+        self.save_state(state)
+
+        return {
+            'path': path,
+            'backup_id': backup_id,
+            'incremental': bool(incremental),
+            'written': written,
+            'unchanged': unchanged,
+            'deleted': deleted
+        }
+
+    @staticmethod
+    def read_archive(path, password):
+        """
+        Yield ('header', header), ('account', username, data) and ('deleted', record_id) entries
+        Records are decrypted one at a time as the archive is read
+        """
+        encryptor = None
+        with gzip.open(path, 'rt', encoding='utf-8') as archive:
+            for line in archive:
+                line = line.strip()
+                if not line:
+                    continue
+                entry = json.loads(line)
+                entry_type = entry.get('type')
+
+                if entry_type == 'header':
+                    if entry.get('format') != ARCHIVE_FORMAT:
+                        raise ValueError("Not an account archive")
+                    encryptor = PasswordEncryption(password, salt=entry['salt'])
+                    yield ('header', entry)
+                elif entry_type == 'account':
+                    if encryptor is None:
+                        raise ValueError("Archive header missing")
+                    record = encryptor.decrypt_data(entry)
+                    yield ('account', record['username'], record['data'])
+                elif entry_type == 'deleted':
+                    yield ('deleted', entry['id'])
+                elif entry_type == 'end':
+                    return
+
+    @staticmethod
+    def restore_archives(paths, passwords):
+        """
+        Replay a full archive followed by its incrementals into one accounts dict
+        passwords: one password for every archive, or a list with one per path
+        """
+        if isinstance(passwords, str):
+            passwords = [passwords] * len(paths)
+        if len(passwords) != len(paths):
+            raise ValueError("Need one password per archive")
+        accounts = {}
+        for path, password in zip(paths, passwords):
+            for entry in VaultExporter.read_archive(path, password):
+                if entry[0] == 'account':
+                    accounts[entry[1]] = entry[2]
+                elif entry[0] == 'deleted':
+                    for username in [name for name in accounts if _record_id(name) == entry[1]]:
+                        del accounts[username]
+        return accounts
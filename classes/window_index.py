@@ -0,0 +1,302 @@
+"""
+Window index
+Maps each Roblox PID to its top-level windows so window features don't enumerate the desktop
+"""
+
+import os
+import time
+import threading
+
+
+class Win32WindowSource:
+    """Desktop window enumeration and show/destroy events through user32"""
+
+    EVENT_OBJECT_DESTROY = 0x8001
+    EVENT_OBJECT_SHOW = 0x8002
+    WINEVENT_OUTOFCONTEXT = 0x0000
+    WINEVENT_SKIPOWNPROCESS = 0x0002
+    OBJID_WINDOW = 0
+    WM_QUIT = 0x0012
+
+    def __init__(self):
+        import ctypes
+        from ctypes import wintypes
+        self.ctypes = ctypes
+        self.wintypes = wintypes
+        self.user32 = ctypes.windll.user32
+        self.kernel32 = ctypes.windll.kernel32
+        self.user32.GetParent.restype = wintypes.HWND
+        self._thread = None
+        self._thread_id = None
+
+    def window_pid(self, hwnd):
+        pid = self.wintypes.DWORD()
+        self.user32.GetWindowThreadProcessId(hwnd, self.ctypes.byref(pid))
+        return pid.value
+
+    def enumerate(self, pids):
+        """One EnumWindows pass, returns {pid: [hwnd, ...]} for visible top-level windows of pids"""
+        ctypes = self.ctypes
+        wintypes = self.wintypes
+        found = {}
+
+        def callback(hwnd, lParam):
+            if self.user32.IsWindowVisible(hwnd):
+                pid = self.window_pid(hwnd)
+                if pid in pids:
+                    found.setdefault(pid, []).append(hwnd)
+            return True
+
+        EnumWindowsProc = ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+        self.user32.EnumWindows(EnumWindowsProc(callback), 0)
+        return found
+
+    def is_valid(self, hwnd, pid):
+        return bool(self.user32.IsWindow(hwnd)) and self.window_pid(hwnd) == pid
+
+    def get_title(self, hwnd):
+        length = self.user32.GetWindowTextLengthW(hwnd)
+        buffer = self.ctypes.create_unicode_buffer(length + 1)
+        self.user32.GetWindowTextW(hwnd, buffer, length + 1)
+        return buffer.value
+
+    def set_title(self, hwnd, title):
+        return bool(self.user32.SetWindowTextW(hwnd, title))
+
+    def watch(self, callback):
+        """Report ('show', hwnd, pid) and ('destroy', hwnd, None) for top-level windows from a hook thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._hook_loop, args=(callback, ready), daemon=True, name="WindowEvents")
+        self._thread.start()
+        ready.wait(2)
+
+    def _hook_loop(self, callback, ready):
+        ctypes = self.ctypes
+        wintypes = self.wintypes
+        user32 = self.user32
+
+        WinEventProc = ctypes.WINFUNCTYPE(
+            None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+            wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD
+        )
+
+        def on_event(hook, event, hwnd, id_object, id_child, thread_id, event_time):
+            if not hwnd or id_object != self.OBJID_WINDOW or id_child != 0:
+                return
+            try:
+                if event == self.EVENT_OBJECT_DESTROY:
+                    callback('destroy', hwnd, None)
+                elif not user32.GetParent(hwnd):
+                    callback('show', hwnd, self.window_pid(hwnd))
+            except Exception as e:
+                print(f"[WARNING] Window event handler failed: {e}")
+
+        proc = WinEventProc(on_event)
+        hook = user32.SetWinEventHook(
+            self.EVENT_OBJECT_DESTROY, self.EVENT_OBJECT_SHOW, 0, proc, 0, 0,
+            self.WINEVENT_OUTOFCONTEXT | self.WINEVENT_SKIPOWNPROCESS
+        )
+        self._thread_id = self.kernel32.GetCurrentThreadId()
+        ready.set()
+        if not hook:
+            print("[WARNING] Could not install window event hook, falling back to validity checks")
+            return
+
+        msg = wintypes.MSG()
+        try:
+            while user32.GetMessageW(ctypes.byref(msg), 0, 0, 0) > 0:
+                user32.TranslateMessage(ctypes.byref(msg))
+                user32.DispatchMessageW(ctypes.byref(msg))
+        finally:
+            user32.UnhookWinEvent(hook)
+
+    def stop(self):
+        if self._thread and self._thread.is_alive() and self._thread_id:
+            self.user32.PostThreadMessageW(self._thread_id, self.WM_QUIT, 0, 0)
+        self._thread = None
+
+
+class FakeWindowSource:
+    """In-memory windows for exercising the index without a desktop"""
+
+    def __init__(self):
+        self.windows = {}
+        self.enumerations = 0
+        self._callback = None
+
+    def add_window(self, hwnd, pid, title="Roblox", visible=True):
+        self.windows[hwnd] = {'pid': pid, 'title': title, 'visible': visible}
+        if self._callback and visible:
+            self._callback('show', hwnd, pid)
+
+    def remove_window(self, hwnd, notify=True):
+        self.windows.pop(hwnd, None)
+        if self._callback and notify:
+            self._callback('destroy', hwnd, None)
+
+    def enumerate(self, pids):
+        self.enumerations += 1
+        found = {}
+        for hwnd, window in self.windows.items():
+            if window['visible'] and window['pid'] in pids:
+                found.setdefault(window['pid'], []).append(hwnd)
+        return found
+
+    def is_valid(self, hwnd, pid):
+        window = self.windows.get(hwnd)
+        return window is not None and window['pid'] == pid
+
+    def get_title(self, hwnd):
+        return self.windows.get(hwnd, {}).get('title', '')
+
+    def set_title(self, hwnd, title):
+        if hwnd not in self.windows:
+            return False
+        self.windows[hwnd]['title'] = title
+        return True
+
+    def watch(self, callback):
+        self._callback = callback
+
+    def stop(self):
+        self._callback = None
+
+
+def create_default_window_source():
+    if os.name == 'nt':
+        try:
+            return Win32WindowSource()
+        except (ImportError, AttributeError, OSError) as e:
+            print(f"[WARNING] Window enumeration unavailable: {e}")
+    return None
+
+
+class WindowIndex:
+    """
+    PID -> hwnds for running Roblox clients
+    Clients are enumerated once when they appear (and again only while they have no window yet);
+    after that window show/destroy events and a cheap validity check keep the index current
+    """
+
+    def __init__(self, source, registry, min_enum_interval=1.0):
+        self.source = source
+        self.registry = registry
+        self.min_enum_interval = min_enum_interval
+        self._windows = {}
+        self._owner = {}
+        self._pending = set()
+        self._last_enum = 0.0
+        self._lock = threading.RLock()
+        self._started = False
+        registry.subscribe(self._on_registry_event, replay=True)
+
+    def start(self):
+        """Listen for window events, safe to call more than once"""
+        if self._started or self.source is None:
+            return
+        self._started = True
+        try:
+            self.source.watch(self._on_window_event)
+        except Exception as e:
+            print(f"[WARNING] Could not watch window events: {e}")
+
+    def stop(self):
+        if self._started and self.source is not None:
+            self.source.stop()
+        self._started = False
+
+    def _on_registry_event(self, event, record):
+        with self._lock:
+            if event == 'added':
+                self._pending.add(record.pid)
+            else:
+                self._pending.discard(record.pid)
+                for hwnd in self._windows.pop(record.pid, []):
+                    self._owner.pop(hwnd, None)
+
+    def _on_window_event(self, event, hwnd, pid):
+        with self._lock:
+            if event == 'destroy':
+                owner = self._owner.pop(hwnd, None)
+                if owner is not None and hwnd in self._windows.get(owner, []):
+                    self._windows[owner].remove(hwnd)
+                    if not self._windows[owner]:
+                        del self._windows[owner]
+                        self._pending.add(owner)
+                return
+            if pid not in self._pending and pid not in self._windows:
+                return
+            self._add(pid, hwnd)
+            hwnds = list(self._windows[pid])
+        self.registry.set_windows(pid, hwnds)
+
+    def _add(self, pid, hwnd):
+        hwnds = self._windows.setdefault(pid, [])
+        if hwnd not in hwnds:
+            hwnds.append(hwnd)
+        self._owner[hwnd] = pid
+        self._pending.discard(pid)
+
+    def _enumerate_pending(self, force=False):
+        """One desktop enumeration covering every client still waiting for a window"""
+        if self.source is None:
+            return
+        with self._lock:
+            if not self._pending:
+                return
+            now = time.time()
+            if not force and now - self._last_enum < self.min_enum_interval:
+                return
+            self._last_enum = now
+            pending = set(self._pending)
+
+        found = self.source.enumerate(pending)
+        with self._lock:
+            for pid, hwnds in found.items():
+                if pid in self._pending:
+                    for hwnd in hwnds:
+                        self._add(pid, hwnd)
+        for pid, hwnds in found.items():
+            self.registry.set_windows(pid, hwnds)
+
+    def windows(self, pid, validate=True):
+        """hwnds of one client, validated cheaply instead of re-enumerating the desktop"""
+        self._enumerate_pending()
+        return self._lookup(pid, validate)
+
+    def _lookup(self, pid, validate):
+        with self._lock:
+            hwnds = list(self._windows.get(pid, []))
+        if validate and self.source is not None:
+            valid = [hwnd for hwnd in hwnds if self.source.is_valid(hwnd, pid)]
+            if len(valid) != len(hwnds):
+                with self._lock:
+                    for hwnd in set(hwnds) - set(valid):
+                        self._owner.pop(hwnd, None)
+                    if valid:
+                        self._windows[pid] = valid
+                    else:
+                        self._windows.pop(pid, None)
+                        if self.registry.get(pid) is not None:
+                            self._pending.add(pid)
+            hwnds = valid
+        return hwnds
+
+    def all_windows(self, max_age=None, validate=True):
+        """{pid: [hwnd, ...]} for every live client, max_age rescans the process registry first"""
+        pids = self.registry.get_pids(max_age=max_age)
+        self._enumerate_pending()
+        result = {}
+        for pid in pids:
+            hwnds = self._lookup(pid, validate)
+            if hwnds:
+                result[pid] = hwnds
+        return result
+
+    def get_title(self, hwnd):
+        return self.source.get_title(hwnd) if self.source is not None else ''
+
+    def set_title(self, hwnd, title):
+        return self.source.set_title(hwnd, title) if self.source is not None else False
@@ -0,0 +1,346 @@
+"""
+Roblox Account Manager - command line
+Batch operations on the saved accounts without opening the window
+
+    py cli.py list
+    py cli.py launch alice bob --place 606849621 --concurrency 2 --delay 3
+    py cli.py join-user SomePlayer --all
+    py cli.py validate --json
+    py cli.py import cookies.txt
+    py cli.py export backup.ramx --note main --incremental
+    py cli.py auto-rejoin run alice bob
+
+Vault password (password-encrypted vaults): --password-file, $RAM_PASSWORD or a prompt
+--json prints one JSON document on stdout; progress messages go to stderr
+launch / join-user turn on Multi Roblox when it is enabled in the settings (--no-multi-roblox
+to skip) and wait for the clients to start before exiting
+Exit code is 0 when every item succeeded, 1 otherwise
+"""
+
+import os
+import sys
+import json
+import time
+import getpass
+import argparse
+
+
+ARCHIVE_PASSWORD_ENV = "RAM_ARCHIVE_PASSWORD"
+
+
+def _select_accounts(app, args):
+    """Usernames from the command line, or every saved account with --all"""
+    if getattr(args, 'all', False):
+        return list(app.manager.accounts.keys())
+    if not args.accounts:
+        raise ValueError("Name at least one account or pass --all")
+    return args.accounts
+
+
+def _print_results(results, ok_key='success'):
+    for result in results:
+        if result.get(ok_key):
+            print(f"[SUCCESS] {result['account']}")
+        else:
+            print(f"[FAILED] {result['account']}: {result.get('error') or 'failed'}")
+
+
+def cmd_list(app, args):
+    accounts = app.accounts()
+    if not args.json:
+        for account in accounts:
+            note = f" • {account['note']}" if account['note'] else ""
+            print(f"{account['username']} ({account['user_id']}){note}")
+    return {'accounts': accounts}, True
+
+
+def _start_multi_roblox(app, args):
+    """Multi Roblox for a launch batch as configured in the settings, returns the PIDs already running"""
+    app.start_services(rejoin=False, anti_afk=False, multi_roblox=args.multi_roblox)
+    return set(app.registry.get_pids(max_age=0))
+
+
+def _wait_for_clients(app, known_pids, results):
+    """Stay alive until the launched clients are up, Multi Roblox ends with this process"""
+    launched = sum(1 for result in results if result['success'])
+    if not launched or app.multi_roblox_handle is None:
+        return
+    print(f"[INFO] Waiting for {launched} client(s) to start...")
+    started = app.wait_for_new_clients(known_pids, launched)
+    if len(started) < launched:
+        print(f"[WARNING] Only {len(started)} of {launched} client(s) started in time")
+
+
+def cmd_launch(app, args):
+    usernames = _select_accounts(app, args)
+    known_pids = _start_multi_roblox(app, args)
+    results = app.launch(
+        usernames,
+        args.place or "",
+        args.private_server or "",
+        args.job or "",
+        concurrency=args.concurrency,
+        delay=args.delay
+    )
+    _wait_for_clients(app, known_pids, results)
+    if not args.json:
+        _print_results(results)
+    return {'results': results}, all(result['success'] for result in results)
+
+
+def cmd_join_user(app, args):
+    usernames = _select_accounts(app, args)
+    known_pids = _start_multi_roblox(app, args)
+    result = app.join_user(usernames, args.target, concurrency=args.concurrency, delay=args.delay)
+    if result.get('error'):
+        raise ValueError(result['error'])
+    _wait_for_clients(app, known_pids, result['results'])
+    if not args.json:
+        print(f"[INFO] Joining {args.target} in place {result['place_id']} (job {result['job_id'] or 'any'})")
+        _print_results(result['results'])
+    return result, all(entry['success'] for entry in result['results'])
+
+
+def cmd_validate(app, args):
+    from concurrent.futures import ThreadPoolExecutor
+    from classes.roblox_api import RobloxAPI
+
+    usernames = args.accounts or list(app.manager.accounts.keys())
+    limiter = RobloxAPI.request_budget
+    limiter.set_rate(args.rate, burst=args.concurrency)
+
+    def validate_one(username):
+        result = {'account': username, 'valid': False, 'status_code': None, 'user_id': None, 'error': None}
+        cookie = app.manager.get_account_cookie(username)
+        if not cookie:
+            result['error'] = "Account not found"
+            return result
+        try:
+            limiter.acquire()
+            identity, status_code = RobloxAPI.fetch_cookie_identity(cookie)
+        except Exception as e:
+            result['error'] = str(e)
+            return result
+        result['status_code'] = status_code
+        if identity:
+            result['valid'] = True
+            result['user_id'] = identity.get('user_id')
+        elif status_code == 401:
+            result['error'] = "Cookie expired or invalid"
+        else:
+            result['error'] = f"HTTP {status_code}"
+        return result
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(validate_one, usernames))
+
+    if not args.json:
+        _print_results(results, ok_key='valid')
+        valid = sum(1 for result in results if result['valid'])
+        print(f"[INFO] {valid}/{len(results)} accounts valid")
+    return {'results': results}, all(result['valid'] for result in results)
+
+
+def cmd_import(app, args):
+    from classes.cookie_importer import CookieImporter
+    from classes.roblox_api import RobloxAPI
+
+    if args.file == "-":
+        text = sys.stdin.read()
+    else:
+        text = CookieImporter.read_file(args.file)
+
+    RobloxAPI.request_budget.set_rate(args.rate, burst=args.concurrency)
+    importer = CookieImporter(app.manager, max_workers=args.concurrency)
+    results = importer.run(text)
+    summary = CookieImporter.summarize(results)
+    if not args.json:
+        CookieImporter.print_report(results)
+        print("[INFO] " + ", ".join(f"{count} {status}" for status, count in sorted(summary.items())))
+    failed = any(result['status'] in ('failed', 'invalid_format') for result in results)
+    return {'summary': summary, 'results': results}, not failed
+
+
+def _archive_password(args):
+    if args.archive_password_file:
+        with open(args.archive_password_file, 'r', encoding='utf-8') as f:
+            return f.read().strip()
+    if os.environ.get(ARCHIVE_PASSWORD_ENV):
+        return os.environ[ARCHIVE_PASSWORD_ENV]
+    if sys.stdin and sys.stdin.isatty():
+        password = getpass.getpass("Archive password: ")
+        if password != getpass.getpass("Confirm archive password: "):
+            raise ValueError("Passwords do not match")
+        return password
+    raise ValueError(f"Pass --archive-password-file or set {ARCHIVE_PASSWORD_ENV}")
+
+
+def cmd_export(app, args):
+    from classes.vault_export import VaultExporter
+
+    exporter = VaultExporter(app.manager)
+    summary = exporter.export(
+        args.path,
+        _archive_password(args),
+        usernames=args.accounts or None,
+        note_filter=args.note,
+        incremental=args.incremental
+    )
+    if not args.json:
+        print(f"[SUCCESS] Wrote {summary['written']} account(s) to {summary['path']} "
+              f"({summary['unchanged']} unchanged, {summary['deleted']} deleted)")
+    return summary, True
+
+
+def cmd_rejoin_list(app, args):
+    configs = app.settings.get("auto_rejoin_configs", {})
+    entries = [
+        {
+            'account': account,
+            'place_id': config.get('place_id', ''),
+            'private_server': config.get('private_server', ''),
+            'job_id': config.get('job_id', ''),
+            'check_interval': config.get('check_interval', 10),
+            'max_retries': config.get('max_retries', 5),
+        }
+        for account, config in sorted(configs.items())
+    ]
+    if not args.json:
+        for entry in entries:
+            print(f"{entry['account']}: place {entry['place_id'] or '-'}, every {entry['check_interval']}s")
+    return {'configs': entries}, True
+
+
+def cmd_rejoin_run(app, args):
+    """Supervise accounts in the foreground until Ctrl+C"""
+    app.start_services(rejoin=True, anti_afk=False, multi_roblox=args.multi_roblox)
+    supervisor = app.auto_rejoin
+    accounts = list(supervisor.configs.keys()) if args.all else args.accounts
+    for account in accounts:
+        if not supervisor.is_active(account):
+            supervisor.start(account)
+
+    if not supervisor.active_accounts():
+        raise ValueError("No accounts to supervise, name accounts with an auto-rejoin config or pass --all")
+
+    print(f"[Auto-Rejoin] Supervising {', '.join(supervisor.active_accounts())}, press Ctrl+C to stop", file=sys.stderr)
+    try:
+        while supervisor.active_accounts():
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    return {'metrics': supervisor.metrics_snapshot()}, True
+
+
+def build_parser():
+    # Global options are accepted before or after the command
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--json", action="store_true", default=argparse.SUPPRESS, help="Print results as JSON")
+    common.add_argument("--password-file", default=argparse.SUPPRESS, help="File containing the vault password")
+
+    parser = argparse.ArgumentParser(prog="cli.py", description="Batch operations on saved Roblox accounts", parents=[common])
+    commands = parser.add_subparsers(dest="command", metavar="command")
+    commands.required = True
+
+    def multi_roblox_flag(command):
+        command.add_argument("--no-multi-roblox", dest="multi_roblox", action="store_false", default=None,
+                             help="Skip Multi Roblox even if enabled in the settings")
+
+    def concurrency_flags(command, concurrency=1, delay=True, rate=False):
+        command.add_argument("-c", "--concurrency", type=int, default=concurrency,
+                             help=f"Accounts processed at once (default {concurrency})")
+        if delay:
+            command.add_argument("--delay", type=float, default=0.0, help="Seconds between launches")
+        if rate:
+            command.add_argument("--rate", type=float, default=4.0, help="API requests per second (default 4)")
+
+    command = commands.add_parser("list", parents=[common], help="List saved accounts")
+    command.set_defaults(handler=cmd_list)
+
+    command = commands.add_parser("launch", parents=[common], help="Launch accounts into a place")
+    command.add_argument("accounts", nargs="*")
+    command.add_argument("--all", action="store_true", help="Launch every saved account")
+    command.add_argument("--place", help="Place ID")
+    command.add_argument("--job", help="Job ID of a specific server")
+    command.add_argument("--private-server", help="Private server link or code")
+    concurrency_flags(command)
+    multi_roblox_flag(command)
+    command.set_defaults(handler=cmd_launch)
+
+    command = commands.add_parser("join-user", parents=[common], help="Launch accounts into the server a user is playing in")
+    command.add_argument("target", help="Username to join")
+    command.add_argument("accounts", nargs="*")
+    command.add_argument("--all", action="store_true", help="Launch every saved account")
+    concurrency_flags(command)
+    multi_roblox_flag(command)
+    command.set_defaults(handler=cmd_join_user)
+
+    command = commands.add_parser("validate", parents=[common], help="Check which cookies are still valid (all accounts by default)")
+    command.add_argument("accounts", nargs="*")
+    concurrency_flags(command, concurrency=4, delay=False, rate=True)
+    command.set_defaults(handler=cmd_validate)
+
+    command = commands.add_parser("import", parents=[common], help="Import cookies from a file (- for stdin)")
+    command.add_argument("file")
+    concurrency_flags(command, concurrency=8, delay=False, rate=True)
+    command.set_defaults(handler=cmd_import)
+
+    command = commands.add_parser("export", parents=[common], help="Write accounts to an encrypted archive")
+    command.add_argument("path")
+    command.add_argument("accounts", nargs="*", help="Only these accounts (default all)")
+    command.add_argument("--note", help="Only accounts whose note contains this text")
+    command.add_argument("--incremental", action="store_true", help="Only accounts changed since the last backup")
+    command.add_argument("--archive-password-file", help=f"File containing the archive password (or set {ARCHIVE_PASSWORD_ENV})")
+    command.set_defaults(handler=cmd_export)
+
+    rejoin = commands.add_parser("auto-rejoin", parents=[common], help="Auto-rejoin configs and a foreground supervisor")
+    rejoin_commands = rejoin.add_subparsers(dest="rejoin_command", metavar="action")
+    rejoin_commands.required = True
+    command = rejoin_commands.add_parser("list", parents=[common], help="List auto-rejoin configs")
+    command.set_defaults(handler=cmd_rejoin_list)
+    command = rejoin_commands.add_parser("run", parents=[common], help="Supervise accounts until Ctrl+C")
+    command.add_argument("accounts", nargs="*")
+    command.add_argument("--all", action="store_true", help="Every account with an auto-rejoin config")
+    multi_roblox_flag(command)
+    command.set_defaults(handler=cmd_rejoin_run)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.json = getattr(args, 'json', False)
+    args.password_file = getattr(args, 'password_file', None)
+    if hasattr(args, 'concurrency'):
+        args.concurrency = max(1, min(16, args.concurrency))
+
+    # With --json only the result goes to stdout, everything printed along the way goes to stderr
+    stdout = sys.stdout
+    if args.json:
+        sys.stdout = sys.stderr
+
+    from classes.headless import HeadlessApp, resolve_password
+
+    app = None
+    try:
+        app = HeadlessApp(password=resolve_password(password_file=args.password_file))
+        payload, ok = args.handler(app, args)
+    except (ValueError, OSError) as e:
+        payload, ok = {'error': str(e)}, False
+        print(f"[ERROR] {e}", file=sys.stderr)
+    finally:
+        # Installers quarantined by a launch are put back on every exit path
+        if app is not None and app.registry is not None:
+            app.shutdown()
+        else:
+            from classes.roblox_api import RobloxAPI
+            RobloxAPI.restore_installers()
+        sys.stdout = stdout
+
+    if args.json:
+        print(json.dumps(payload, indent=2))
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,278 @@
+"""
+Roblox Account Manager - headless daemon
+Runs auto-rejoin, anti-AFK and Multi Roblox without a window and exposes a local JSON API
+
+    py daemon.py [--port 8765] [--anti-afk] [--no-multi-roblox]
+
+Every request needs the token written to AccountManagerData/daemon_token:
+    curl -H "Authorization: Bearer <token>" http://127.0.0.1:8765/status
+"""
+
+import os
+import sys
+import json
+import signal
+import secrets
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from classes.headless import HeadlessApp, resolve_password, DATA_FOLDER
+from classes.app_logging import AppLogging, PrintStream
+
+
+DEFAULT_PORT = 8765
+TOKEN_FILE = "daemon_token"
+MAX_BODY_BYTES = 64 * 1024
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class ControlHandler(BaseHTTPRequestHandler):
+    """
+    GET  /status, /accounts, /metrics[?account=], /rejoin
+    POST /launch {accounts, place_id, private_server, job_id, concurrency, delay}
+    POST /join-user {accounts, target, concurrency, delay}
+    POST /rejoin/start, /rejoin/stop {account} (or {"all": true})
+    POST /anti-afk/start, /anti-afk/stop, /shutdown
+    """
+
+    server_version = "RobloxAccountManagerDaemon/1"
+
+    def log_message(self, format, *args):
+        print(f"[INFO] API {self.address_string()} {format % args}")
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _authorized(self):
+        header = self.headers.get("Authorization", "")
+        token = header[7:] if header.startswith("Bearer ") else self.headers.get("X-Auth-Token", "")
+        return secrets.compare_digest(token.encode(), self.server.token.encode())
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            raise ApiError(413, "Request body too large")
+        if not length:
+            return {}
+        try:
+            data = json.loads(self.rfile.read(length).decode('utf-8'))
+        except ValueError:
+            raise ApiError(400, "Body must be JSON")
+        if not isinstance(data, dict):
+            raise ApiError(400, "Body must be a JSON object")
+        return data
+
+    def _dispatch(self, method):
+        if not self._authorized():
+            self._send(401, {'error': "Missing or invalid token"})
+            return
+        url = urlparse(self.path)
+        route = self.server.routes.get((method, url.path.rstrip('/') or '/'))
+        if route is None:
+            self._send(404, {'error': f"No route {method} {url.path}"})
+            return
+        try:
+            query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            body = self._body() if method == 'POST' else {}
+            self._send(200, route(query, body))
+        except ApiError as e:
+            self._send(e.status, {'error': str(e)})
+        except Exception as e:
+            print(f"[ERROR] API {method} {url.path} failed: {e}")
+            self._send(500, {'error': str(e)})
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+
+class ControlServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, app, token, host="127.0.0.1", port=DEFAULT_PORT):
+        super().__init__((host, port), ControlHandler)
+        self.app = app
+        self.token = token
+        self.routes = {
+            ('GET', '/status'): lambda q, b: app.status(),
+            ('GET', '/accounts'): lambda q, b: {'accounts': app.accounts()},
+            ('GET', '/metrics'): self.metrics,
+            ('GET', '/rejoin'): self.rejoin_overview,
+            ('POST', '/launch'): self.launch,
+            ('POST', '/join-user'): self.join_user,
+            ('POST', '/rejoin/start'): lambda q, b: self.rejoin(b, start=True),
+            ('POST', '/rejoin/stop'): lambda q, b: self.rejoin(b, start=False),
+            ('POST', '/anti-afk/start'): lambda q, b: {'running': app.start_anti_afk()},
+            ('POST', '/anti-afk/stop'): lambda q, b: app.stop_anti_afk() or {'running': False},
+            ('POST', '/shutdown'): self.request_shutdown,
+        }
+
+    @staticmethod
+    def _accounts(body):
+        accounts = body.get('accounts')
+        if isinstance(accounts, str):
+            accounts = [accounts]
+        if not accounts or not all(isinstance(account, str) for account in accounts):
+            raise ApiError(400, "'accounts' must be a non-empty list of usernames")
+        return accounts
+
+    @staticmethod
+    def _concurrency(body):
+        try:
+            return max(1, min(16, int(body.get('concurrency', 1)))), max(0.0, float(body.get('delay', 0)))
+        except (TypeError, ValueError):
+            raise ApiError(400, "'concurrency' and 'delay' must be numbers")
+
+    def _require_rejoin(self):
+        if self.app.auto_rejoin is None:
+            raise ApiError(409, "Auto-rejoin is not running in this daemon")
+        return self.app.auto_rejoin
+
+    def metrics(self, query, body):
+        return {'metrics': self._require_rejoin().metrics_snapshot(query.get('account'))}
+
+    def rejoin_overview(self, query, body):
+        supervisor = self._require_rejoin()
+        return {
+            'configured': sorted(supervisor.configs.keys()),
+            'active': supervisor.active_accounts(),
+            'cadence': supervisor.cadence_snapshot(),
+        }
+
+    def launch(self, query, body):
+        concurrency, delay = self._concurrency(body)
+        results = self.app.launch(
+            self._accounts(body),
+            body.get('place_id', ''),
+            body.get('private_server', ''),
+            body.get('job_id', ''),
+            concurrency=concurrency,
+            delay=delay
+        )
+        return {'results': results}
+
+    def join_user(self, query, body):
+        target = body.get('target')
+        if not target:
+            raise ApiError(400, "'target' is required")
+        concurrency, delay = self._concurrency(body)
+        result = self.app.join_user(self._accounts(body), target, concurrency=concurrency, delay=delay)
+        if result.get('error'):
+            raise ApiError(409, result['error'])
+        return result
+
+    def rejoin(self, body, start):
+        supervisor = self._require_rejoin()
+        if body.get('all'):
+            accounts = list(supervisor.configs.keys()) if start else supervisor.active_accounts()
+        else:
+            accounts = self._accounts({'accounts': body.get('accounts', body.get('account'))})
+        for account in accounts:
+            if start:
+                if account not in supervisor.configs:
+                    raise ApiError(404, f"No auto-rejoin config for '{account}'")
+                supervisor.start(account)
+            else:
+                supervisor.stop(account)
+        return {'active': supervisor.active_accounts()}
+
+    def request_shutdown(self, query, body):
+        threading.Thread(target=self.shutdown, daemon=True).start()
+        return {'stopping': True}
+
+
+def write_token(data_folder):
+    """New random token for this run, readable only by the current user where the OS allows it"""
+    token = secrets.token_urlsafe(32)
+    path = os.path.join(data_folder, TOKEN_FILE)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w') as f:
+        f.write(token)
+    return token, path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the account manager headless with a local control API")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to bind (default 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--password-file", help="File containing the vault password")
+    parser.add_argument("--anti-afk", dest="anti_afk", action="store_true", default=None, help="Start anti-AFK")
+    parser.add_argument("--no-anti-afk", dest="anti_afk", action="store_false", help="Do not start anti-AFK")
+    parser.add_argument("--no-multi-roblox", dest="multi_roblox", action="store_false", default=None,
+                        help="Skip Multi Roblox even if enabled in the settings")
+    parser.add_argument("--no-rejoin", dest="rejoin", action="store_false", help="Do not resume auto-rejoin")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(DATA_FOLDER):
+        os.makedirs(DATA_FOLDER)
+
+    app_logging = AppLogging(os.path.join(DATA_FOLDER, "logs"))
+    original_stdout, original_stderr = sys.stdout, sys.stderr
+    app_logging.add_console(original_stdout.write, include_prints=False)
+    app_logging.start()
+    sys.stdout = PrintStream(app_logging, original_stdout)
+    sys.stderr = PrintStream(app_logging, original_stderr)
+
+    try:
+        password = resolve_password(password_file=args.password_file)
+        app = HeadlessApp(password=password)
+    except ValueError as e:
+        print(f"[ERROR] {e}")
+        app_logging.close()
+        return 1
+
+    app_logging.set_levels(app.settings.get("log_level", "INFO"), app.settings.get("log_levels", {}))
+
+    # Bind before starting anything that launches clients or takes the Multi Roblox mutex,
+    # and clean up through app.shutdown() on every path after that
+    server = None
+    token_path = None
+    try:
+        token, token_path = write_token(app.data_folder)
+        try:
+            server = ControlServer(app, token, args.host, args.port)
+        except OSError as e:
+            print(f"[ERROR] Could not listen on {args.host}:{args.port}: {e}")
+            return 1
+
+        app.start_services(rejoin=args.rejoin, anti_afk=args.anti_afk, multi_roblox=args.multi_roblox)
+        print(f"[INFO] Control API listening on http://{args.host}:{args.port} (token in {token_path})")
+
+        def on_signal(signum, frame):
+            threading.Thread(target=server.shutdown, daemon=True).start()
+
+        signal.signal(signal.SIGINT, on_signal)
+        signal.signal(signal.SIGTERM, on_signal)
+
+        server.serve_forever(poll_interval=0.5)
+    finally:
+        print("[INFO] Daemon stopping...")
+        if server is not None:
+            server.server_close()
+        app.shutdown()
+        if token_path:
+            try:
+                os.remove(token_path)
+            except OSError:
+                pass
+        sys.stdout, sys.stderr = original_stdout, original_stderr
+        app_logging.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+from utils.account_list import AccountSearchIndex, account_label
+
+
+def make_index(accounts):
+    index = AccountSearchIndex()
+    for username, note in accounts.items():
+        index.update(username, note)
+    return index
+
+
+def test_account_label():
+    assert account_label("alice", {'note': "main"}) == "alice • main"
+    assert account_label("bob", {'note': ""}) == "bob"
+    assert account_label("carol", "legacy") == "carol"
+
+
+def test_search_matches_names_and_notes_case_insensitively():
+    index = make_index({"Alice": "farm", "bob": "Main ALT", "carol": ""})
+
+    assert index.search("ALI") == {"Alice"}
+    assert index.search("alt") == {"bob"}
+    assert index.search("  ") == {"Alice", "bob", "carol"}
+    assert index.search("zzz") == set()
+
+
+def test_narrowing_query_only_rechecks_previous_results():
+    index = make_index({"alpha": "", "alpine": "", "beta": "al"})
+    assert index.search("al") == {"alpha", "alpine", "beta"}
+
+    lookups = []
+    candidates = index._candidates
+    index._candidates = lambda query: lookups.append(query) or candidates(query)
+    assert index.search("alp") == {"alpha", "alpine"}
+    assert index.search("alph") == {"alpha"}
+    assert lookups == []
+
+
+def test_non_extension_query_searches_from_scratch():
+    index = make_index({"alpha": "", "alpine": "", "beta": ""})
+    assert index.search("alph") == {"alpha"}
+
+    # "alp" does not extend "alph", so results must not be limited to the previous match
+    assert index.search("alp") == {"alpha", "alpine"}
+    assert index.search("bet") == {"beta"}
+    assert index.search("a") == {"alpha", "alpine", "beta"}
+
+
+def test_update_and_remove_while_filter_is_active():
+    index = make_index({"alpha": "", "beta": ""})
+    assert index.search("al") == {"alpha"}
+
+    index.update("alpaca", "")
+    assert index.search("alp") == {"alpha", "alpaca"}
+
+    index.update("beta", "alpine server")
+    assert index.search("alp") == {"alpha", "alpaca", "beta"}
+
+    index.remove("alpha")
+    assert index.search("alp") == {"alpaca", "beta"}
+
+    index.update("beta", "")
+    assert index.search("alpa") == {"alpaca"}
+    assert index.search("a") == {"alpaca", "beta"}
+
+
+def test_update_reports_unchanged_entries():
+    index = make_index({"alpha": "note"})
+
+    assert index.update("alpha", "note") is False
+    assert index.update("alpha", "other") is True
+    assert index.search("note") == set()
@@ -0,0 +1,73 @@
+from classes.anti_afk import AntiAfkScheduler, FakeInputBackend, PHASE_STEP, parse_action
+
+
+def make_scheduler(windows, minutes=1):
+    backend = FakeInputBackend()
+    settings = {"anti_afk_interval_minutes": minutes, "anti_afk_key": "w", "anti_afk_key_amount": 1}
+    return AntiAfkScheduler(lambda: windows, backend, settings), backend
+
+
+def test_parse_action():
+    assert parse_action("LMB") == ('mouse', 'LMB')
+    assert parse_action("space") == ('key', 0x20)
+    assert parse_action("e") == ('key', ord("E"))
+    assert parse_action("F13") is None
+
+
+def test_new_windows_get_golden_ratio_phases():
+    windows = {100 + i: [i + 1] for i in range(8)}
+    scheduler, _ = make_scheduler(windows)
+    start = 1000.0
+
+    assert scheduler.discover(now=start) == 8
+
+    offsets = sorted(due - start for due in scheduler._due.values())
+    expected = sorted(scheduler.interval * ((k * PHASE_STEP) % 1.0) for k in range(1, 9))
+    assert all(abs(a - b) < 1e-6 for a, b in zip(offsets, expected))
+
+    # Three-gap theorem: consecutive phases are never closer than a fraction of the even spacing
+    gaps = [b - a for a, b in zip(offsets, offsets[1:])]
+    assert min(gaps) > scheduler.interval / len(windows) / 3
+
+
+def test_later_windows_keep_spreading():
+    windows = {100: [1], 101: [2]}
+    scheduler, _ = make_scheduler(windows)
+    scheduler.discover(now=0.0)
+    first = set(scheduler._due.values())
+
+    windows[102] = [3]
+    assert scheduler.discover(now=0.0) == 1
+    (added,) = set(scheduler._due.values()) - first
+    assert all(abs(added - due) > scheduler.interval / 10 for due in first)
+
+
+def test_each_window_gets_one_input_per_interval():
+    windows = {100 + i: [i + 1] for i in range(5)}
+    scheduler, backend = make_scheduler(windows)
+    start = 0.0
+    scheduler.discover(now=start)
+
+    intervals = 3
+    now = start
+    while now <= start + intervals * scheduler.interval:
+        scheduler.run_due(now=now)
+        now += 1.0
+
+    per_window = {}
+    for _, hwnd, action, amount in backend.sent:
+        per_window[hwnd] = per_window.get(hwnd, 0) + 1
+        assert action == ('key', 0x57) and amount == 1
+    assert per_window == {hwnd: intervals for hwnd in range(1, 6)}
+
+
+def test_closed_windows_are_dropped():
+    windows = {100: [1], 101: [2]}
+    scheduler, backend = make_scheduler(windows)
+    scheduler.discover(now=0.0)
+
+    del windows[101]
+    scheduler.discover(now=0.0)
+    scheduler.run_due(now=scheduler.interval)
+
+    assert [hwnd for _, hwnd, _, _ in backend.sent] == [1]
@@ -0,0 +1,53 @@
+import logging
+
+from classes.app_logging import PrintStream, parse_print_line
+
+
+class FakeAppLogging:
+    def __init__(self):
+        self.records = []
+
+    def log_print(self, text, default_level=logging.INFO):
+        self.records.append((default_level, text))
+
+
+def test_parse_print_line():
+    assert parse_print_line("[Auto-Rejoin] [alice] Error: boom") == (logging.ERROR, "auto_rejoin", "alice")
+    assert parse_print_line("[WARNING] disk full") == (logging.WARNING, "app", None)
+    assert parse_print_line("plain text") == (logging.INFO, "app", None)
+
+
+def test_print_stream_joins_partial_writes():
+    app = FakeAppLogging()
+    stream = PrintStream(app)
+
+    stream.write("[INFO] first")
+    stream.write("\n")
+    stream.write("second\n\nthird")
+
+    assert app.records == [(logging.INFO, "[INFO] first"), (logging.INFO, "second")]
+
+
+def test_print_stream_keeps_traceback_in_one_record():
+    app = FakeAppLogging()
+    stream = PrintStream(app)
+
+    for line in [
+        "Traceback (most recent call last):\n",
+        '  File "x.py", line 1, in <module>\n',
+        "    boom()\n",
+        "RuntimeError: boom\n",
+        "[INFO] after\n",
+    ]:
+        stream.write(line)
+
+    assert len(app.records) == 2
+    level, text = app.records[0]
+    assert level == logging.ERROR
+    assert text.splitlines() == [
+        "Traceback (most recent call last):",
+        '  File "x.py", line 1, in <module>',
+        "    boom()",
+        "RuntimeError: boom",
+    ]
+    assert app.records[1] == (logging.INFO, "[INFO] after")
@@ -0,0 +1,92 @@
+import json
+
+from classes.cookie_importer import CookieImporter, COOKIE_PREFIX
+from classes.roblox_api import RobloxAPI, RateLimiter
+
+
+def make_cookie(tag):
+    return f"{COOKIE_PREFIX}{tag}|_{tag.upper()}TOKEN"
+
+
+class FakeManager:
+    def __init__(self, accounts=None):
+        self.accounts = accounts or {}
+        self.saves = 0
+
+    def save_accounts(self):
+        self.saves += 1
+
+
+def make_importer(manager, identities, calls=None):
+    """Importer whose lookups come from identities (cookie -> username) without touching the network"""
+    def fetch(cookie):
+        if calls is not None:
+            calls.append(cookie)
+        username = identities.get(cookie)
+        if username is None:
+            return None, 401
+        return {'username': username, 'user_id': len(username), 'display_name': username.title()}, 200
+
+    importer = CookieImporter(manager, max_workers=2, max_retries=0, limiter=RateLimiter(1000, burst=100))
+    return importer, fetch
+
+
+def test_parse_newline_and_csv():
+    a, b, c = make_cookie("a"), make_cookie("b"), make_cookie("c")
+    text = f"{a}\n\nnot a cookie\nname,{b};{c}\n"
+    entries = list(CookieImporter.parse(text))
+
+    assert entries[0] == (1, a, "line 1")
+    assert entries[1] == (3, None, "not a cookie")
+    assert [(line, cookie) for line, cookie, _ in entries[2:]] == [(4, b), (4, c)]
+
+
+def test_parse_json_list_and_dicts():
+    a, b = make_cookie("a"), make_cookie("b")
+
+    listed = list(CookieImporter.parse(json.dumps([a, {"cookie": b}, {"other": "x"}])))
+    assert [cookie for _, cookie, _ in listed] == [a, b, None]
+
+    single = list(CookieImporter.parse(json.dumps({".ROBLOSECURITY": a})))
+    assert [cookie for _, cookie, _ in single] == [a]
+
+    keyed = list(CookieImporter.parse(json.dumps({"first": {"value": a}, "second": b})))
+    assert [cookie for _, cookie, _ in keyed] == [a, b]
+
+
+def test_parse_invalid_json_falls_back_to_lines():
+    a = make_cookie("a")
+    entries = list(CookieImporter.parse(f"[{a}"))
+    assert [cookie for _, cookie, _ in entries] == [a]
+
+
+def test_run_dedupes_and_skips_saved_cookies(monkeypatch):
+    a, b, saved, bad = make_cookie("a"), make_cookie("b"), make_cookie("saved"), make_cookie("bad")
+    manager = FakeManager({'olduser': {'username': 'olduser', 'cookie': saved}})
+    calls = []
+    importer, fetch = make_importer(manager, {a: 'alpha', b: 'olduser'}, calls)
+    monkeypatch.setattr(RobloxAPI, "fetch_cookie_identity", staticmethod(fetch))
+
+    results = importer.run("\n".join([a, a, saved, "junk", b, bad]))
+
+    assert [r['status'] for r in results] == ['imported', 'duplicate', 'exists', 'invalid_format', 'updated', 'failed']
+    assert sorted(calls) == sorted([a, b, bad])
+    assert manager.accounts['alpha']['cookie'] == a
+    assert manager.accounts['olduser']['cookie'] == b
+    assert manager.saves == 1
+
+
+def test_run_nothing_to_verify_does_not_save(monkeypatch):
+    saved = make_cookie("saved")
+    manager = FakeManager({'olduser': {'username': 'olduser', 'cookie': saved}})
+    importer, fetch = make_importer(manager, {})
+    monkeypatch.setattr(RobloxAPI, "fetch_cookie_identity", staticmethod(fetch))
+
+    results = importer.run(f"{saved}\n{saved}")
+
+    assert [r['status'] for r in results] == ['exists', 'duplicate']
+    assert manager.saves == 0
+
+
+def test_uses_shared_request_budget_by_default():
+    assert CookieImporter(FakeManager()).limiter is RobloxAPI.request_budget
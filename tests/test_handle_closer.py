@@ -0,0 +1,90 @@
+import time
+
+from classes.handle_closer import HandleCloser, FakeHandleBackend
+
+
+class SlowFakeBackend(FakeHandleBackend):
+    name = "slow"
+    min_retry_interval = 0.05
+
+
+class BrokenBackend:
+    name = "broken"
+
+    def __init__(self):
+        self.calls = 0
+
+    def close_handles(self, pid, object_name):
+        self.calls += 1
+        raise OSError("access denied")
+
+
+def make_closer(backends, exists, timeout=1.0, retry_interval=0.001):
+    return HandleCloser(backends, timeout=timeout, retry_interval=retry_interval, process_exists=exists)
+
+
+def test_closes_handle_once_client_creates_it():
+    backend = FakeHandleBackend()
+    backend.spawn(100, ready_after_calls=3)
+    closer = make_closer([backend], backend.exists)
+
+    closed, name, _ = closer.close_singleton(100)
+
+    assert closed and name == "fake"
+    assert backend.processes[100]['calls'] == 4
+    assert not backend.is_open(100)
+
+
+def test_backend_retry_interval_is_a_floor():
+    backend = SlowFakeBackend()
+    backend.spawn(100, ready_after_calls=2)
+    closer = make_closer([backend], backend.exists)
+
+    closed, _, elapsed = closer.close_singleton(100)
+
+    assert closed
+    assert elapsed >= 2 * SlowFakeBackend.min_retry_interval
+
+
+def test_gives_up_when_process_exits():
+    backend = FakeHandleBackend()
+    backend.spawn(100, ready_after_calls=1000)
+    calls = []
+
+    def exists(pid):
+        calls.append(pid)
+        if len(calls) >= 3:
+            backend.kill(pid)
+        return backend.exists(pid)
+
+    closer = make_closer([backend], exists, timeout=5.0)
+    started = time.perf_counter()
+    closed, _, _ = closer.close_singleton(100)
+
+    assert not closed
+    assert time.perf_counter() - started < 1.0
+
+
+def test_old_client_gets_a_single_lookup():
+    backend = FakeHandleBackend()
+    backend.spawn(100, ready_after_calls=1000)
+    closer = make_closer([backend], backend.exists, timeout=5.0)
+
+    closed, _, elapsed = closer.close_singleton(100, create_time=time.time() - 60)
+
+    assert not closed
+    assert backend.calls == 1
+    assert elapsed < 1.0
+
+
+def test_failing_backend_falls_back_and_is_skipped():
+    broken = BrokenBackend()
+    backend = FakeHandleBackend()
+    backend.spawn(100)
+    backend.spawn(101)
+    closer = make_closer([broken, backend], backend.exists)
+
+    assert closer.close_singleton(100)[:2] == (True, "fake")
+    assert closer.close_singleton(101)[:2] == (True, "fake")
+    assert broken.calls == 1
+    assert closer.describe() == "fake"
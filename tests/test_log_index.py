@@ -0,0 +1,96 @@
+import os
+import calendar
+import time
+
+from classes.log_index import RobloxLogIndex
+
+
+def log_name(started_at, suffix="ABC12"):
+    stamp = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime(started_at))
+    return f"0.650.0.6500000_{stamp}_Player_{suffix}_last.log"
+
+
+def write_log(logs_dir, started_at, user_id, place_id="606849621", job_id="0f6c5e3a-1111-2222-3333-444455556666", suffix="ABC12"):
+    path = logs_dir / log_name(started_at, suffix)
+    path.write_text(
+        f"{time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(started_at))} [FLog::Output] userid: {user_id}\n"
+        f"[FLog::Output] ! Joining game '{job_id}' place {place_id} at 10.0.0.1\n",
+        encoding="utf-8"
+    )
+    return str(path)
+
+
+def touch_dir(logs_dir, offset):
+    # Directory mtime can have coarse resolution, move it explicitly so refresh sees the change
+    stamp = os.stat(logs_dir).st_mtime_ns + offset * 1_000_000_000
+    os.utime(logs_dir, ns=(stamp, stamp))
+
+
+def test_parse_timestamp():
+    started_at = calendar.timegm((2024, 5, 1, 12, 30, 15, 0, 0, 0))
+    assert RobloxLogIndex.parse_timestamp(log_name(started_at)) == float(started_at)
+    assert RobloxLogIndex.parse_timestamp("no_timestamp_last.log") is None
+
+
+def test_user_id_for_process_matches_closest_log(tmp_path):
+    base = 1_700_000_000
+    first = write_log(tmp_path, base, 111, suffix="AAAAA")
+    second = write_log(tmp_path, base + 30, 222, suffix="BBBBB")
+    (tmp_path / "unrelated.txt").write_text("userid: 999")
+
+    index = RobloxLogIndex(str(tmp_path), min_refresh_interval=0)
+
+    assert index.user_id_for_process(base + 1) == ("111", first)
+    assert index.user_id_for_process(base + 29) == ("222", second)
+    assert index.user_id_for_process(base + 500) == (None, None)
+    assert index.user_id_for_process(None) == (None, None)
+
+    entry = index.find_for_process(base + 1)
+    assert entry.place_id == "606849621"
+    assert entry.job_id == "0f6c5e3a-1111-2222-3333-444455556666"
+
+
+def test_exclude_skips_logs_already_claimed(tmp_path):
+    base = 1_700_000_000
+    first = write_log(tmp_path, base, 111, suffix="AAAAA")
+    second = write_log(tmp_path, base + 2, 222, suffix="BBBBB")
+    index = RobloxLogIndex(str(tmp_path), min_refresh_interval=0)
+
+    claimed = set()
+    assert index.user_id_for_process(base, exclude=claimed) == ("111", first)
+    assert claimed == {first}
+    assert index.user_id_for_process(base, exclude=claimed) == ("222", second)
+
+
+def test_refresh_picks_up_new_and_removed_files(tmp_path):
+    base = 1_700_000_000
+    first = write_log(tmp_path, base, 111, suffix="AAAAA")
+    index = RobloxLogIndex(str(tmp_path), min_refresh_interval=0)
+    index.refresh()
+    assert [entry.path for entry in index.entries_between(base - 100, base + 100)] == [first]
+
+    second = write_log(tmp_path, base + 60, 222, suffix="BBBBB")
+    touch_dir(tmp_path, 1)
+    assert index.user_id_for_process(base + 60) == ("222", second)
+
+    os.remove(first)
+    touch_dir(tmp_path, 2)
+    index.refresh()
+    assert [entry.path for entry in index.entries_between(base - 100, base + 100)] == [second]
+
+
+def test_unchanged_folder_is_not_rescanned(tmp_path):
+    base = 1_700_000_000
+    write_log(tmp_path, base, 111, suffix="AAAAA")
+    index = RobloxLogIndex(str(tmp_path), min_refresh_interval=0)
+    index.refresh()
+
+    # A file that appears without the folder mtime moving is only seen on a forced scan
+    mtime = os.stat(tmp_path).st_mtime_ns
+    late = write_log(tmp_path, base + 5, 222, suffix="BBBBB")
+    os.utime(tmp_path, ns=(mtime, mtime))
+    index.refresh()
+    assert len(index.entries_between(base - 100, base + 100)) == 1
+
+    index.refresh(force=True)
+    assert [entry.path for entry in index.entries_between(base + 1, base + 100)] == [late]
@@ -0,0 +1,61 @@
+import threading
+
+from classes.process_watcher import FakeProcessBackend, ProcessWatcher
+
+
+def make_watcher():
+    backend = FakeProcessBackend()
+    watcher = ProcessWatcher(backend, wait_timeout=5.0)
+    exits = []
+    exited = threading.Event()
+
+    def on_exit(pid, tag):
+        exits.append((pid, tag))
+        exited.set()
+
+    watcher.subscribe(on_exit)
+    return backend, watcher, exits, exited
+
+
+def test_exit_callback_fires_with_tag():
+    backend, watcher, exits, exited = make_watcher()
+    backend.spawn(100)
+    backend.spawn(200)
+    try:
+        assert watcher.watch(100, "alice")
+        assert watcher.watch(200, "bob")
+
+        backend.kill(200)
+        assert exited.wait(1.0), "exit not reported well before the wait timeout"
+        assert exits == [(200, "bob")]
+        assert not watcher.is_watched(200)
+        assert watcher.is_watched(100)
+    finally:
+        watcher.stop()
+
+
+def test_dead_pid_is_reported_immediately():
+    backend, watcher, exits, exited = make_watcher()
+    try:
+        assert not watcher.watch(300, "carol")
+        assert exits == [(300, "carol")]
+    finally:
+        watcher.stop()
+
+
+def test_unwatched_pid_is_not_reported():
+    backend, watcher, exits, exited = make_watcher()
+    backend.spawn(100)
+    backend.spawn(200)
+    try:
+        watcher.watch(100, "alice")
+        watcher.watch(200, "bob")
+        watcher.unwatch(100)
+        assert not watcher.is_watched(100)
+
+        backend.kill(100)
+        backend.kill(200)
+        assert exited.wait(1.0)
+        assert exits == [(200, "bob")]
+    finally:
+        watcher.stop()
@@ -0,0 +1,80 @@
+from classes.process_registry import FakeProcessSource, RobloxProcessRegistry
+from classes.window_index import FakeWindowSource, WindowIndex
+
+
+def make_index():
+    processes = FakeProcessSource()
+    registry = RobloxProcessRegistry(processes)
+    windows = FakeWindowSource()
+    index = WindowIndex(windows, registry, min_enum_interval=0)
+    index.start()
+    return processes, registry, windows, index
+
+
+def test_client_is_enumerated_once_then_looked_up():
+    processes, registry, windows, index = make_index()
+    windows.add_window(11, 100)
+    windows.add_window(99, 555)
+    processes.spawn(100)
+    registry.refresh()
+
+    assert index.windows(100) == [11]
+    enumerations = windows.enumerations
+    for _ in range(50):
+        assert index.windows(100) == [11]
+    assert windows.enumerations == enumerations
+    assert registry.get(100).hwnds == [11]
+
+
+def test_show_event_indexes_window_without_enumeration():
+    processes, registry, windows, index = make_index()
+    processes.spawn(100)
+    registry.refresh()
+    assert index.windows(100) == []
+
+    enumerations = windows.enumerations
+    windows.add_window(12, 100)
+    assert index.all_windows() == {100: [12]}
+    assert windows.enumerations == enumerations
+
+
+def test_window_destroy_removes_it():
+    processes, registry, windows, index = make_index()
+    processes.spawn(100)
+    registry.refresh()
+    windows.add_window(11, 100)
+    windows.add_window(12, 100)
+    assert index.windows(100) == [11, 12]
+
+    windows.remove_window(11)
+    assert index.windows(100) == [12]
+
+    windows.remove_window(12)
+    assert index.windows(100) == []
+    assert index.all_windows() == {}
+
+
+def test_missed_destroy_is_caught_by_validity_check():
+    processes, registry, windows, index = make_index()
+    processes.spawn(100)
+    registry.refresh()
+    windows.add_window(11, 100)
+    assert index.windows(100) == [11]
+
+    windows.remove_window(11, notify=False)
+    assert index.windows(100) == []
+
+
+def test_process_exit_drops_its_windows():
+    processes, registry, windows, index = make_index()
+    processes.spawn(100)
+    processes.spawn(200)
+    registry.refresh()
+    windows.add_window(11, 100)
+    windows.add_window(21, 200)
+    assert index.all_windows() == {100: [11], 200: [21]}
+
+    processes.kill(100)
+    registry.refresh()
+    assert index.all_windows() == {200: [21]}
+    assert index.windows(100) == []
@@ -0,0 +1,388 @@
+"""
+Account list
+Virtualized, searchable account list for the main window
+"""
+
+import tkinter as tk
+from tkinter import ttk, font as tkfont
+
+
+def account_label(username, data):
+    note = data.get('note', '') if isinstance(data, dict) else ''
+    return f"{username} • {note}" if note else username
+
+
+class AccountSearchIndex:
+    """
+    Case-insensitive substring search over usernames and notes
+    A character index narrows a fresh query to accounts containing all of its characters,
+    and a query that extends the previous one only re-checks the previous results
+    """
+
+    def __init__(self):
+        self._haystacks = {}
+        self._chars = {}
+        self._last_query = None
+        self._last_results = None
+
+    def update(self, username, note=""):
+        """Index or re-index one account, returns False when nothing changed"""
+        haystack = f"{username}\n{note or ''}".lower()
+        if self._haystacks.get(username) == haystack:
+            return False
+        self.remove(username)
+        self._haystacks[username] = haystack
+        for char in set(haystack):
+            self._chars.setdefault(char, set()).add(username)
+        self._last_query = None
+        return True
+
+    def remove(self, username):
+        haystack = self._haystacks.pop(username, None)
+        if haystack is None:
+            return
+        for char in set(haystack):
+            usernames = self._chars.get(char)
+            if usernames is not None:
+                usernames.discard(username)
+                if not usernames:
+                    del self._chars[char]
+        self._last_query = None
+
+    def _candidates(self, query):
+        sets = []
+        for char in set(query):
+            usernames = self._chars.get(char)
+            if not usernames:
+                return set()
+            sets.append(usernames)
+        sets.sort(key=len)
+        return set.intersection(*sets)
+
+    def search(self, query):
+        """Usernames whose name or note contains query"""
+        query = query.strip().lower()
+        if not query:
+            return set(self._haystacks)
+
+        if self._last_query and query.startswith(self._last_query):
+            candidates = self._last_results
+        else:
+            candidates = self._candidates(query)
+
+        results = {username for username in candidates if query in self._haystacks[username]}
+        self._last_query = query
+        self._last_results = results
+        return results
+
+
+class VirtualAccountList:
+    """
+    Account list that only materializes the rows on screen
+    The listbox holds one entry per visible row; scrolling, filtering and updates rewrite
+    just those rows. Selection is kept by username, so it survives reorders and filtering
+    A second listbox shows a status badge per row
+    """
+
+    def __init__(self, parent, bg, fg, selectbackground, font=("Segoe UI", 10), selectmode=tk.SINGLE, status_fg="#b0b0b0"):
+        self.frame = ttk.Frame(parent, style="Dark.TFrame")
+        self.selectmode = selectmode
+        self.selectbackground = selectbackground
+        self.bg = bg
+
+        self.listbox = tk.Listbox(
+            self.frame,
+            bg=bg,
+            fg=fg,
+            selectbackground=selectbackground,
+            highlightthickness=0,
+            border=0,
+            selectborderwidth=0,
+            font=font,
+            width=20,
+            height=1,
+            selectmode=tk.MULTIPLE,
+            relief="flat",
+            activestyle="none",
+            exportselection=False,
+        )
+        self.status_box = tk.Listbox(
+            self.frame,
+            bg=bg,
+            fg=status_fg,
+            selectbackground=selectbackground,
+            highlightthickness=0,
+            border=0,
+            selectborderwidth=0,
+            font=font,
+            width=10,
+            height=1,
+            selectmode=tk.MULTIPLE,
+            relief="flat",
+            activestyle="none",
+            exportselection=False,
+        )
+
+        self.scrollbar = ttk.Scrollbar(self.frame, command=self.yview)
+        self.scrollbar.pack(side="right", fill="y")
+        self.status_box.pack(side="right", fill="y")
+        self.listbox.pack(side="left", fill="both", expand=True)
+
+        # Drop the Listbox class bindings, selection and scrolling are handled here
+        for box in (self.listbox, self.status_box):
+            box._virtual_list = self
+            box.bindtags((str(box), "VirtualAccountList", str(box.winfo_toplevel()), "all"))
+        self.listbox.bind_class("VirtualAccountList", "<Button-1>", self._dispatch("on_click"))
+        self.listbox.bind_class("VirtualAccountList", "<MouseWheel>", self._dispatch("on_mousewheel"))
+        self.listbox.bind_class("VirtualAccountList", "<Up>", self._dispatch("on_up"))
+        self.listbox.bind_class("VirtualAccountList", "<Down>", self._dispatch("on_down"))
+        self.listbox.bind_class("VirtualAccountList", "<Configure>", self._dispatch("on_resize"))
+
+        self.accounts = []
+        self.labels = {}
+        self.badges = {}
+        self.rows = []
+        self._positions = {}
+        self.index = AccountSearchIndex()
+        self.query = ""
+        self.selected = set()
+        self.anchor = None
+        self.drop_target = None
+        self.offset = 0
+        self._shown = []
+        self._row_height = None
+
+    def _dispatch(self, method):
+        def handler(event):
+            view = getattr(event.widget, "_virtual_list", None)
+            if view is not None:
+                return getattr(view, method)(event)
+        return handler
+
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
+    def bind(self, sequence, func):
+        self.listbox.bind(sequence, func)
+        self.status_box.bind(sequence, func)
+
+    def configure_colors(self, bg, fg, selectbackground):
+        self.bg = bg
+        self.selectbackground = selectbackground
+        self.listbox.configure(bg=bg, fg=fg, selectbackground=selectbackground)
+        self.status_box.configure(bg=bg, selectbackground=selectbackground)
+        self.drop_target = None
+        self.listbox.delete(0, tk.END)
+        self.status_box.delete(0, tk.END)
+        self._shown = []
+        self.render()
+
+    def set_badges(self, badges):
+        """Update status badges from {username: text}, only visible rows that changed are redrawn"""
+        changed = False
+        for username, badge in badges.items():
+            if self.badges.get(username, "") != badge:
+                if badge:
+                    self.badges[username] = badge
+                else:
+                    self.badges.pop(username, None)
+                changed = changed or username in self._positions
+        if changed:
+            self.render()
+
+    def set_selectmode(self, mode):
+        self.selectmode = mode
+        if mode != tk.EXTENDED and len(self.selected) > 1:
+            keep = self.anchor if self.anchor in self.selected else next(iter(self.selected))
+            self.selected = {keep}
+            self.render()
+
+    def set_accounts(self, accounts):
+        """
+        Sync with an ordered {username: data} mapping
+        Only labels that changed are re-indexed, only visible rows are redrawn
+        """
+        order = list(accounts.keys())
+        labels = {username: account_label(username, accounts[username]) for username in order}
+
+        for username in set(self.labels) - set(labels):
+            self.index.remove(username)
+            self.badges.pop(username, None)
+        filter_dirty = False
+        for username, label in labels.items():
+            if self.labels.get(username) != label:
+                data = accounts[username]
+                note = data.get('note', '') if isinstance(data, dict) else ''
+                if self.index.update(username, note):
+                    filter_dirty = True
+
+        order_changed = order != self.accounts
+        self.accounts = order
+        self.labels = labels
+        self.selected &= set(labels)
+        if self.anchor not in labels:
+            self.anchor = None
+
+        if order_changed or filter_dirty:
+            self._apply_filter()
+        self.render()
+
+    def set_filter(self, query):
+        if query == self.query:
+            return
+        self.query = query
+        self._apply_filter()
+        self.offset = 0
+        self.render()
+
+    def _apply_filter(self):
+        if self.query.strip():
+            matches = self.index.search(self.query)
+            self.rows = [username for username in self.accounts if username in matches]
+        else:
+            self.rows = list(self.accounts)
+        self._positions = {username: position for position, username in enumerate(self.rows)}
+
+    def position_of(self, username):
+        return self._positions.get(username)
+
+    def visible_count(self):
+        height = self.listbox.winfo_height()
+        if self._row_height is None:
+            try:
+                self._row_height = tkfont.Font(font=self.listbox.cget("font")).metrics("linespace") + 1
+            except Exception:
+                self._row_height = 18
+        return max(1, height // self._row_height)
+
+    def render(self):
+        """Rewrite only the listbox rows whose text, badge or selection changed"""
+        count = self.visible_count()
+        self.offset = max(0, min(self.offset, len(self.rows) - count))
+        window = self.rows[self.offset:self.offset + count]
+
+        for position, username in enumerate(window):
+            label = self.labels.get(username, username)
+            badge = self.badges.get(username, "")
+            if position >= len(self._shown):
+                self.listbox.insert(tk.END, label)
+                self.status_box.insert(tk.END, badge)
+                self._shown.append((None, None, None, None))
+            else:
+                if self._shown[position][0] != label:
+                    self.listbox.delete(position)
+                    self.listbox.insert(position, label)
+                if self._shown[position][1] != badge:
+                    self.status_box.delete(position)
+                    self.status_box.insert(position, badge)
+
+            state = (label, badge, username in self.selected, username == self.drop_target)
+            if self._shown[position] != state:
+                for box in (self.listbox, self.status_box):
+                    if state[2]:
+                        box.selection_set(position)
+                    else:
+                        box.selection_clear(position)
+                    box.itemconfig(position, background=self.selectbackground if state[3] else self.bg)
+                self._shown[position] = state
+
+        if len(self._shown) > len(window):
+            self.listbox.delete(len(window), tk.END)
+            self.status_box.delete(len(window), tk.END)
+            del self._shown[len(window):]
+
+        if self.rows:
+            self.scrollbar.set(self.offset / len(self.rows), min(1.0, (self.offset + count) / len(self.rows)))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def yview(self, *args):
+        count = self.visible_count()
+        if not args:
+            return
+        if args[0] == "moveto":
+            self.offset = int(float(args[1]) * len(self.rows))
+        elif args[0] == "scroll":
+            step = int(args[1]) * (count if args[2] == "pages" else 1)
+            self.offset += step
+        self.render()
+
+    def see(self, username):
+        position = self.position_of(username)
+        if position is None:
+            return
+        count = self.visible_count()
+        if position < self.offset:
+            self.offset = position
+        elif position >= self.offset + count:
+            self.offset = position - count + 1
+        self.render()
+
+    def username_at(self, y):
+        """Username of the row under a listbox y coordinate, or None"""
+        if not self.rows:
+            return None
+        position = self.offset + self.listbox.nearest(y)
+        if 0 <= position < len(self.rows):
+            return self.rows[position]
+        return None
+
+    def selected_usernames(self):
+        """Selected usernames in list order, rows hidden by the search are left out"""
+        return [username for username in self.rows if username in self.selected]
+
+    def select(self, username, see=True):
+        self.selected = {username}
+        self.anchor = username
+        if see:
+            self.see(username)
+        else:
+            self.render()
+
+    def clear_selection(self):
+        self.selected = set()
+        self.render()
+
+    def set_drop_target(self, username):
+        if username != self.drop_target:
+            self.drop_target = username
+            self.render()
+
+    def on_click(self, event):
+        self.listbox.focus_set()
+        username = self.username_at(event.y)
+        if username is None:
+            return "break"
+
+        if self.selectmode == tk.EXTENDED and event.state & 0x0001 and self.anchor in self._positions:
+            start, end = sorted((self._positions[self.anchor], self._positions[username]))
+            self.selected = set(self.rows[start:end + 1])
+        elif self.selectmode == tk.EXTENDED and event.state & 0x0004:
+            self.selected ^= {username}
+            self.anchor = username
+        else:
+            self.selected = {username}
+            self.anchor = username
+        self.render()
+        return "break"
+
+    def on_mousewheel(self, event):
+        self.yview("scroll", -3 if event.delta > 0 else 3, "units")
+        return "break"
+
+    def _step(self, delta):
+        if not self.rows:
+            return "break"
+        position = self._positions.get(self.anchor)
+        position = 0 if position is None else max(0, min(len(self.rows) - 1, position + delta))
+        self.select(self.rows[position])
+        return "break"
+
+    def on_up(self, event):
+        return self._step(-1)
+
+    def on_down(self, event):
+        return self._step(1)
+
+    def on_resize(self, event):
+        self.render()
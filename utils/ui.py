@@ -8,7 +8,7 @@ import json
 import sys
 import subprocess
 import tkinter as tk
-from tkinter import ttk, messagebox, colorchooser
+from tkinter import ttk, messagebox, colorchooser, filedialog
 import requests
 import threading
 import msvcrt
@@ -28,12 +28,32 @@ import platform
 import traceback
 import psutil
 import random
+import queue
+from collections import deque
 from urllib.request import urlretrieve
 from classes.roblox_api import RobloxAPI
 from classes.account_manager import RobloxAccountManager
+from classes.cookie_importer import CookieImporter
+from classes.vault_export import VaultExporter
+from classes.auto_rejoin import AutoRejoinSupervisor
+from classes.handle_closer import create_default_closer
+from classes.anti_afk import AntiAfkScheduler, create_input_backend
+from classes.window_index import WindowIndex, create_default_window_source
+from classes.process_registry import RobloxProcessRegistry
+from classes.log_index import RobloxLogIndex
+from classes.app_logging import AppLogging, PrintStream, get_logger
+from classes.task_executor import TaskExecutor
+from classes.account_status import AccountStatusStore
 from utils.encryption_setup import EncryptionSetupUI
+from utils.account_list import VirtualAccountList
+
+status_logger = get_logger("account_status")
 
 class AccountManagerUI:
+    CONSOLE_MAX_LINES = 5000
+    CONSOLE_DRAIN_MS = 100
+    ACCOUNT_STATUS_BATCH_SIZE = 50
+
     def __init__(self, root, manager, icon_path=None):
         self.root = root
         self.manager = manager
@@ -41,10 +61,18 @@ class AccountManagerUI:
         self.APP_VERSION = "2.4.4"
         self._game_name_after_id = None
         self._save_settings_timer = None
-        
-        self.console_output = []
+        self._settings_generation = 0
+        self._settings_write_lock = threading.Lock()
+        # Held by anything that changes settings from a worker thread and while they are serialized
+        self.settings_lock = threading.RLock()
+        
+        self.console_output = deque(maxlen=self.CONSOLE_MAX_LINES)
+        self.console_queue = queue.Queue()
+        self.console_lock = threading.Lock()
         self.console_window = None
         self.console_text_widget = None
+        self.app_logging = None
+        self.log_stream = None
         self.original_stdout = sys.stdout
         self.original_stderr = sys.stderr
         
@@ -53,6 +81,10 @@ class AccountManagerUI:
         
         sys.stdout = self
         sys.stderr = self
+        self.root.after(self.CONSOLE_DRAIN_MS, self._drain_console_queue)
+        
+        self.tasks = TaskExecutor()
+        self.tasks.attach(self.root)
         
         try:
             ctypes.windll.shcore.SetProcessDpiAwareness(1)
@@ -68,6 +100,7 @@ class AccountManagerUI:
         
         self.settings_file = os.path.join(self.data_folder, "ui_settings.json")
         self.load_settings()
+        self.setup_logging()
         
         # Initialize color scheme BEFORE using them
         self.BG_DARK = self.settings.get("theme_bg_dark", "#1a1a1a")
@@ -101,21 +134,44 @@ class AccountManagerUI:
         
         self.multi_roblox_handle = None
         self.handle64_monitoring = False
-        self.handle64_monitor_thread = None
+        self.process_registry = RobloxProcessRegistry()
+        self.log_index = RobloxLogIndex()
+        self.window_index = WindowIndex(create_default_window_source(), self.process_registry)
         self.handle64_path = None
+        self.handle_closer = None
         
-        self.anti_afk_thread = None
-        self.anti_afk_stop_event = threading.Event()
+        self.anti_afk = None
+        self.account_status = AccountStatusStore()
+        self._last_status_poll = 0.0
         
         self.rename_thread = None
         self.rename_stop_event = threading.Event()
+        self.rename_wake_event = threading.Event()
+        self.rename_lock = threading.Lock()
+        self.rename_pending = {}
+        self.rename_name_cache = {}
         self.renamed_pids = set()
         
-        self.auto_rejoin_threads = {}
-        self.auto_rejoin_stop_events = {}
-        self.auto_rejoin_configs = self.settings.get("auto_rejoin_configs", {})
-        self.auto_rejoin_pids = {}
-        self.auto_rejoin_launch_lock = threading.Lock()
+        self.auto_rejoin_configs = self.settings.setdefault("auto_rejoin_configs", {})
+        self.auto_rejoin = AutoRejoinSupervisor(
+            self.manager,
+            self.auto_rejoin_configs,
+            self.settings,
+            save_settings=self.save_settings,
+            settings_lock=self.settings_lock,
+            registry=self.process_registry,
+            log_index=self.log_index,
+            status_store=self.account_status
+        )
+        # Clients that are still running are re-attached; dead ones only relaunch when the
+        # setting says so or the user agrees (they may have been closed on purpose)
+        relaunch_setting = self.settings.get("auto_rejoin_relaunch_on_start")
+        self.tasks.submit(
+            'network',
+            self.auto_rejoin.resume,
+            relaunch=relaunch_setting is True,
+            on_result=lambda result: self.confirm_auto_rejoin_relaunch(result[1]) if relaunch_setting is None else None
+        )
 
         style = ttk.Style()
         style.theme_use("clam")
@@ -131,6 +187,10 @@ class AccountManagerUI:
                        insertcolor=self.FG_ACCENT, borderwidth=1, relief="solid")
         style.configure("Dark.Accent.TButton", background=self.FG_ACCENT, foreground=self.FG_TEXT, font=(self.FONT_FAMILY, self.FONT_SIZE - 1))
         style.map("Dark.Accent.TButton", background=[("active", self.FG_ACCENT_HOVER)])
+        style.configure("Dark.Treeview", background=self.BG_LIGHT, fieldbackground=self.BG_LIGHT, foreground=self.FG_TEXT,
+                       borderwidth=0, rowheight=22, font=("Segoe UI", 9))
+        style.map("Dark.Treeview", background=[("selected", self.FG_ACCENT)], foreground=[("selected", self.FG_TEXT)])
+        style.configure("Dark.Treeview.Heading", background=self.BG_MID, foreground=self.FG_TEXT, relief="flat", font=("Segoe UI", 9, "bold"))
 
         main_frame = ttk.Frame(self.root, style="Dark.TFrame")
         main_frame.pack(fill="both", expand=True, padx=12, pady=12)
@@ -168,33 +228,28 @@ class AccountManagerUI:
         )
         self.encryption_label.pack(side="right", padx=(5, 0))
 
-        list_frame = ttk.Frame(left_frame, style="Dark.TFrame")
-        list_frame.pack(fill="both", expand=True)
+        self.account_search_var = tk.StringVar()
+        self._account_search_after_id = None
+        search_entry = ttk.Entry(left_frame, textvariable=self.account_search_var, style="Dark.TEntry")
+        search_entry.pack(fill="x", pady=(0, 6))
+        self.account_search_var.trace_add("write", lambda *args: self.on_account_search_changed())
+        search_entry.bind("<Escape>", lambda e: self.account_search_var.set(""))
 
         selectmode = tk.EXTENDED if self.settings.get("enable_multi_select", False) else tk.SINGLE
         
-        self.account_list = tk.Listbox(
-            list_frame,
+        self.account_list = VirtualAccountList(
+            left_frame,
             bg=self.BG_LIGHT,
             fg=self.FG_TEXT,
             selectbackground=self.FG_ACCENT,
-            highlightthickness=0,
-            border=0,
             font=("Segoe UI", 10),
-            width=20,
             selectmode=selectmode,
-            relief="flat",
-            activestyle="none",
+            status_fg=self.FG_SECONDARY
         )
-        self.account_list.pack(side="left", fill="both", expand=True)
-
-        scrollbar = ttk.Scrollbar(list_frame, command=self.account_list.yview)
-        scrollbar.pack(side="right", fill="y")
-        self.account_list.config(yscrollcommand=scrollbar.set)
+        self.account_list.pack(fill="both", expand=True)
         
         self.drag_data = {
             "item": None, 
-            "index": None, 
             "start_x": 0, 
             "start_y": 0,
             "dragging": False,
@@ -340,10 +395,22 @@ class AccountManagerUI:
         self.refresh_accounts()
         self.refresh_game_list()
         self.update_game_name_on_startup()
+        self.root.after(1000, self.refresh_account_status)
         
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
         
-        threading.Thread(target=self.check_for_updates, daemon=True).start()
+        self.tasks.submit('network', self.check_for_updates)
+    
+    def confirm_auto_rejoin_relaunch(self, stale):
+        """Ask before relaunching auto-rejoin accounts whose client was closed while the manager was off"""
+        if not stale:
+            return
+        names = "\n".join(stale[:10]) + (f"\n... and {len(stale) - 10} more" if len(stale) > 10 else "")
+        if messagebox.askyesno(
+            "Resume Auto-Rejoin",
+            f"Auto-rejoin was running for {len(stale)} account(s) whose Roblox client is no longer open:\n\n{names}\n\nRelaunch them now?"
+        ):
+            self.tasks.submit('network', self.auto_rejoin.relaunch_stale)
     
     def on_closing(self):
         """Handle application closing - restore installers and exit"""
@@ -354,16 +421,26 @@ class AccountManagerUI:
         }
         self.save_settings(force_immediate=True)
         
-        if hasattr(self, 'anti_afk_stop_event'):
+        if hasattr(self, 'anti_afk'):
             self.stop_anti_afk()
         
         if hasattr(self, 'rename_stop_event'):
             self.stop_rename_monitoring()
         
-        if hasattr(self, 'auto_rejoin_threads'):
-            self.stop_all_auto_rejoin()
+        if hasattr(self, 'auto_rejoin'):
+            self.auto_rejoin.shutdown()
         
+        if hasattr(self, 'window_index'):
+            self.window_index.stop()
+        
+        self.tasks.shutdown()
         RobloxAPI.restore_installers()
+        
+        if self.app_logging:
+            app_logging = self.app_logging
+            self.app_logging = None
+            app_logging.close()
+        
         self.root.destroy()
 
     def load_settings(self):
@@ -414,6 +491,16 @@ class AccountManagerUI:
         
         if self.settings.get("enable_multi_roblox", False):
             self.root.after(100, self.initialize_multi_roblox)
+        
+        self.apply_browser_settings()
+
+    def apply_browser_settings(self):
+        """Push browser request-blocking settings to the account manager"""
+        self.manager.block_resources = self.settings.get("browser_block_resources", True)
+        self.manager.measure_page_load = self.settings.get("browser_measure_page_load", False)
+        blocked_urls = self.settings.get("browser_blocked_urls")
+        if isinstance(blocked_urls, list) and blocked_urls:
+            self.manager.blocked_url_patterns = list(blocked_urls)
 
     def apply_window_icon(self, window):
         if self.icon_path and os.path.exists(self.icon_path):
@@ -450,7 +537,7 @@ class AccountManagerUI:
                 
                 if latest_parts > current_parts:
                     print(f"[WARNING] New version available: {latest_version}")
-                    self.root.after(0, lambda: self.show_update_notification(latest_version))
+                    self.tasks.call_ui(lambda: self.show_update_notification(latest_version))
                 else:
                     print(f"[SUCCESS] You are on the latest version ({self.APP_VERSION})")
             else:
@@ -977,6 +1064,10 @@ del /f /q "%~f0"
 
     def save_settings(self, force_immediate=False):
         """Save UI settings to file with debouncing"""
+        if threading.current_thread() is not threading.main_thread():
+            # Called from a worker (e.g. auto-rejoin), the Tk timer has to be set on the Tk thread
+            self.tasks.call_ui(self.save_settings, force_immediate, key="save_settings")
+            return
         if self._save_settings_timer is not None:
             try:
                 self.root.after_cancel(self._save_settings_timer)
@@ -985,18 +1076,37 @@ del /f /q "%~f0"
             self._save_settings_timer = None
         
         def do_save():
+            self._save_settings_timer = None
+            self._settings_generation += 1
             try:
-                with open(self.settings_file, 'w') as f:
-                    json.dump(self.settings, f, indent=2)
+                with self.settings_lock:
+                    data = json.dumps(self.settings, indent=2)
             except Exception as e:
                 print(f"[ERROR] Failed to save settings: {e}")
-            self._save_settings_timer = None
+                return
+            if force_immediate:
+                self._write_settings(data, self._settings_generation)
+            else:
+                self.tasks.submit('disk', self._write_settings, data, self._settings_generation, key="save_settings")
         
         if force_immediate:
             do_save()
         else:
             self._save_settings_timer = self.root.after(500, do_save)
 
+    def _write_settings(self, data, generation):
+        """Write serialized settings, skipped when a newer save has been requested since"""
+        with self._settings_write_lock:
+            if generation != self._settings_generation:
+                return
+            try:
+                temp_file = self.settings_file + ".tmp"
+                with open(temp_file, 'w') as f:
+                    f.write(data)
+                os.replace(temp_file, self.settings_file)
+            except Exception as e:
+                print(f"[ERROR] Failed to save settings: {e}")
+
     def is_chrome_installed(self):
         """Best-effort check to see if Google Chrome is installed (Windows)."""
         try:
@@ -1078,43 +1188,14 @@ del /f /q "%~f0"
     
     def update_game_name_from_id(self, place_id):
         """Update game name label from a specific place ID (without reading from text box)"""
-        if self._game_name_after_id is not None:
-            try:
-                self.root.after_cancel(self._game_name_after_id)
-            except Exception:
-                pass
-            self._game_name_after_id = None
-
-        def schedule_fetch():
-            if not place_id or not place_id.isdigit():
-                self.game_name_label.config(text="")
-                return
-
-            def worker(pid):
-                name = RobloxAPI.get_game_name(pid)
-                if name:
-                    max_name_length = 20
-                    if len(name) > max_name_length:
-                        name = name[:max_name_length-2] + ".."
-                    display_text = f"Current: {name}"
-                else:
-                    display_text = ""
-                
-                def update_label(text=display_text):
-                    try:
-                        self.game_name_label.config(text=text)
-                    except:
-                        pass
-                
-                self.root.after(0, update_label)
-
-            threading.Thread(target=worker, args=(place_id,), daemon=True).start()
-
-        self._game_name_after_id = self.root.after(350, schedule_fetch)
-    
+        self._schedule_game_name_fetch(lambda: place_id)
 
     def update_game_name(self):
         """Debounced, non-blocking update of the game name label"""
+        self._schedule_game_name_fetch(lambda: self.place_entry.get().strip())
+
+    def _schedule_game_name_fetch(self, get_place_id):
+        """Debounce, then look up the game name; only the latest lookup updates the label"""
         if self._game_name_after_id is not None:
             try:
                 self.root.after_cancel(self._game_name_after_id)
@@ -1123,13 +1204,14 @@ del /f /q "%~f0"
             self._game_name_after_id = None
 
         def schedule_fetch():
-            place_id = self.place_entry.get().strip()
+            self._game_name_after_id = None
+            place_id = get_place_id()
             if not place_id or not place_id.isdigit():
+                self.tasks.cancel("game_name")
                 self.game_name_label.config(text="")
                 return
 
-            def worker(pid):
-                name = RobloxAPI.get_game_name(pid)
+            def update_label(name):
                 if name:
                     max_name_length = 20
                     if len(name) > max_name_length:
@@ -1137,16 +1219,12 @@ del /f /q "%~f0"
                     display_text = f"Current: {name}"
                 else:
                     display_text = ""
-                
-                def update_label(text=display_text):
-                    try:
-                        self.game_name_label.config(text=text)
-                    except:
-                        pass
-                
-                self.root.after(0, update_label)
+                try:
+                    self.game_name_label.config(text=display_text)
+                except:
+                    pass
 
-            threading.Thread(target=worker, args=(place_id,), daemon=True).start()
+            self.tasks.submit('network', RobloxAPI.get_game_name, place_id, key="game_name", on_result=update_label)
 
         self._game_name_after_id = self.root.after(350, schedule_fetch)
 
@@ -1213,34 +1291,97 @@ del /f /q "%~f0"
             messagebox.showinfo("Success", "Game removed from list!")
 
     def refresh_accounts(self):
-        """Refresh the account list"""
-        self.account_list.delete(0, tk.END)
-        for username, data in self.manager.accounts.items():
-            note = data.get('note', '') if isinstance(data, dict) else ''
-            display_text = f"{username}"
-            if note:
-                display_text += f" • {note}"
-            self.account_list.insert(tk.END, display_text)
+        """Refresh the account list, only changed rows are redrawn"""
+        self.account_list.set_accounts(self.manager.accounts)
+    
+    def refresh_account_status(self):
+        """Single timer for the status column: pull changed badges, poll presence when due"""
+        try:
+            pids = {}
+            for record in self.process_registry.records():
+                if record.account:
+                    pids[record.account] = record.pid
+            self.account_status.sync_pids(pids)
+            
+            interval = self.settings.get("account_status_refresh_seconds", 60)
+            if interval and time.time() - self._last_status_poll >= interval:
+                self._last_status_poll = time.time()
+                self.tasks.submit('network', self._poll_account_presence, key="account_status_poll")
+            
+            dirty = self.account_status.take_dirty()
+            if dirty:
+                self.account_list.set_badges({username: self.account_status.badge(username) for username in dirty})
+        except Exception as e:
+            print(f"[ERROR] Account status refresh failed: {e}")
+        
+        self.root.after(1000, self.refresh_account_status)
+    
+    def _poll_account_presence(self):
+        """Batched presence lookup for every account with a known user ID"""
+        self.account_status.expire_stale()
+        
+        accounts_by_user_id = {}
+        for username, data in list(self.manager.accounts.items()):
+            if isinstance(data, dict) and data.get('user_id'):
+                accounts_by_user_id.setdefault(str(data['user_id']), []).append(username)
+        if not accounts_by_user_id:
+            return
+        
+        cookie_owner = None
+        for usernames in accounts_by_user_id.values():
+            for username in usernames:
+                status = self.account_status.get(username)
+                if status is None or status['valid'] is not False:
+                    cookie_owner = username
+                    break
+            if cookie_owner:
+                break
+        cookie = self.manager.get_account_cookie(cookie_owner) if cookie_owner else None
+        if not cookie:
+            return
+        
+        user_ids = list(accounts_by_user_id.keys())
+        status_logger.debug("Polling presence for %s user(s) with %s's cookie", len(user_ids), cookie_owner)
+        for start in range(0, len(user_ids), self.ACCOUNT_STATUS_BATCH_SIZE):
+            wait = RobloxAPI.request_budget.try_acquire()
+            if wait > 0:
+                status_logger.debug("Presence poll deferred, request budget free in %.1fs", wait)
+                return
+            batch = user_ids[start:start + self.ACCOUNT_STATUS_BATCH_SIZE]
+            presences, status_code, _ = RobloxAPI.get_presences_with_status(batch, cookie)
+            if status_code == 401:
+                status_logger.warning("[WARNING] Presence poll cookie was rejected, marking %s invalid", cookie_owner, extra={'account': cookie_owner})
+                self.account_status.set_validation(cookie_owner, False)
+                return
+            if status_code != 200:
+                status_logger.info("Presence poll stopped, API returned status %s", status_code)
+                return
+            status_logger.debug("Presence batch of %s user(s), %s returned", len(batch), len(presences))
+            for user_id, presence in presences.items():
+                for username in accounts_by_user_id.get(user_id, []):
+                    self.account_status.update_presence(username, presence, validated=username == cookie_owner)
+    
+    def on_account_search_changed(self):
+        """Filter the account list shortly after typing stops"""
+        if self._account_search_after_id:
+            self.root.after_cancel(self._account_search_after_id)
+        self._account_search_after_id = self.root.after(
+            120, lambda: self.account_list.set_filter(self.account_search_var.get())
+        )
     
     def on_drag_start(self, event):
         """Initiate drag - store position and wait for hold"""
-        widget = event.widget
-        index = widget.nearest(event.y)
+        username = self.account_list.username_at(event.y)
         
         if self.drag_data["hold_timer"]:
             self.root.after_cancel(self.drag_data["hold_timer"])
         
-        if index >= 0:
-            self.drag_data["index"] = index
-            self.drag_data["item"] = widget.get(index)
+        if username is not None:
+            self.drag_data["item"] = username
             self.drag_data["start_x"] = event.x
             self.drag_data["start_y"] = event.y
             self.drag_data["dragging"] = False
             
-            if not self.settings.get("enable_multi_select", False):
-                widget.selection_clear(0, tk.END)
-                widget.selection_set(index)
-            
             self.drag_data["hold_timer"] = self.root.after(500, lambda: self.activate_drag(event))
     
     def activate_drag(self, event):
@@ -1256,7 +1397,7 @@ del /f /q "%~f0"
             
             label = tk.Label(
                 self.drag_indicator,
-                text=self.drag_data["item"],
+                text=self.account_list.labels.get(self.drag_data["item"], self.drag_data["item"]),
                 bg=self.BG_LIGHT,
                 fg=self.FG_TEXT,
                 font=("Segoe UI", 10),
@@ -1273,47 +1414,46 @@ del /f /q "%~f0"
     
     def on_drag_motion(self, event):
         """Handle drag motion, show indicator and highlight drop position"""
-        if self.drag_data["hold_timer"] and self.drag_data["index"] is not None:
+        if self.drag_data["hold_timer"] and self.drag_data["item"] is not None:
             dx = abs(event.x - self.drag_data["start_x"])
             dy = abs(event.y - self.drag_data["start_y"])
             if dx > 5 or dy > 5:
                 self.root.after_cancel(self.drag_data["hold_timer"])
                 self.drag_data["hold_timer"] = None
         
-        if not self.drag_data["dragging"] or self.drag_data["index"] is None:
+        if not self.drag_data["dragging"] or self.drag_data["item"] is None:
             return
         
-        widget = event.widget
-        
         if self.drag_indicator:
             x = event.x_root + 10
             y = event.y_root + 10
             self.drag_indicator.geometry(f"+{x}+{y}")
         
-        index = widget.nearest(event.y)
-        if index >= 0:
-            if not self.settings.get("enable_multi_select", False):
-                widget.selection_clear(0, tk.END)
-            widget.selection_set(index)
+        if event.y < 0:
+            self.account_list.yview("scroll", -1, "units")
+        elif event.y > self.account_list.listbox.winfo_height():
+            self.account_list.yview("scroll", 1, "units")
+        
+        target = self.account_list.username_at(event.y)
+        self.account_list.set_drop_target(target if target != self.drag_data["item"] else None)
     
     def on_drag_release(self, event):
-        """Release drag and reorder accounts"""
+        """Release drag and move the account to the row it was dropped on"""
         try:
             if self.drag_data["hold_timer"]:
                 self.root.after_cancel(self.drag_data["hold_timer"])
                 self.drag_data["hold_timer"] = None
             
-            if not self.drag_data["dragging"] or self.drag_data["index"] is None:
+            if not self.drag_data["dragging"] or self.drag_data["item"] is None:
                 return
             
-            widget = event.widget
-            drop_index = widget.nearest(event.y)
-            drag_index = self.drag_data["index"]
+            username = self.drag_data["item"]
+            target = self.account_list.username_at(event.y)
             
-            if drop_index >= 0 and drag_index != drop_index:
+            if target is not None and target != username and username in self.manager.accounts:
                 ordered_usernames = list(self.manager.accounts.keys())
-                
-                username = ordered_usernames.pop(drag_index)
+                drop_index = ordered_usernames.index(target)
+                ordered_usernames.remove(username)
                 ordered_usernames.insert(drop_index, username)
                 
                 new_accounts = {}
@@ -1324,18 +1464,15 @@ del /f /q "%~f0"
                 self.manager.save_accounts()
                 
                 self.refresh_accounts()
-                
-                if not self.settings.get("enable_multi_select", False):
-                    widget.selection_clear(0, tk.END)
-                    widget.selection_set(drop_index)
+                self.account_list.select(username)
         finally:
+            self.account_list.set_drop_target(None)
             if self.drag_indicator:
                 self.drag_indicator.destroy()
                 self.drag_indicator = None
             
             self.drag_data = {
                 "item": None, 
-                "index": None, 
                 "start_x": 0, 
                 "start_y": 0,
                 "dragging": False,
@@ -1344,27 +1481,21 @@ del /f /q "%~f0"
     
     def get_selected_username(self):
         """Get the currently selected username"""
-        selection = self.account_list.curselection()
+        selection = self.account_list.selected_usernames()
         if not selection:
             messagebox.showwarning("No Selection", "Please select an account first.")
             return None
         
-        display_text = self.account_list.get(selection[0])
-        username = display_text.split(' • ')[0]
-        return username
+        if self.account_list.anchor in selection:
+            return self.account_list.anchor
+        return selection[0]
     
     def get_selected_usernames(self):
         """Get all selected usernames (for multi-select mode)"""
-        selections = self.account_list.curselection()
-        if not selections:
+        usernames = self.account_list.selected_usernames()
+        if not usernames:
             messagebox.showwarning("No Selection", "Please select at least one account first.")
             return []
-        
-        usernames = []
-        for index in selections:
-            display_text = self.account_list.get(index)
-            username = display_text.split(' • ')[0]
-            usernames.append(username)
         return usernames
 
     def add_account(self):
@@ -1391,12 +1522,11 @@ del /f /q "%~f0"
             """
             try:
                 success = self.manager.add_account(1, "https://www.roblox.com/login", "", browser_path)
-                self.root.after(0, lambda: self._add_account_complete(success))
+                self.tasks.call_ui(lambda: self._add_account_complete(success))
             except Exception as e:
-                self.root.after(0, lambda: self._add_account_error(str(e)))
+                self.tasks.call_ui(lambda: self._add_account_error(str(e)))
         
-        thread = threading.Thread(target=add_account_thread, daemon=True)
-        thread.start()
+        self.tasks.submit('browser', add_account_thread)
     
     def _add_account_complete(self, success):
         """
@@ -1421,7 +1551,7 @@ del /f /q "%~f0"
         import_window = tk.Toplevel(self.root)
         self.apply_window_icon(import_window)
         import_window.title("Import Cookie")
-        import_window.geometry("450x250")
+        import_window.geometry("450x320")
         import_window.configure(bg=self.BG_DARK)
         import_window.resizable(False, False)
         
@@ -1432,8 +1562,8 @@ del /f /q "%~f0"
         main_height = self.root.winfo_height()
         
         x = main_x + (main_width - 450) // 2
-        y = main_y + (main_height - 250) // 2
-        import_window.geometry(f"450x250+{x}+{y}")
+        y = main_y + (main_height - 320) // 2
+        import_window.geometry(f"450x320+{x}+{y}")
         
         if self.settings.get("enable_topmost", False):
             import_window.attributes("-topmost", True)
@@ -1470,6 +1600,61 @@ del /f /q "%~f0"
         cookie_scrollbar.pack(side="right", fill="y")
         cookie_text.config(yscrollcommand=cookie_scrollbar.set)
         
+        status_label = ttk.Label(main_frame, text="", style="Dark.TLabel", font=("Segoe UI", 8))
+        status_label.pack(anchor="w", pady=(0, 5))
+        
+        def load_text(text):
+            cookie_text.delete("1.0", "end")
+            cookie_text.insert("1.0", text)
+        
+        def load_from_file():
+            path = filedialog.askopenfilename(
+                parent=import_window,
+                title="Select Cookie File",
+                filetypes=[("Cookie files", "*.txt *.csv *.json"), ("All files", "*.*")]
+            )
+            if not path:
+                return
+            try:
+                load_text(CookieImporter.read_file(path))
+                status_label.config(text=f"Loaded {os.path.basename(path)}")
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to read file:\n{e}", parent=import_window)
+        
+        def load_from_clipboard():
+            try:
+                load_text(self.root.clipboard_get())
+                status_label.config(text="Loaded clipboard contents")
+            except tk.TclError:
+                messagebox.showwarning("Clipboard Empty", "The clipboard does not contain text.", parent=import_window)
+        
+        def finish_import(results):
+            import_button.config(state="normal")
+            CookieImporter.print_report(results)
+            self.refresh_accounts()
+            
+            counts = CookieImporter.summarize(results)
+            imported_count = counts.get('imported', 0) + counts.get('updated', 0)
+            skipped_count = counts.get('exists', 0) + counts.get('duplicate', 0)
+            failed_count = counts.get('failed', 0) + counts.get('invalid_format', 0)
+            imported_accounts = [r['username'] for r in results if r['status'] in ('imported', 'updated')]
+            
+            if imported_count == 1 and failed_count == 0 and skipped_count == 0:
+                messagebox.showinfo("Success", f"Account '{imported_accounts[0]}' imported successfully!")
+                import_window.destroy()
+                return
+            
+            summary = f"Imported: {imported_count}\nSkipped (already saved/duplicate): {skipped_count}\nFailed: {failed_count}"
+            if failed_count == 0 and imported_count > 0:
+                messagebox.showinfo("Success", summary)
+                import_window.destroy()
+            elif imported_count == 0 and skipped_count == 0:
+                messagebox.showerror("Error", f"{summary}\n\nCheck the console for a per-line report.", parent=import_window)
+                status_label.config(text="")
+            else:
+                messagebox.showwarning("Import Finished", f"{summary}\n\nCheck the console for a per-line report.", parent=import_window)
+                status_label.config(text="")
+        
         def do_import():
             cookie_input = cookie_text.get("1.0", "end-1c").strip()
             
@@ -1477,55 +1662,49 @@ del /f /q "%~f0"
                 messagebox.showwarning("Missing Information", "Please enter the cookie(s).")
                 return
             
-            cookies = []
-            if "_|WARNING:-" in cookie_input:
-                parts = cookie_input.split("_|WARNING:-")
-                for part in parts:
-                    if part.strip():
-                        cookies.append("_|WARNING:-" + part.strip())
-            else:
-                cookies = [cookie_input]
+            import_button.config(state="disabled")
+            status_label.config(text="Verifying cookies...")
             
-            imported_count = 0
-            failed_count = 0
-            imported_accounts = []
+            def on_progress(done, total):
+                self.tasks.call_ui(lambda: status_label.config(text=f"Verifying cookies... {done}/{total}"), key="cookie_import_progress")
             
-            for cookie in cookies:
+            def worker():
                 try:
-                    success, username = self.manager.import_cookie_account(cookie)
-                    if success:
-                        imported_count += 1
-                        imported_accounts.append(username)
-                    else:
-                        failed_count += 1
+                    results = CookieImporter(self.manager).run(cookie_input, progress_callback=on_progress)
                 except Exception as e:
-                    failed_count += 1
-                    print(f"[ERROR] Failed to import cookie: {e}")
-            
-            self.refresh_accounts()
+                    print(f"[ERROR] Bulk import failed: {e}")
+                    results = []
+                self.tasks.call_ui(lambda: finish_import(results))
             
-            if imported_count > 0:
-                if imported_count == 1:
-                    messagebox.showinfo("Success", f"Account '{imported_accounts[0]}' imported successfully!")
-                else:
-                    messagebox.showinfo("Success", f"Successfully imported {imported_count} account(s)!\n\n{', '.join(imported_accounts)}")
-                import_window.destroy()
-            
-            if failed_count > 0:
-                if imported_count == 0:
-                    messagebox.showerror("Error", f"Failed to import {failed_count} cookie(s). Please check the cookies.")
-                else:
-                    messagebox.showwarning("Partial Success", f"Imported {imported_count} account(s), but {failed_count} failed.")
+            self.tasks.submit('network', worker)
+        
+        source_frame = ttk.Frame(main_frame, style="Dark.TFrame")
+        source_frame.pack(fill="x", pady=(0, 5))
+        
+        ttk.Button(
+            source_frame,
+            text="From File...",
+            style="Dark.TButton",
+            command=load_from_file
+        ).pack(side="left", fill="x", expand=True, padx=(0, 5))
+        
+        ttk.Button(
+            source_frame,
+            text="From Clipboard",
+            style="Dark.TButton",
+            command=load_from_clipboard
+        ).pack(side="left", fill="x", expand=True, padx=(5, 0))
         
         button_frame = ttk.Frame(main_frame, style="Dark.TFrame")
         button_frame.pack(fill="x")
         
-        ttk.Button(
+        import_button = ttk.Button(
             button_frame,
             text="Import",
             style="Dark.TButton",
             command=do_import
-        ).pack(side="left", fill="x", expand=True, padx=(0, 5))
+        )
+        import_button.pack(side="left", fill="x", expand=True, padx=(0, 5))
         
         ttk.Button(
             button_frame,
@@ -1772,7 +1951,7 @@ del /f /q "%~f0"
                 success = self.manager.add_account(amount, website, javascript, browser_path)
                 
                 if success:
-                    self.root.after(0, lambda: [
+                    self.tasks.call_ui(lambda: [
                         self.refresh_accounts(),
                         messagebox.showinfo(
                             "Success",
@@ -1780,19 +1959,18 @@ del /f /q "%~f0"
                         )
                     ])
                 else:
-                    self.root.after(0, lambda: messagebox.showerror(
+                    self.tasks.call_ui(lambda: messagebox.showerror(
                         "Error",
                         "Failed to add accounts. Please check the console for details."
                     ))
                 
             except Exception as e:
-                self.root.after(0, lambda: messagebox.showerror(
+                self.tasks.call_ui(lambda: messagebox.showerror(
                     "Error",
                     f"Failed to launch browsers: {str(e)}"
                 ))
         
-        thread = threading.Thread(target=launch_thread, daemon=True)
-        thread.start()
+        self.tasks.submit('browser', launch_thread)
 
     def remove_account(self):
         """Remove the selected account(s)"""
@@ -1825,6 +2003,7 @@ del /f /q "%~f0"
         username = self.get_selected_username()
         if username:
             is_valid = self.manager.validate_account(username)
+            self.account_status.set_validation(username, is_valid)
             if is_valid:
                 messagebox.showinfo("Validation", f"Account '{username}' is valid! ✓")
             else:
@@ -1933,16 +2112,11 @@ del /f /q "%~f0"
 
     def show_account_context_menu(self, event):
         """Show context menu on right-click"""
-        index = self.account_list.nearest(event.y)
-        if index < 0:
+        username = self.account_list.username_at(event.y)
+        if username is None:
             return
         
-        self.account_list.selection_clear(0, tk.END)
-        self.account_list.selection_set(index)
-        self.account_list.activate(index)
-        
-        display_text = self.account_list.get(index)
-        username = display_text.split(' • ')[0]
+        self.account_list.select(username, see=False)
         account = self.manager.accounts.get(username)
         
         if not account:
@@ -2049,6 +2223,26 @@ del /f /q "%~f0"
             )
         password_btn.pack(fill="x", padx=2, pady=1)
         
+        def open_in_browser():
+            self.hide_account_context_menu()
+            self.open_account_in_browser(username)
+        
+        browser_btn = tk.Button(
+            self.account_context_menu,
+            text="Open in Browser",
+            anchor="w",
+            relief="flat",
+            bg=self.BG_MID,
+            fg=self.FG_TEXT,
+            activebackground=self.BG_LIGHT,
+            activeforeground=self.FG_TEXT,
+            font=("Segoe UI", 9),
+            bd=0,
+            highlightthickness=0,
+            command=open_in_browser
+        )
+        browser_btn.pack(fill="x", padx=2, pady=1)
+        
         self.account_context_menu.geometry(f"+{event.x_root}+{event.y_root}")
         self.account_context_menu.update_idletasks()
         
@@ -2058,6 +2252,31 @@ del /f /q "%~f0"
         self.account_context_menu.bind("<FocusOut>", lambda e: self.hide_account_context_menu())
         self.root.bind("<Button-1>", lambda e: self.hide_account_context_menu(), add="+")
     
+    def open_account_in_browser(self, username):
+        """Open roblox.com in a browser signed in as the account (non-blocking)"""
+        browser_path, browser_name = self.get_browser_path()
+        
+        if not browser_path:
+            messagebox.showwarning(
+                "Browser Required",
+                "Open in Browser requires a browser.\n\n"
+                "Please either:\n"
+                "• Install Google Chrome, or\n"
+                "• Download Chromium in Settings → Tools → Browser Engine"
+            )
+            return
+        
+        def worker():
+            try:
+                success = self.manager.open_browser_session(username, browser_path)
+            except Exception as e:
+                print(f"[ERROR] Failed to open browser for {username}: {e}")
+                success = False
+            if not success:
+                self.tasks.call_ui(lambda: messagebox.showerror("Error", f"Failed to open a browser session for {username}."))
+        
+        self.tasks.submit('browser', worker)
+    
     def hide_account_context_menu(self):
         """Hide the account context menu"""
         if hasattr(self, 'account_context_menu') and self.account_context_menu is not None:
@@ -2107,9 +2326,9 @@ del /f /q "%~f0"
                 else:
                     messagebox.showerror("Error", "Failed to launch Roblox.")
             
-            self.root.after(0, on_done)
+            self.tasks.call_ui(on_done)
 
-        threading.Thread(target=worker, args=(usernames,), daemon=True).start()
+        self.tasks.submit('process', worker, usernames)
 
     def launch_game(self):
         """Launch Roblox game with the selected account(s)"""
@@ -2188,9 +2407,9 @@ del /f /q "%~f0"
                 else:
                     messagebox.showerror("Error", "Failed to launch Roblox.")
 
-            self.root.after(0, on_done)
+            self.tasks.call_ui(on_done)
 
-        threading.Thread(target=worker, args=(usernames, game_id, private_server), daemon=True).start()
+        self.tasks.submit('process', worker, usernames, game_id, private_server)
 
     def open_auto_rejoin(self):
         """Open the auto-rejoin management window (like favorites window)"""
@@ -2209,7 +2428,7 @@ del /f /q "%~f0"
         else:
             x = self.root.winfo_x() + 50
             y = self.root.winfo_y() + 50
-        auto_rejoin_window.geometry(f"480x420+{x}+{y}")
+        auto_rejoin_window.geometry(f"780x440+{x}+{y}")
         
         auto_rejoin_window.focus_force()
         
@@ -2229,32 +2448,81 @@ del /f /q "%~f0"
         list_frame.grid_rowconfigure(0, weight=1)
         list_frame.grid_columnconfigure(0, weight=1)
         
-        rejoin_list = tk.Listbox(
-            list_frame,
-            bg=self.BG_LIGHT,
-            fg=self.FG_TEXT,
-            selectbackground=self.FG_ACCENT,
-            highlightthickness=0,
-            border=0,
-            font=("Segoe UI", 9),
-            relief="flat",
-            activestyle="none"
-        )
+        columns = ("state", "place", "in_game", "rejoins", "launch", "presence", "requests", "cadence", "error")
+        headings = {
+            "state": ("State", 90),
+            "place": ("Place", 90),
+            "in_game": ("In Game", 70),
+            "rejoins": ("Rejoins", 55),
+            "launch": ("Launch", 60),
+            "presence": ("Presence", 65),
+            "requests": ("Requests", 65),
+            "cadence": ("Every", 50),
+            "error": ("Last Error", 160)
+        }
+        rejoin_list = ttk.Treeview(list_frame, columns=columns, style="Dark.Treeview", selectmode="browse")
+        rejoin_list.heading("#0", text="Account", anchor="w")
+        rejoin_list.column("#0", width=110, anchor="w")
+        for column in columns:
+            text, width = headings[column]
+            rejoin_list.heading(column, text=text, anchor="w")
+            rejoin_list.column(column, width=width, anchor="w", stretch=(column == "error"))
         rejoin_list.grid(row=0, column=0, sticky="nsew")
         
         v_scrollbar = ttk.Scrollbar(list_frame, command=rejoin_list.yview, orient="vertical")
         v_scrollbar.grid(row=0, column=1, sticky="ns")
         rejoin_list.config(yscrollcommand=v_scrollbar.set)
         
+        def format_duration(seconds):
+            if seconds is None:
+                return "-"
+            seconds = int(seconds)
+            if seconds >= 3600:
+                return f"{seconds // 3600}h {seconds % 3600 // 60}m"
+            if seconds >= 60:
+                return f"{seconds // 60}m {seconds % 60}s"
+            return f"{seconds}s"
+        
+        def format_latency(seconds):
+            return "-" if seconds is None else f"{seconds:.1f}s" if seconds >= 1 else f"{seconds * 1000:.0f}ms"
+        
         def refresh_rejoin_list():
-            rejoin_list.delete(0, tk.END)
+            metrics = self.auto_rejoin.metrics_snapshot()
+            existing = set(rejoin_list.get_children())
             for account, config in self.auto_rejoin_configs.items():
-                is_active = account in self.auto_rejoin_threads and self.auto_rejoin_threads[account].is_alive()
-                status = "[ACTIVE]" if is_active else "[INACTIVE]"
-                place_id = config.get('place_id', 'Unknown')
-                display = f"{account} - {status} - Place: {place_id}"
-                rejoin_list.insert(tk.END, display)
-        refresh_rejoin_list()
+                entry = metrics.get(account) or {}
+                is_active = self.auto_rejoin.is_active(account)
+                requests_info = entry.get('requests', {})
+                values = (
+                    entry.get('state', '').upper() if is_active else "INACTIVE",
+                    config.get('place_id', 'Unknown'),
+                    format_duration(entry.get('time_in_game')) if entry else "-",
+                    entry.get('rejoins', 0),
+                    format_latency(entry.get('avg_launch_latency')),
+                    format_latency(entry.get('avg_presence_latency')),
+                    f"{requests_info.get('presence', 0)}/{requests_info.get('rate_limited', 0)}",
+                    format_duration(entry.get('interval')) if is_active else "-",
+                    entry.get('last_error') or ""
+                )
+                if account in existing:
+                    rejoin_list.item(account, values=values)
+                    existing.discard(account)
+                else:
+                    rejoin_list.insert("", tk.END, iid=account, text=account, values=values)
+            for account in existing:
+                rejoin_list.delete(account)
+        
+        def schedule_refresh():
+            if not auto_rejoin_window.winfo_exists():
+                return
+            refresh_rejoin_list()
+            auto_rejoin_window.after(2000, schedule_refresh)
+        
+        def get_selected_rejoin_account():
+            selection = rejoin_list.selection()
+            return selection[0] if selection else None
+        
+        schedule_refresh()
         
         btn_frame = ttk.Frame(main_frame, style="Dark.TFrame")
         btn_frame.pack(fill="x")
@@ -2396,13 +2664,11 @@ del /f /q "%~f0"
         
         def edit_auto_rejoin():
             """Edit selected auto-rejoin config"""
-            selection = rejoin_list.curselection()
-            if not selection:
+            account = get_selected_rejoin_account()
+            if not account:
                 messagebox.showwarning("No Selection", "Please select an account to edit.")
                 return
             
-            accounts_list = list(self.auto_rejoin_configs.keys())
-            account = accounts_list[selection[0]]
             config = self.auto_rejoin_configs[account]
             
             edit_window = tk.Toplevel(auto_rejoin_window)
@@ -2504,14 +2770,11 @@ del /f /q "%~f0"
         
         def remove_auto_rejoin():
             """Remove selected auto-rejoin config"""
-            selection = rejoin_list.curselection()
-            if not selection:
+            account = get_selected_rejoin_account()
+            if not account:
                 messagebox.showwarning("No Selection", "Please select an account to remove.")
                 return
             
-            accounts_list = list(self.auto_rejoin_configs.keys())
-            account = accounts_list[selection[0]]
-            
             if messagebox.askyesno("Confirm", f"Remove auto-rejoin for {account}?"):
                 self.stop_auto_rejoin_for_account(account)
                 del self.auto_rejoin_configs[account]
@@ -2521,15 +2784,12 @@ del /f /q "%~f0"
         
         def start_selected():
             """Start auto-rejoin for selected account"""
-            selection = rejoin_list.curselection()
-            if not selection:
+            account = get_selected_rejoin_account()
+            if not account:
                 messagebox.showwarning("No Selection", "Please select an account to start.")
                 return
             
-            accounts_list = list(self.auto_rejoin_configs.keys())
-            account = accounts_list[selection[0]]
-            
-            self._match_pids_to_accounts([account])
+            self.auto_rejoin.match_pids([account])
             
             self.start_auto_rejoin_for_account(account)
             
@@ -2538,13 +2798,10 @@ del /f /q "%~f0"
         
         def stop_selected():
             """Stop auto-rejoin for selected account"""
-            selection = rejoin_list.curselection()
-            if not selection:
+            account = get_selected_rejoin_account()
+            if not account:
                 messagebox.showwarning("No Selection", "Please select an account to stop.")
                 return
-            
-            accounts_list = list(self.auto_rejoin_configs.keys())
-            account = accounts_list[selection[0]]
             self.stop_auto_rejoin_for_account(account)
             refresh_rejoin_list()
             messagebox.showinfo("Stopped", f"Auto-rejoin stopped for {account}!")
@@ -2553,7 +2810,7 @@ del /f /q "%~f0"
             """Start auto-rejoin for all accounts"""
             accounts = list(self.auto_rejoin_configs.keys())
             
-            self._match_pids_to_accounts(accounts)
+            self.auto_rejoin.match_pids(accounts)
             
             for account in accounts:
                 self.start_auto_rejoin_for_account(account)
@@ -2563,8 +2820,7 @@ del /f /q "%~f0"
         
         def stop_all():
             """Stop auto-rejoin for all accounts"""
-            for account in list(self.auto_rejoin_threads.keys()):
-                self.stop_auto_rejoin_for_account(account)
+            self.stop_all_auto_rejoin()
             refresh_rejoin_list()
             messagebox.showinfo("Stopped", "Auto-rejoin stopped for all accounts!")
         
@@ -2670,7 +2926,7 @@ del /f /q "%~f0"
                 
                 user_id = RobloxAPI.get_user_id_from_username(target_user)
                 if not user_id:
-                    self.root.after(0, lambda: messagebox.showerror(
+                    self.tasks.call_ui(lambda: messagebox.showerror(
                         "Error",
                         f"User '{target_user}' not found."
                     ))
@@ -2681,7 +2937,7 @@ del /f /q "%~f0"
                     account_cookie = account_cookie.get('cookie')
                 
                 if not account_cookie:
-                    self.root.after(0, lambda: messagebox.showerror(
+                    self.tasks.call_ui(lambda: messagebox.showerror(
                         "Error",
                         "Failed to get account cookie."
                     ))
@@ -2690,14 +2946,14 @@ del /f /q "%~f0"
                 presence = RobloxAPI.get_player_presence(user_id, account_cookie)
                 
                 if not presence:
-                    self.root.after(0, lambda: messagebox.showerror(
+                    self.tasks.call_ui(lambda: messagebox.showerror(
                         "Error",
                         f"Failed to get presence for '{target_user}'. Please try again."
                     ))
                     return
                 
                 if not presence.get('in_game'):
-                    self.root.after(0, lambda: messagebox.showinfo(
+                    self.tasks.call_ui(lambda: messagebox.showinfo(
                         "Not In Game",
                         f"'{target_user}' is not currently in a game.\n\nStatus: {presence.get('last_location', 'Unknown')}"
                     ))
@@ -2707,7 +2963,7 @@ del /f /q "%~f0"
                 game_id = str(presence.get('game_id', ''))
                 
                 if not place_id:
-                    self.root.after(0, lambda: messagebox.showerror(
+                    self.tasks.call_ui(lambda: messagebox.showerror(
                         "Error",
                         f"Could not get game info for '{target_user}'."
                     ))
@@ -2744,9 +3000,9 @@ del /f /q "%~f0"
                     else:
                         messagebox.showerror("Error", "Failed to launch Roblox.")
                 
-                self.root.after(0, on_done)
+                self.tasks.call_ui(on_done)
             
-            threading.Thread(target=worker, args=(usernames, target_username), daemon=True).start()
+            self.tasks.submit('process', worker, usernames, target_username)
         
         button_frame = ttk.Frame(main_frame, style="Dark.TFrame")
         button_frame.pack(fill="x")
@@ -2855,9 +3111,9 @@ del /f /q "%~f0"
                     else:
                         messagebox.showerror("Error", "Failed to launch Roblox.")
                 
-                self.root.after(0, on_done)
+                self.tasks.call_ui(on_done)
             
-            threading.Thread(target=worker, args=(usernames, place_id, job_id), daemon=True).start()
+            self.tasks.submit('process', worker, usernames, place_id, job_id)
         
         button_frame = ttk.Frame(main_frame, style="Dark.TFrame")
         button_frame.pack(fill="x")
@@ -2904,7 +3160,7 @@ del /f /q "%~f0"
             game_id = RobloxAPI.get_smallest_server(pid)
             
             if not game_id:
-                self.root.after(0, lambda: messagebox.showerror(
+                self.tasks.call_ui(lambda: messagebox.showerror(
                     "Error",
                     f"Could not find any available servers for place {pid}.\n\nPlease try again later or check the Place ID."
                 ))
@@ -2943,109 +3199,42 @@ del /f /q "%~f0"
                 else:
                     messagebox.showerror("Error", "Failed to launch Roblox.")
             
-            self.root.after(0, on_done)
+            self.tasks.call_ui(on_done)
         
-        threading.Thread(target=worker, args=(usernames, place_id), daemon=True).start()
+        self.tasks.submit('process', worker, usernames, place_id)
 
-    def _close_roblox_handles(self, handle_path):
-        """Close ROBLOX_singletonEvent handles for all running Roblox processes using handle64.exe"""
+    def _close_roblox_handles(self):
+        """Close ROBLOX_singletonEvent handles for all running Roblox processes"""
+        if not self.handle_closer:
+            return False
         try:
-            result = subprocess.run(['tasklist', '/FI', 'IMAGENAME eq RobloxPlayerBeta.exe'], 
-                                  capture_output=True, text=True, encoding='utf-8', errors='replace', creationflags=subprocess.CREATE_NO_WINDOW)
-            
-            if not (result.stdout and 'RobloxPlayerBeta.exe' in result.stdout):
-                return True
-            
-            pids = []
-            for line in result.stdout.split('\n'):
-                match = re.search(r'RobloxPlayerBeta\.exe\s+(\d+)', line)
-                if match:
-                    pids.append(match.group(1))
-            
-            for pid in pids:
-                try:
-                    cmd = f'"{handle_path}" -accepteula -p {pid} -a'
-                    proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
-                                        stdin=subprocess.DEVNULL, text=True, shell=True, timeout=5)
-                    
-                    for line in proc.stdout.splitlines():
-                        if "ROBLOX_singletonEvent" in line:
-                            m = re.search(r'([0-9A-F]+):\s.*ROBLOX_singletonEvent', line, re.IGNORECASE)
-                            if m:
-                                handle_id = m.group(1)
-                                close_cmd = f'"{handle_path}" -accepteula -p {pid} -c {handle_id} -y'
-                                subprocess.run(close_cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
-                                            stdin=subprocess.DEVNULL, shell=True, timeout=5)
-                                print(f"[INFO] Closed ROBLOX_singletonEvent handle for PID:{pid}")
-                                break
-                except Exception as e:
-                    print(f"[WARNING] Could not close handle for PID:{pid} - {str(e)}")
-            
+            for pid in self.process_registry.get_pids(max_age=0):
+                self._handle64_close_handles([pid])
             return True
         except Exception as e:
             print(f"[WARNING] Error closing handles: {str(e)}")
             return False
 
-    def _handle64_monitor_thread(self):
-        target = "robloxplayerbeta.exe"
-        known = set()
-        
-        while self.handle64_monitoring and self.handle64_path:
-            try:
-                current = {
-                    p.info["pid"]
-                    for p in psutil.process_iter(["pid", "name"])
-                    if p.info["name"] and p.info["name"].lower() == target
-                }
-                new = current - known
-                if new:
-                    threading.Thread(target=self._handle64_close_handles, args=(list(new),), daemon=True).start()
-                    known |= new
-                    for pid in new:
-                        print(f"[INFO] Roblox process created PID:{pid}")
-                
-                known -= (known - current)
-                
-                time.sleep(0.4)
-                    
-            except Exception as e:
-                print(f"[WARNING] Handle64 monitor error: {str(e)}")
-                time.sleep(1.0)
+    def _on_handle64_process_event(self, event, record):
+        """Close the singleton handle of every new Roblox process reported by the registry"""
+        if event != 'added' or not self.handle64_monitoring or not self.handle_closer:
+            return
+        print(f"[INFO] Roblox process created PID:{record.pid}")
+        self.tasks.submit('handles', self._handle64_close_handles, [record.pid])
 
     def _handle64_close_handles(self, new_pids):
-        """Closes ROBLOX_singletonEvent handles for the given PIDs using handle64.exe"""
-        HANDLE = self.handle64_path
-        
+        """Closes ROBLOX_singletonEvent handles for the given PIDs"""
+        closer = self.handle_closer
+        if not closer:
+            return
         for pid in new_pids:
-            handle_value = None
-            handle_found = False
+            record = self.process_registry.get(pid)
             try:
-                for attempt in range(5):
-                    cmd = f'"{HANDLE}" -accepteula -p {pid} -a'
-                    proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
-                                        stdin=subprocess.DEVNULL, text=True, shell=True)
-                    lines = proc.stdout.splitlines()
-                    for line in lines:
-                        if "ROBLOX_singletonEvent" in line:
-                            m = re.search(r"([0-9A-F]+):.*ROBLOX_singletonEvent", line, re.IGNORECASE)
-                            if m:
-                                handle_value = m.group(1)
-                                break
-                            else:
-                                possible = re.findall(r"\b[0-9A-F]{4,}\b", line)
-                                if possible:
-                                    handle_value = possible[0]
-                                    break
-                    if handle_value:
-                        handle_found = True
-                        break
-                    time.sleep(1)
-                if not handle_value:
+                closed, backend, elapsed = closer.close_singleton(pid, record.create_time if record else None)
+                if closed:
+                    print(f"[SUCCESS] Closed handle event for PID:{pid} ({backend}, {elapsed * 1000:.0f}ms)")
+                else:
                     print(f"[FAILED] Handle not closed for PID:{pid}")
-                if handle_found:
-                    subprocess.run(f'"{HANDLE}" -accepteula -p {pid} -c {handle_value} -y',
-                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, stdin=subprocess.DEVNULL, shell=True)
-                    print(f"[SUCCESS] Closed handle event for PID:{pid}")
             except Exception:
                 print(f"[FAILED] Handle not closed for PID:{pid}")
 
@@ -3128,20 +3317,19 @@ del /f /q "%~f0"
                     use_handle64 = False
                 
                 if use_handle64:
-                    handle64_path = self._find_handle64_exe()
-                    if handle64_path:
-                        print("[INFO] handle64.exe found. Using advanced multi-roblox mode.")
-                        self.handle64_path = handle64_path
+                    self.handle64_path = self._find_handle64_exe()
+                    closer = create_default_closer(self.handle64_path)
+                    if closer.available:
+                        print(f"[INFO] Using advanced multi-roblox mode (handle backends: {closer.describe()}).")
+                        self.handle_closer = closer
                         
                         self.handle64_monitoring = True
-                        self.handle64_monitor_thread = threading.Thread(
-                            target=self._handle64_monitor_thread,
-                            daemon=True
-                        )
-                        self.handle64_monitor_thread.start()
+                        self.process_registry.subscribe(self._on_handle64_process_event, replay=True)
+                        self.process_registry.acquire("handle64", 0.4)
                         print("[INFO] Handle64 monitor started.")
                     else:
-                        print("[INFO] handle64.exe not found. Falling back to default method.")
+                        print("[INFO] No handle backend available. Falling back to default method.")
+                        self.handle64_path = None
                         use_handle64 = False
             
             if not use_handle64:
@@ -3203,10 +3391,10 @@ del /f /q "%~f0"
         try:
             if self.handle64_monitoring:
                 self.handle64_monitoring = False
-                if self.handle64_monitor_thread:
-                    self.handle64_monitor_thread.join(timeout=2.0)
-                self.handle64_monitor_thread = None
+                self.process_registry.release("handle64")
+                self.process_registry.unsubscribe(self._on_handle64_process_event)
                 self.handle64_path = None
+                self.handle_closer = None
                 print("[INFO] Handle64 monitor stopped.")
             
             if self.multi_roblox_handle:
@@ -3382,7 +3570,7 @@ del /f /q "%~f0"
             style="Dark.TRadiobutton"
         )
         handle_radio.pack(anchor="w", pady=(0, 15))
-        handle_radio.bind("<Enter>", lambda e: show_tooltip(e, "Uses handle64.exe to close handles.\nAllows multi-roblox with running instances.\nRequires administrator permission!"))
+        handle_radio.bind("<Enter>", lambda e: show_tooltip(e, "Closes the singleton handle of each new client in-process.\nhandle64.exe is used as a fallback if downloaded.\nAllows multi-roblox with running instances.\nRequires administrator permission!"))
         handle_radio.bind("<Leave>", hide_tooltip)
         
         status_frame = tk.Frame(
@@ -3448,12 +3636,6 @@ del /f /q "%~f0"
         
         def save_method():
             selected = method_var.get()
-            if selected == "handle64" and not os.path.exists(handle64_path):
-                messagebox.showwarning(
-                    "handle64 Not Available",
-                    "Please download handle64.exe first."
-                )
-                return
             
             was_active = self.multi_roblox_handle is not None
             
@@ -3666,9 +3848,9 @@ del /f /q "%~f0"
         def on_multi_select_toggle():
             self.settings["enable_multi_select"] = multi_select_var.get()
             if multi_select_var.get():
-                self.account_list.config(selectmode=tk.EXTENDED)
+                self.account_list.set_selectmode(tk.EXTENDED)
             else:
-                self.account_list.config(selectmode=tk.SINGLE)
+                self.account_list.set_selectmode(tk.SINGLE)
             self.save_settings()
         
         topmost_check = ttk.Checkbutton(
@@ -4065,6 +4247,23 @@ del /f /q "%~f0"
             command=on_anti_afk_toggle
         ).pack(anchor="w", pady=2)
         
+        background_input_var = tk.BooleanVar(value=self.settings.get("anti_afk_delivery", "foreground") == "background")
+        
+        def on_background_input_toggle():
+            self.settings["anti_afk_delivery"] = "background" if background_input_var.get() else "foreground"
+            self.save_settings()
+            if self.anti_afk and self.anti_afk.is_running():
+                self.stop_anti_afk()
+                self.start_anti_afk()
+        
+        ttk.Checkbutton(
+            roblox_frame,
+            text="Background Input (don't switch windows)",
+            variable=background_input_var,
+            style="Dark.TCheckbutton",
+            command=on_background_input_toggle
+        ).pack(anchor="w", pady=2)
+        
         settings_frame = ttk.Frame(roblox_frame, style="Dark.TFrame")
         settings_frame.pack(fill="x", pady=(5, 0))
         
@@ -4396,7 +4595,7 @@ del /f /q "%~f0"
             
             settings_window.configure(bg=self.BG_DARK)
             
-            self.account_list.configure(
+            self.account_list.configure_colors(
                 bg=self.BG_MID,
                 fg=self.FG_TEXT,
                 selectbackground=self.FG_ACCENT
@@ -4659,6 +4858,13 @@ del /f /q "%~f0"
             command=switch_encryption_method
         ).pack(fill="x", pady=(0, 5))
         
+        ttk.Button(
+            tool_frame,
+            text="Export / Backup Accounts",
+            style="Dark.TButton",
+            command=self.open_export_window
+        ).pack(fill="x", pady=(0, 5))
+        
         ttk.Button(
             tool_frame,
             text="Browser Engine",
@@ -4680,42 +4886,174 @@ del /f /q "%~f0"
             command=wipe_data
         ).pack(side="bottom", fill="x", pady=(10, 0))
     
-    def open_browser_engine_window(self):
-        """Open Browser Engine selection window"""
-        browser_window = tk.Toplevel(self.root)
-        self.apply_window_icon(browser_window)
-        browser_window.title("Browser Engine Settings")
-        browser_window.geometry("420x330")
-        browser_window.configure(bg=self.BG_DARK)
-        browser_window.resizable(False, False)
-        browser_window.transient(self.root)
+    def open_export_window(self):
+        """Open the account export / backup window"""
+        export_window = tk.Toplevel(self.root)
+        self.apply_window_icon(export_window)
+        export_window.title("Export / Backup Accounts")
+        export_window.geometry("420x360")
+        export_window.configure(bg=self.BG_DARK)
+        export_window.resizable(False, False)
+        export_window.transient(self.root)
         
         if self.settings.get("enable_topmost", False):
-            browser_window.attributes("-topmost", True)
+            export_window.attributes("-topmost", True)
         
-        browser_window.update_idletasks()
-        x = self.root.winfo_x() + (self.root.winfo_width() // 2) - (browser_window.winfo_width() // 2)
-        y = self.root.winfo_y() + (self.root.winfo_height() // 2) - (browser_window.winfo_height() // 2)
-        browser_window.geometry(f"+{x}+{y}")
+        export_window.update_idletasks()
+        x = self.root.winfo_x() + (self.root.winfo_width() - 420) // 2
+        y = self.root.winfo_y() + (self.root.winfo_height() - 360) // 2
+        export_window.geometry(f"+{x}+{y}")
         
-        current_browser = self.settings.get("browser_type", "chrome")
-        browser_var = tk.StringVar(value=current_browser)
-        chrome_installed = self.is_chrome_installed()
-        chromium_path = os.path.join(self.data_folder, "Chromium", "chrome-win64", "chrome.exe")
-        chromium_installed = os.path.exists(chromium_path)
+        exporter = VaultExporter(self.manager)
+        state = exporter.load_state()
         
-        container = ttk.Frame(browser_window, style="Dark.TFrame")
-        container.pack(fill="both", expand=True, padx=20, pady=20)
+        main_frame = ttk.Frame(export_window, style="Dark.TFrame")
+        main_frame.pack(fill="both", expand=True, padx=20, pady=15)
         
-        header_frame = ttk.Frame(container, style="Dark.TFrame")
-        header_frame.pack(fill="x", pady=(0, 15))
+        export_style = ttk.Style()
+        export_style.configure("Dark.TRadiobutton", background=self.BG_DARK, foreground=self.FG_TEXT, font=("Segoe UI", 9))
+        export_style.map("Dark.TRadiobutton", background=[("active", self.BG_DARK)], foreground=[("active", self.FG_TEXT)])
+        export_style.configure("Dark.TCheckbutton", background=self.BG_DARK, foreground="white", font=("Segoe UI", 10))
         
         ttk.Label(
-            header_frame,
-            text="Select Browser Engine",
+            main_frame,
+            text="Export / Backup Accounts",
             style="Dark.TLabel",
-            font=(self.FONT_FAMILY, 11, "bold")
-        ).pack(anchor="w")
+            font=("Segoe UI", 12, "bold")
+        ).pack(anchor="w", pady=(0, 5))
+        
+        last_backup = state.get("last_backup_time")
+        ttk.Label(
+            main_frame,
+            text=f"Last backup: {last_backup}" if last_backup else "No previous backup",
+            style="Dark.TLabel",
+            font=("Segoe UI", 8)
+        ).pack(anchor="w", pady=(0, 10))
+        
+        selected = self.account_list.selected_usernames()
+        scope_var = tk.StringVar(value="selected" if len(selected) > 0 else "all")
+        
+        scope_frame = ttk.Frame(main_frame, style="Dark.TFrame")
+        scope_frame.pack(fill="x", pady=(0, 5))
+        ttk.Radiobutton(scope_frame, text="All accounts", variable=scope_var, value="all", style="Dark.TRadiobutton").pack(side="left")
+        ttk.Radiobutton(scope_frame, text=f"Selected ({len(selected)})", variable=scope_var, value="selected", style="Dark.TRadiobutton").pack(side="left", padx=(10, 0))
+        
+        ttk.Label(main_frame, text="Only accounts whose note contains (optional):", style="Dark.TLabel").pack(anchor="w", pady=(5, 3))
+        note_entry = ttk.Entry(main_frame, style="Dark.TEntry")
+        note_entry.pack(fill="x", pady=(0, 8))
+        
+        ttk.Label(main_frame, text="Archive password:", style="Dark.TLabel").pack(anchor="w", pady=(0, 3))
+        password_entry = ttk.Entry(main_frame, style="Dark.TEntry", show="*")
+        password_entry.pack(fill="x", pady=(0, 5))
+        confirm_entry = ttk.Entry(main_frame, style="Dark.TEntry", show="*")
+        confirm_entry.pack(fill="x", pady=(0, 8))
+        
+        incremental_var = tk.BooleanVar(value=bool(last_backup))
+        ttk.Checkbutton(
+            main_frame,
+            text="Incremental (only changes since last backup)",
+            variable=incremental_var,
+            style="Dark.TCheckbutton"
+        ).pack(anchor="w", pady=(0, 10))
+        
+        def do_export():
+            password = password_entry.get()
+            if not password:
+                messagebox.showwarning("Missing Password", "Please enter an archive password.", parent=export_window)
+                return
+            if password != confirm_entry.get():
+                messagebox.showerror("Password Mismatch", "Passwords do not match.", parent=export_window)
+                return
+            
+            usernames = self.account_list.selected_usernames() if scope_var.get() == "selected" else None
+            if scope_var.get() == "selected" and not usernames:
+                messagebox.showwarning("No Selection", "No accounts are selected.", parent=export_window)
+                return
+            
+            kind = "incremental" if incremental_var.get() else "full"
+            path = filedialog.asksaveasfilename(
+                parent=export_window,
+                title="Save Backup",
+                defaultextension=".rambak",
+                initialfile=f"accounts_{kind}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.rambak",
+                filetypes=[("Account backup", "*.rambak"), ("All files", "*.*")]
+            )
+            if not path:
+                return
+            
+            def on_exported(summary):
+                print(f"[SUCCESS] Exported {summary['written']} account(s) to {path} ({kind}, {summary['unchanged']} unchanged, {summary['deleted']} deleted)")
+                if not export_window.winfo_exists():
+                    return
+                messagebox.showinfo(
+                    "Export Complete",
+                    f"Written: {summary['written']}\nUnchanged: {summary['unchanged']}\nDeleted: {summary['deleted']}",
+                    parent=export_window
+                )
+                export_window.destroy()
+            
+            def on_failed(e):
+                print(f"[ERROR] Export failed: {e}")
+                if not export_window.winfo_exists():
+                    return
+                export_button.config(state="normal")
+                messagebox.showerror("Export Failed", f"Failed to export accounts:\n{e}", parent=export_window)
+            
+            export_button.config(state="disabled")
+            self.tasks.submit(
+                'disk',
+                exporter.export,
+                path,
+                password,
+                usernames=usernames,
+                note_filter=note_entry.get().strip() or None,
+                incremental=incremental_var.get(),
+                on_result=on_exported,
+                on_error=on_failed
+            )
+        
+        button_frame = ttk.Frame(main_frame, style="Dark.TFrame")
+        button_frame.pack(fill="x", side="bottom")
+        export_button = ttk.Button(button_frame, text="Export", style="Dark.TButton", command=do_export)
+        export_button.pack(side="left", fill="x", expand=True, padx=(0, 5))
+        ttk.Button(button_frame, text="Cancel", style="Dark.TButton", command=export_window.destroy).pack(side="left", fill="x", expand=True, padx=(5, 0))
+    
+    def open_browser_engine_window(self):
+        """Open Browser Engine selection window"""
+        browser_window = tk.Toplevel(self.root)
+        self.apply_window_icon(browser_window)
+        browser_window.title("Browser Engine Settings")
+        browser_window.geometry("420x390")
+        browser_window.configure(bg=self.BG_DARK)
+        browser_window.resizable(False, False)
+        browser_window.transient(self.root)
+        
+        if self.settings.get("enable_topmost", False):
+            browser_window.attributes("-topmost", True)
+        
+        browser_window.update_idletasks()
+        x = self.root.winfo_x() + (self.root.winfo_width() // 2) - (browser_window.winfo_width() // 2)
+        y = self.root.winfo_y() + (self.root.winfo_height() // 2) - (browser_window.winfo_height() // 2)
+        browser_window.geometry(f"+{x}+{y}")
+        
+        current_browser = self.settings.get("browser_type", "chrome")
+        browser_var = tk.StringVar(value=current_browser)
+        chrome_installed = self.is_chrome_installed()
+        chromium_path = os.path.join(self.data_folder, "Chromium", "chrome-win64", "chrome.exe")
+        chromium_installed = os.path.exists(chromium_path)
+        
+        container = ttk.Frame(browser_window, style="Dark.TFrame")
+        container.pack(fill="both", expand=True, padx=20, pady=20)
+        
+        header_frame = ttk.Frame(container, style="Dark.TFrame")
+        header_frame.pack(fill="x", pady=(0, 15))
+        
+        ttk.Label(
+            header_frame,
+            text="Select Browser Engine",
+            style="Dark.TLabel",
+            font=(self.FONT_FAMILY, 11, "bold")
+        ).pack(anchor="w")
         
         ttk.Label(
             header_frame,
@@ -4847,7 +5185,7 @@ del /f /q "%~f0"
                     chromium_dir = os.path.join(self.data_folder, "Chromium")
                     os.makedirs(chromium_dir, exist_ok=True)
                     
-                    browser_window.after(0, lambda: status_label.config(text="Fetching latest version..."))
+                    self.tasks.call_ui(lambda: status_label.config(text="Fetching latest version..."))
                     last_change_url = "https://storage.googleapis.com/chromium-browser-snapshots/Win_x64/LAST_CHANGE"
                     last_change_response = requests.get(last_change_url, timeout=30)
                     if last_change_response.status_code != 200:
@@ -4855,7 +5193,7 @@ del /f /q "%~f0"
                     build_number = last_change_response.text.strip()
                     
                     download_url = f"https://storage.googleapis.com/chromium-browser-snapshots/Win_x64/{build_number}/chrome-win.zip"
-                    browser_window.after(0, lambda: status_label.config(text=f"Downloading build {build_number}..."))
+                    self.tasks.call_ui(lambda: status_label.config(text=f"Downloading build {build_number}..."))
                     zip_path = os.path.join(chromium_dir, "chromium.zip")
                     
                     response = requests.get(download_url, stream=True, timeout=60)
@@ -4872,11 +5210,11 @@ del /f /q "%~f0"
                                     progress = int((downloaded / total_size) * 100)
                                     if progress >= last_progress + 1:
                                         last_progress = progress
-                                        browser_window.after(10, lambda p=progress: update_progress(p))
+                                        self.tasks.call_ui(lambda p=progress: update_progress(p), key="browser_download_progress")
                     
-                    browser_window.after(0, lambda: update_progress(100))
-                    browser_window.after(0, lambda: status_label.config(text="Extracting Chromium..."))
-                    browser_window.after(50, lambda: update_progress(0))
+                    self.tasks.call_ui(lambda: update_progress(100))
+                    self.tasks.call_ui(lambda: status_label.config(text="Extracting Chromium..."))
+                    self.tasks.call_ui(lambda: update_progress(0))
                     
                     with zipfile.ZipFile(zip_path, 'r') as zip_ref:
                         file_list = zip_ref.namelist()
@@ -4885,9 +5223,9 @@ del /f /q "%~f0"
                             zip_ref.extract(file, chromium_dir)
                             if i % 50 == 0:
                                 progress = int((i / total_files) * 100)
-                                browser_window.after(0, lambda p=progress: update_progress(p))
+                                self.tasks.call_ui(lambda p=progress: update_progress(p), key="browser_download_progress")
                     
-                    browser_window.after(0, lambda: update_progress(100))
+                    self.tasks.call_ui(lambda: update_progress(100))
                     
                     extracted_folder = os.path.join(chromium_dir, "chrome-win")
                     target_folder = os.path.join(chromium_dir, "chrome-win64")
@@ -4896,8 +5234,8 @@ del /f /q "%~f0"
                     
                     os.remove(zip_path)
                     
-                    browser_window.after(0, lambda: status_label.config(text="Downloading ChromeDriver..."))
-                    browser_window.after(50, lambda: update_progress(0))
+                    self.tasks.call_ui(lambda: status_label.config(text="Downloading ChromeDriver..."))
+                    self.tasks.call_ui(lambda: update_progress(0))
                     
                     chromedriver_url = f"https://storage.googleapis.com/chromium-browser-snapshots/Win_x64/{build_number}/chromedriver_win32.zip"
                     chromedriver_zip_path = os.path.join(chromium_dir, "chromedriver.zip")
@@ -4916,16 +5254,16 @@ del /f /q "%~f0"
                                     progress = int((cd_downloaded / cd_total_size) * 100)
                                     if progress >= cd_last_progress + 1:
                                         cd_last_progress = progress
-                                        browser_window.after(10, lambda p=progress: update_progress(p))
+                                        self.tasks.call_ui(lambda p=progress: update_progress(p), key="browser_download_progress")
                     
-                    browser_window.after(0, lambda: update_progress(100))
-                    browser_window.after(0, lambda: status_label.config(text="Extracting ChromeDriver..."))
-                    browser_window.after(50, lambda: update_progress(0))
+                    self.tasks.call_ui(lambda: update_progress(100))
+                    self.tasks.call_ui(lambda: status_label.config(text="Extracting ChromeDriver..."))
+                    self.tasks.call_ui(lambda: update_progress(0))
                     
                     with zipfile.ZipFile(chromedriver_zip_path, 'r') as zip_ref:
                         zip_ref.extractall(chromium_dir)
                     
-                    browser_window.after(0, lambda: update_progress(100))
+                    self.tasks.call_ui(lambda: update_progress(100))
                     
                     chromedriver_extracted = os.path.join(chromium_dir, "chromedriver-win32", "chromedriver.exe")
                     chromedriver_target = os.path.join(target_folder, "chromedriver.exe")
@@ -4947,7 +5285,7 @@ del /f /q "%~f0"
                             status_label.config(text="Failed to extract Chromium.")
                         progress_outer.pack_forget()
                     
-                    browser_window.after(0, update_ui)
+                    self.tasks.call_ui(update_ui)
                     
                 except Exception as download_error:
                     error_msg = str(download_error)
@@ -4955,10 +5293,9 @@ del /f /q "%~f0"
                         download_btn.config(state="normal", text="Download Chromium")
                         progress_outer.pack_forget()
                         status_label.config(text=f"Download failed: {error_msg[:50]}...")
-                    browser_window.after(0, show_error)
+                    self.tasks.call_ui(show_error)
             
-            thread = threading.Thread(target=do_download, daemon=True)
-            thread.start()
+            self.tasks.submit('network', do_download)
         
         if not chromium_installed:
             download_btn = ttk.Button(
@@ -4999,7 +5336,40 @@ del /f /q "%~f0"
             self.save_settings()
         
         browser_var.trace_add("write", on_browser_change)
-        
+
+        block_resources_var = tk.BooleanVar(value=self.settings.get("browser_block_resources", True))
+        measure_var = tk.BooleanVar(value=self.settings.get("browser_measure_page_load", False))
+
+        def on_blocking_toggle():
+            self.settings["browser_block_resources"] = block_resources_var.get()
+            self.settings["browser_measure_page_load"] = measure_var.get()
+            self.apply_browser_settings()
+            self.save_settings()
+
+        checkbox_style = ttk.Style()
+        checkbox_style.configure(
+            "Dark.TCheckbutton",
+            background=self.BG_DARK,
+            foreground="white",
+            font=("Segoe UI", 10)
+        )
+
+        ttk.Checkbutton(
+            options_frame,
+            text="Block trackers, fonts and images on login",
+            variable=block_resources_var,
+            style="Dark.TCheckbutton",
+            command=on_blocking_toggle
+        ).pack(anchor="w", pady=(0, 2))
+
+        ttk.Checkbutton(
+            options_frame,
+            text="Log page load stats to console",
+            variable=measure_var,
+            style="Dark.TCheckbutton",
+            command=on_blocking_toggle
+        ).pack(anchor="w")
+
         ttk.Button(
             container,
             text="Close",
@@ -5007,9 +5377,31 @@ del /f /q "%~f0"
             command=browser_window.destroy
         ).pack(fill="x", pady=(10, 0))
         
+    def setup_logging(self):
+        """Route print output through the logging queue to rotating files in AccountManagerData/logs"""
+        try:
+            app_logging = AppLogging(
+                os.path.join(self.data_folder, "logs"),
+                max_bytes=int(self.settings.get("log_max_bytes", 2 * 1024 * 1024)),
+                backup_count=int(self.settings.get("log_backup_count", 5)),
+                level=self.settings.get("log_level", "INFO"),
+                component_levels=self.settings.get("log_levels", {})
+            )
+            app_logging.add_console(self.log_to_console)
+            app_logging.start()
+            self.log_stream = PrintStream(app_logging)
+            self.app_logging = app_logging
+            if self.app_logging.file_error:
+                print(f"[WARNING] Could not open log file: {self.app_logging.file_error}")
+        except Exception as e:
+            self.app_logging = None
+            print(f"[WARNING] Could not set up logging: {e}")
+    
     def write(self, text):
-        """Redirect stdout/stderr writes to console"""
-        if text.strip():
+        """Redirect stdout/stderr writes to the log pipeline"""
+        if self.app_logging:
+            self.log_stream.write(text)
+        elif text.strip():
             timestamp = datetime.now().strftime("%H:%M:%S")
             self.log_to_console(f"[{timestamp}] {text}\n")
         if self.original_stdout:
@@ -5021,21 +5413,47 @@ del /f /q "%~f0"
             self.original_stdout.flush()
     
     def log_to_console(self, message):
-        """Log message to console output buffer"""
-        self.console_output.append(message)
+        """Log message to console output buffer, safe to call from any thread"""
+        with self.console_lock:
+            self.console_output.append(message)
+            self.console_queue.put(message)
+    
+    def _drain_console_queue(self):
+        """Insert queued console messages in one batch on the Tk thread"""
+        messages = []
+        try:
+            while True:
+                messages.append(self.console_queue.get_nowait())
+        except queue.Empty:
+            pass
         
-        if self.console_text_widget:
+        if messages and self.console_text_widget:
             try:
-                self.console_text_widget.config(state="normal")
-                self.console_text_widget.insert(tk.END, message)
-                self._apply_console_tags()
-                self.console_text_widget.see(tk.END)
-                self.console_text_widget.config(state="disabled")
+                widget = self.console_text_widget
+                widget.config(state="normal")
+                start = widget.index("end-1c")
+                widget.insert(tk.END, "".join(messages))
+                self._apply_console_tags(start)
+                self._trim_console_widget()
+                widget.see(tk.END)
+                widget.config(state="disabled")
             except:
                 pass
+        
+        try:
+            self.root.after(self.CONSOLE_DRAIN_MS, self._drain_console_queue)
+        except:
+            pass
     
-    def _apply_console_tags(self):
-        """Apply color tags to console keywords"""
+    def _trim_console_widget(self):
+        """Drop the oldest lines so the widget never holds more than the ring buffer"""
+        line_count = int(self.console_text_widget.index("end-1c").split(".")[0])
+        excess = line_count - self.CONSOLE_MAX_LINES
+        if excess > 0:
+            self.console_text_widget.delete("1.0", f"{excess + 1}.0")
+    
+    def _apply_console_tags(self, start="1.0"):
+        """Apply color tags to console keywords from start to the end of the widget"""
         if not self.console_text_widget:
             return
         
@@ -5047,7 +5465,7 @@ del /f /q "%~f0"
         }
         
         for keyword, tag in keywords.items():
-            search_start = "1.0"
+            search_start = start
             while True:
                 pos = self.console_text_widget.search(keyword, search_start, tk.END, nocase=False)
                 if not pos:
@@ -5122,11 +5540,18 @@ del /f /q "%~f0"
         scrollbar.pack(side="right", fill="y")
         self.console_text_widget.config(yscrollcommand=scrollbar.set)
         
-        self.console_text_widget.config(state="normal")
-        for message in self.console_output:
-            self.console_text_widget.insert(tk.END, message)
+        with self.console_lock:
+            try:
+                while True:
+                    self.console_queue.get_nowait()
+            except queue.Empty:
+                pass
+            backlog = "".join(self.console_output)
         
+        self.console_text_widget.config(state="normal")
+        self.console_text_widget.insert(tk.END, backlog)
         self._apply_console_tags()
+        self._trim_console_widget()
         self.console_text_widget.config(state="disabled")
         
         self.console_text_widget.see(tk.END)
@@ -5135,7 +5560,8 @@ del /f /q "%~f0"
         button_frame.pack(fill="x", pady=(10, 0))
         
         def clear_console():
-            self.console_output.clear()
+            with self.console_lock:
+                self.console_output.clear()
             self.console_text_widget.config(state="normal") 
             self.console_text_widget.delete(1.0, tk.END)
             self.console_text_widget.config(state="disabled") 
@@ -5495,6 +5921,8 @@ del /f /q "%~f0"
             command=favorites_window.destroy
         ).pack(side="left", fill="x", expand=True, padx=(2, 0))
     
+    RENAME_TIMEOUT_SECONDS = 120
+    
     def start_rename_monitoring(self):
         """Start monitoring and renaming Roblox windows"""
         if self.rename_thread and self.rename_thread.is_alive():
@@ -5502,140 +5930,155 @@ del /f /q "%~f0"
         
         self.rename_stop_event.clear()
         self.renamed_pids.clear()
+        self.window_index.start()
         self.rename_thread = threading.Thread(target=self._rename_monitoring_worker, daemon=True)
         self.rename_thread.start()
+        self.process_registry.subscribe(self._on_rename_process_event, replay=True)
+        self.process_registry.acquire("rename", 1.0)
         print("[INFO] Rename monitoring started")
     
     def stop_rename_monitoring(self):
         """Stop rename monitoring"""
         if self.rename_thread:
             self.rename_stop_event.set()
+            self.rename_wake_event.set()
+            self.process_registry.release("rename")
+            self.process_registry.unsubscribe(self._on_rename_process_event)
             self.rename_thread = None
+            with self.rename_lock:
+                self.rename_pending.clear()
             self.renamed_pids.clear()
             print("[INFO] Rename monitoring stopped")
     
-    def _rename_monitoring_worker(self):
-        """Monitor for new Roblox PIDs and renames them"""
-        import psutil
+    def _on_rename_process_event(self, event, record):
+        """Queue new Roblox processes for renaming"""
+        with self.rename_lock:
+            if event == 'added':
+                if record.pid not in self.renamed_pids:
+                    self.rename_pending[record.pid] = time.time()
+            else:
+                self.rename_pending.pop(record.pid, None)
+                self.renamed_pids.discard(record.pid)
+        self.rename_wake_event.set()
+    
+    def _resolve_rename_username(self, user_id):
+        """
+        Returns (username, saved) for a user ID, looked up in the saved accounts
+        Users that are not saved are only looked up on the API with rename_lookup_unknown_users on
+        """
+        with self.settings_lock:
+            user_id_cache = dict(self.settings.get('user_id_cache') or {})
+        username = self.manager.find_username_by_user_id(user_id, user_id_cache)
+        if username:
+            return username, True
+        if not self.settings.get('rename_lookup_unknown_users', False):
+            return None, False
+        key = str(user_id)
+        if key not in self.rename_name_cache:
+            username = RobloxAPI.get_username_from_user_id(user_id)
+            if not username:
+                return None, False
+            self.rename_name_cache[key] = username
+        return self.rename_name_cache[key], False
+    
+    def _try_rename_pid(self, pid):
+        """Returns True once the PID is handled, False while its log header or window is not there yet"""
+        record = self.process_registry.get(pid)
+        if record is None:
+            return True
+        
+        user_id = record.user_id or self.log_index.user_id_for_process(record.create_time)[0]
+        if not user_id:
+            return False
+        
+        username, saved = self._resolve_rename_username(user_id)
+        if not username:
+            # Nothing to name an unsaved client with unless the API lookup is on and may still succeed
+            return not self.settings.get('rename_lookup_unknown_users', False)
+        
+        if saved and record.account is None:
+            self.process_registry.set_account(pid, username, user_id)
         
+        if self._rename_roblox_window(pid, username):
+            print(f"[INFO] Renamed Roblox window for PID {pid} to '{username}'")
+            return True
+        return False
+    
+    def _rename_monitoring_worker(self):
+        """Rename windows of queued PIDs, polling only while some are still waiting for a log header or window"""
         while not self.rename_stop_event.is_set():
-            try:
-                current_pids = set()
-                for proc in psutil.process_iter(['pid', 'name']):
-                    try:
-                        if proc.info['name'].lower() == 'robloxplayerbeta.exe':
-                            current_pids.add(proc.info['pid'])
-                    except (psutil.NoSuchProcess, psutil.AccessDenied):
-                        continue
-                
-                new_pids = current_pids - self.renamed_pids
-                
-                for pid in new_pids:
-                    if self.rename_stop_event.is_set():
-                        break
-                    
-                    user_id, _ = self._get_user_id_from_pid(pid)
-                    
-                    if user_id:
-                        username = RobloxAPI.get_username_from_user_id(user_id)
-                        
-                        if username:
-                            self._rename_roblox_window(pid, username)
-                            self.renamed_pids.add(pid)
-                            print(f"[INFO] Renamed Roblox window for PID {pid} to '{username}'")
-                    
-                    time.sleep(0.5)
-                
-                self.renamed_pids = self.renamed_pids.intersection(current_pids)
-                
-            except Exception as e:
-                print(f"[ERROR] Error in rename monitoring: {e}")
+            with self.rename_lock:
+                pending = dict(self.rename_pending)
+            
+            if not pending:
+                self.rename_wake_event.wait()
+                self.rename_wake_event.clear()
+                continue
             
-            time.sleep(2)
+            now = time.time()
+            for pid, first_seen in pending.items():
+                if self.rename_stop_event.is_set():
+                    break
+                try:
+                    done = self._try_rename_pid(pid)
+                except Exception as e:
+                    print(f"[ERROR] Error in rename monitoring: {e}")
+                    done = False
+                
+                if done or now - first_seen > self.RENAME_TIMEOUT_SECONDS:
+                    if not done:
+                        print(f"[WARNING] Could not rename Roblox window for PID {pid}")
+                    with self.rename_lock:
+                        self.rename_pending.pop(pid, None)
+                        self.renamed_pids.add(pid)
+            
+            self.rename_wake_event.wait(0.5)
+            self.rename_wake_event.clear()
     
     def _rename_roblox_window(self, pid, username):
         """Rename a Roblox window by PID"""
         try:
-            def enum_windows_callback(hwnd, pid_target):
-                _, found_pid = win32process.GetWindowThreadProcessId(hwnd)
-                if found_pid == pid_target:
-                    if win32gui.IsWindowVisible(hwnd):
-                        current_title = win32gui.GetWindowText(hwnd)
-                        if 'roblox' in current_title.lower():
-                            win32gui.SetWindowText(hwnd, username)
-                            return False
-                return True
-            
-            import win32process
-            win32gui.EnumWindows(enum_windows_callback, pid)
+            for hwnd in self.window_index.windows(pid):
+                if 'roblox' in self.window_index.get_title(hwnd).lower():
+                    self.window_index.set_title(hwnd, username)
+                    return True
         except Exception as e:
             print(f"[ERROR] Failed to rename window for PID {pid}: {e}")
+        return False
     
     def start_anti_afk(self):
-        """Start the Anti-AFK background thread"""
-        if self.anti_afk_thread and self.anti_afk_thread.is_alive():
+        """Start the Anti-AFK scheduler"""
+        if self.anti_afk and self.anti_afk.is_running():
             return
         
-        self.anti_afk_stop_event.clear()
-        self.anti_afk_thread = threading.Thread(target=self.anti_afk_worker, daemon=True)
-        self.anti_afk_thread.start()
-        print("[Anti-AFK] Started")
+        try:
+            backend = create_input_backend(self.settings.get("anti_afk_delivery", "foreground"))
+        except Exception as e:
+            print(f"[Anti-AFK] Could not create input backend: {e}")
+            return
+        self.window_index.start()
+        self.anti_afk = AntiAfkScheduler(self._list_roblox_windows, backend, self.settings)
+        self.anti_afk.start()
+        print(f"[Anti-AFK] Started ({backend.name} input)")
     
     def stop_anti_afk(self):
-        """Stop the Anti-AFK background thread"""
-        if self.anti_afk_thread and self.anti_afk_thread.is_alive():
-            self.anti_afk_stop_event.set()
-            self.anti_afk_thread.join(timeout=2)
+        """Stop the Anti-AFK scheduler"""
+        if self.anti_afk and self.anti_afk.is_running():
+            self.anti_afk.stop()
             print("[Anti-AFK] Stopped")
+        self.anti_afk = None
     
     def start_auto_rejoin_for_account(self, account):
-        """Start the auto-rejoin background thread for a specific account"""
-        if account in self.auto_rejoin_threads:
-            existing_thread = self.auto_rejoin_threads[account]
-            if existing_thread.is_alive():
-                print(f"[Auto-Rejoin] Thread already running for {account}")
-                return
-            else:
-                print(f"[Auto-Rejoin] Cleaning up dead thread for {account}")
-                del self.auto_rejoin_threads[account]
-        
-        if account not in self.auto_rejoin_configs:
-            print(f"[Auto-Rejoin] No config found for {account}")
-            return
-        
-        stop_event = threading.Event()
-        self.auto_rejoin_stop_events[account] = stop_event
-        
-        thread = threading.Thread(
-            target=self.auto_rejoin_worker_for_account,
-            args=(account,),
-            daemon=True,
-            name=f"AutoRejoin-{account}"  
-        )
-        self.auto_rejoin_threads[account] = thread
-        thread.start()
-        print(f"[Auto-Rejoin] Started thread {thread.name} for {account}")
+        """Start auto-rejoin supervision for a specific account"""
+        self.auto_rejoin.start(account)
     
     def stop_auto_rejoin_for_account(self, account):
-        """Stop the auto-rejoin background thread for a specific account"""
-        if account in self.auto_rejoin_stop_events:
-            self.auto_rejoin_stop_events[account].set()
-        
-        if account in self.auto_rejoin_threads:
-            thread = self.auto_rejoin_threads[account]
-            if thread.is_alive():
-                thread.join(timeout=2)
-            del self.auto_rejoin_threads[account]
-        
-        if account in self.auto_rejoin_stop_events:
-            del self.auto_rejoin_stop_events[account]
-        
-        print(f"[Auto-Rejoin] Stopped for {account}")
+        """Stop auto-rejoin supervision for a specific account"""
+        self.auto_rejoin.stop(account)
     
     def stop_all_auto_rejoin(self):
-        """Stop all auto-rejoin threads"""
-        for account in list(self.auto_rejoin_threads.keys()):
-            self.stop_auto_rejoin_for_account(account)
+        """Stop auto-rejoin for all accounts"""
+        self.auto_rejoin.stop_all()
     
     def is_roblox_running(self):
         """Check if any Roblox window exists"""
@@ -5646,639 +6089,9 @@ del /f /q "%~f0"
         except:
             return False
     
-    def is_player_in_game(self, user_id, cookie, expected_place_id):
-        """Check if player is still in the same game using Presence API"""
-        try:
-            presence = RobloxAPI.get_player_presence(user_id, cookie)
-            
-            if presence:
-                in_game = presence.get('in_game', False)
-                place_id = presence.get('place_id')
-                
-                print(f"[Auto-Rejoin] Presence check - in_game: {in_game}, place_id: {place_id}, expected: {expected_place_id}")
-                
-                if in_game:
-                    try:
-                        if int(place_id) == int(expected_place_id):
-                            print(f"[Auto-Rejoin] Player is in correct game")
-                            return True, place_id, presence.get('game_id')
-                    except (ValueError, TypeError):
-                        pass
-                
-                print(f"[Auto-Rejoin] Player NOT in game or wrong place_id")
-            else:
-                print(f"[Auto-Rejoin] Presence API returned None")
-            
-            return False, None, None
-        except Exception as e:
-            print(f"[Auto-Rejoin] Error checking player status: {e}")
-            traceback.print_exc()
-            return False, None, None
-    
-    def _check_roblox_process_exists(self, account):
-        """Check if the tracked Roblox process for this account still exists"""
-        if account not in self.auto_rejoin_pids:
-            return False
-        
-        pid = self.auto_rejoin_pids[account]
-        try:
-            result = subprocess.run(['tasklist', '/FI', f'PID eq {pid}'], 
-                                  capture_output=True, text=True, encoding='utf-8', errors='replace', creationflags=subprocess.CREATE_NO_WINDOW)
-            return f"{pid}" in result.stdout
-        except Exception as e:
-            print(f"[Auto-Rejoin] Error checking process {pid}: {e}")
-            return False
-    
-    def auto_rejoin_worker_for_account(self, account):
-        """Background worker that monitors for disconnection and rejoins for a specific account."""   
-        config = self.auto_rejoin_configs.get(account, {})
-        stop_event = self.auto_rejoin_stop_events.get(account)
-        
-        if not stop_event:
-            return
-        
-        stagger_delay = random.uniform(6.0, 9.0)
-        time.sleep(stagger_delay)
-        
-        retry_count = 0
-        max_retries = config.get('max_retries', 5)
-        check_interval = config.get('check_interval', 10)
-        place_id = config.get('place_id')
-        private_server = config.get('private_server', '')
-        job_id = config.get('job_id', '')
-        
-        if not place_id:
-            print(f"[Auto-Rejoin] Invalid configuration for {account}")
-            return
-        
-        if account not in self.manager.accounts:
-            print(f"[Auto-Rejoin] Account {account} not found")
-            return
-        
-        account_data = self.manager.accounts[account]
-        cookie = account_data.get('cookie')
-        
-        if 'user_id_cache' not in self.settings:
-            self.settings['user_id_cache'] = {}
-        
-        user_id = RobloxAPI.get_user_id_from_username(
-            account,
-            use_cache=True,
-            cache_dict=self.settings['user_id_cache']
-        )
-        if not user_id:
-            print(f"[Auto-Rejoin] Could not get user ID for {account}")
-            return
-        
-        try:
-            self.save_settings()
-        except Exception as e:
-            print(f"[Auto-Rejoin] Warning: Could not save user ID cache: {e}")
-        
-        print(f"[Auto-Rejoin] Started monitoring {account} for game {place_id}")
-
-        
-        consecutive_failed_checks = 0
-        max_consecutive_fails = 2
-        
-        if account in self.auto_rejoin_pids:
-            print(f"[Auto-Rejoin] [{account}] Using pre-matched PID {self.auto_rejoin_pids[account]}")
-        else:
-            print(f"[Auto-Rejoin] [{account}] No pre-matched PID - launching game...")
-            success = self._launch_and_track_pid(account, place_id, private_server, job_id)
-            if not success:
-                retry_count += 1
-                if retry_count >= max_retries:
-                    print(f"[Auto-Rejoin] [{account}] Max retries ({max_retries}) reached on initial launch. Stopping.")
-                    return
-            time.sleep(10)
-        
-        while not stop_event.is_set():
-            try:
-                check_presence = config.get('check_presence', True)
-                disconnect_detected = False
-                game_id = ''
-                
-                if check_presence:
-                    in_game, current_place_id, game_id = self.is_player_in_game(user_id, cookie, place_id)
-                    disconnect_detected = not in_game
-                    
-                    if disconnect_detected:
-                        consecutive_failed_checks += 1
-                        if consecutive_failed_checks < max_consecutive_fails:
-                            print(f"[Auto-Rejoin] [{account}] Presence check failed ({consecutive_failed_checks}/{max_consecutive_fails}), will verify next check")
-                            disconnect_detected = False
-                            time.sleep(check_interval)
-                            continue
-                    else:
-                        consecutive_failed_checks = 0
-                else:
-                    presence = RobloxAPI.get_player_presence(user_id, cookie)
-                    
-                    if presence:
-                        in_game = presence.get('in_game', False)
-                        current_place_id = presence.get('place_id')
-                        game_id = presence.get('game_id', '')
-                        
-                        print(f"[Auto-Rejoin] [{account}] Presence check (any game mode) - in_game: {in_game}, place_id: {current_place_id}")
-                        
-                        if in_game:
-                            print(f"[Auto-Rejoin] [{account}] Player is in a game (place_id: {current_place_id})")
-                            disconnect_detected = False
-                            consecutive_failed_checks = 0
-                        else:
-                            consecutive_failed_checks += 1
-                            if consecutive_failed_checks < max_consecutive_fails:
-                                print(f"[Auto-Rejoin] [{account}] Not in any game ({consecutive_failed_checks}/{max_consecutive_fails}), will verify next check")
-                                disconnect_detected = False
-                                time.sleep(check_interval)
-                                continue
-                            else:
-                                print(f"[Auto-Rejoin] [{account}] Player not in any game")
-                                disconnect_detected = True
-                    else:
-                        consecutive_failed_checks += 1
-                        if consecutive_failed_checks < max_consecutive_fails:
-                            print(f"[Auto-Rejoin] [{account}] Presence API failed ({consecutive_failed_checks}/{max_consecutive_fails}), will verify next check")
-                            disconnect_detected = False
-                            time.sleep(check_interval)
-                            continue
-                        else:
-                            print(f"[Auto-Rejoin] [{account}] Presence API returned None")
-                            disconnect_detected = True
-                
-                if disconnect_detected:
-                    retry_count += 1
-                    consecutive_failed_checks = 0
-                    print(f"[Auto-Rejoin] [{account}] Disconnection detected! Rejoining... (Attempt {retry_count}/{max_retries})")
-                    
-                    if account in self.auto_rejoin_pids:
-                        old_pid = self.auto_rejoin_pids[account]
-                        try:
-                            subprocess.run(['taskkill', '/F', '/PID', str(old_pid)], 
-                                         capture_output=True, text=True, encoding='utf-8', errors='replace', creationflags=subprocess.CREATE_NO_WINDOW)
-                            time.sleep(1)
-                            print(f"[Auto-Rejoin] [{account}] Closed old Roblox instance (PID: {old_pid})")
-                        except Exception as e:
-                            print(f"[Auto-Rejoin] [{account}] Error closing instance (PID: {old_pid}): {e}")
-                        del self.auto_rejoin_pids[account]
-                    
-                    rejoin_job_id = job_id if job_id else (game_id if game_id else '')
-                    success = self._launch_and_track_pid(account, place_id, private_server, rejoin_job_id)
-                    
-                    if success:
-                        print(f"[Auto-Rejoin] [{account}] Rejoin attempt successful")
-                        retry_count = 0
-                        time.sleep(10)
-                    else:
-                        if retry_count >= max_retries:
-                            print(f"[Auto-Rejoin] [{account}] Max retries ({max_retries}) reached. Stopping.")
-                            break
-                        time.sleep(check_interval)
-                else:
-                    print(f"[Auto-Rejoin] [{account}] Still in game {place_id}")
-                    retry_count = 0
-                    time.sleep(check_interval)
-                    
-            except Exception as e:
-                print(f"[Auto-Rejoin] [{account}] Error: {e}")
-                time.sleep(check_interval)
-    
-    def _launch_and_track_pid(self, account, place_id, private_server, job_id):
-        with self.auto_rejoin_launch_lock:
-            pids_before = self._get_roblox_pids()
-            
-            launcher_pref = self.settings.get("roblox_launcher", "default")
-            success = self.manager.launch_roblox(account, place_id, private_server, launcher_pref, job_id)
-            
-            if not success:
-                return False
-            
-            print(f"[Auto-Rejoin] [{account}] Game launched successfully")
-            
-            time.sleep(5)
-            
-            pids_after = self._get_roblox_pids()
-            new_pids = pids_after - pids_before
-            
-            if not new_pids:
-                print(f"[Auto-Rejoin] [{account}] No new Roblox processes detected")
-                return False
-            
-            available_pids = new_pids - set(self.auto_rejoin_pids.values())
-            
-            if available_pids:
-                new_pid = max(available_pids)
-                self.auto_rejoin_pids[account] = new_pid
-                print(f"[Auto-Rejoin] [{account}] Successfully tracked PID {new_pid}")
-                return True
-            else:
-                print(f"[Auto-Rejoin] [{account}] All new PIDs are already tracked by other accounts")
-                return False
-    
-    def _get_roblox_pids(self):
-        """Get all currently running RobloxPlayerBeta.exe PIDs using psutil."""
-        try:
-            return {
-                p.info["pid"]
-                for p in psutil.process_iter(["pid", "name"])
-                if p.info["name"] and p.info["name"].lower() == "robloxplayerbeta.exe"
-            }
-        except Exception as e:
-            print(f"[Auto-Rejoin] Error getting Roblox PIDs: {e}")
-            return set()
-    
-    def _is_pid_roblox_process(self, pid):
-        """Check if a specific PID is still a running RobloxPlayerBeta.exe process"""
-        try:
-            process = psutil.Process(pid)
-            return process.is_running() and process.name().lower() == "robloxplayerbeta.exe"
-        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-            return False
-        except Exception as e:
-            print(f"[Auto-Rejoin] Error checking PID {pid}: {e}")
-            return False
-    
-    def _match_pids_to_accounts(self, accounts):
-        """Match all running Roblox PIDs to accounts"""
-        print(f"[Auto-Rejoin] Starting global PID matching for {len(accounts)} account(s)...")
-        
-        if 'user_id_cache' not in self.settings:
-            self.settings['user_id_cache'] = {}
-        
-        account_user_ids = {}
-        for account in accounts:
-            user_id = RobloxAPI.get_user_id_from_username(
-                account,
-                use_cache=True,
-                cache_dict=self.settings['user_id_cache']
-            )
-            if user_id:
-                account_user_ids[account] = str(user_id)
-                print(f"[Auto-Rejoin] {account} -> User ID: {user_id}")
-            else:
-                print(f"[Auto-Rejoin] {account} -> Could not get user ID")
-        
-        try:
-            self.save_settings()
-        except Exception as e:
-            print(f"[Auto-Rejoin] Warning: Could not save user ID cache: {e}")
-        
-        all_pids = self._get_roblox_pids()
-        print(f"[Auto-Rejoin] Found {len(all_pids)} Roblox process(es)")
-        
-        if not all_pids:
-            return {}
-        
-        used_logs = set()
-        pid_user_ids = {}
-        for pid in all_pids:
-            if pid in self.auto_rejoin_pids.values():
-                print(f"[Auto-Rejoin] PID {pid} already tracked, skipping")
-                continue
-            
-            user_id, matched_log = self._get_user_id_from_pid(pid, used_logs)
-            if user_id:
-                pid_user_ids[pid] = str(user_id)
-                print(f"[Auto-Rejoin] PID {pid} -> User ID: {user_id}")
-            else:
-                print(f"[Auto-Rejoin] PID {pid} -> Could not extract user ID")
-        
-        matches = {}
-        for account, account_user_id in account_user_ids.items():
-            if account in self.auto_rejoin_pids:
-                continue
-                
-            for pid, pid_user_id in pid_user_ids.items():
-                if account_user_id == pid_user_id:
-                    matches[account] = pid
-                    self.auto_rejoin_pids[account] = pid
-                    print(f"[Auto-Rejoin] MATCHED: {account} (user {account_user_id}) -> PID {pid}")
-                    del pid_user_ids[pid]
-                    break
-        
-        unmatched = [acc for acc in accounts if acc not in matches and acc not in self.auto_rejoin_pids]
-        if unmatched:
-            print(f"[Auto-Rejoin] Unmatched accounts (will launch new): {unmatched}")
-        
-        return matches
-    
-    def _get_user_id_from_pid(self, pid, used_logs=None):
-        """Get user ID from a Roblox process PID"""
-        if used_logs is None:
-            used_logs = set()
-            
-        try:
-            process = psutil.Process(pid)
-            if not (process.is_running() and process.name().lower() == "robloxplayerbeta.exe"):
-                return None, None
-            
-            create_time_local = datetime.fromtimestamp(process.create_time())
-            create_time_utc = datetime.fromtimestamp(process.create_time(), tz=timezone.utc).replace(tzinfo=None)
-            
-            logs_dir = os.path.join(os.getenv("LOCALAPPDATA"), "Roblox", "logs")
-            if not os.path.exists(logs_dir):
-                return None, None
-            
-            time_window = timedelta(seconds=10)
-            matching_logs = []
-            
-            for filename in os.listdir(logs_dir):
-                if not filename.endswith("_last.log"):
-                    continue
-                
-                full_path = os.path.join(logs_dir, filename)
-                
-                if full_path in used_logs:
-                    continue
-                
-                match = re.search(r'(\d{8}T\d{6}Z)', filename)
-                if not match:
-                    continue
-                
-                timestamp_str = match.group(1)
-                try:
-                    log_time = datetime.strptime(timestamp_str, "%Y%m%dT%H%M%SZ")
-                    time_diff = (log_time - create_time_utc).total_seconds()
-                    
-                    if 0 <= time_diff <= 10:
-                        matching_logs.append((time_diff, full_path, log_time))
-                except ValueError:
-                    continue
-            
-            matching_logs.sort(key=lambda x: x[0])
-            
-            for time_diff, log_path, log_time in matching_logs:
-                try:
-                    with open(log_path, "r", encoding="utf-8", errors="ignore") as f:
-                        content = f.read(50000)
-                    
-                    if "userid:" in content:
-                        user_id = content.split("userid:")[1].split(",")[0].strip()
-                        if user_id.isdigit():
-                            used_logs.add(log_path)
-                            return user_id, log_path
-                except Exception as e:
-                    print(f"[Auto-Rejoin] Error reading log {log_path}: {e}")
-                    continue
-            
-            return None, None
-            
-        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-            return None, None
-        except Exception as e:
-            print(f"[Auto-Rejoin] Error getting user ID for PID {pid}: {e}")
-            return None, None
-      
-    def anti_afk_worker(self):
-        """Background worker that sends key presses to Roblox windows"""
-        last_window_count = 0
-        window_timers = {}
-        
-        while not self.anti_afk_stop_event.is_set():
-            try:
-                interval_minutes = self.settings.get("anti_afk_interval_minutes", 10)
-                key = self.settings.get("anti_afk_key", "w")
-                current_time = time.time()
-                
-                for _ in range(interval_minutes * 60):
-                    if self.anti_afk_stop_event.wait(1):
-                        return
-                
-                self.send_key_to_roblox_windows_staggered(key, window_timers, current_time)
-                
-            except Exception as e:
-                print(f"[Anti-AFK] Error: {e}")
-                time.sleep(5)
-    
-    def send_key_to_roblox_windows(self, action):
-        try:
-            user32 = ctypes.windll.user32
-            kernel32 = ctypes.windll.kernel32
-            
-            KEYEVENTF_KEYUP = 0x0002
-            SW_RESTORE = 9
-            SW_MINIMIZE = 6
-            MOUSEEVENTF_LEFTDOWN = 0x0002
-            MOUSEEVENTF_LEFTUP = 0x0004
-            MOUSEEVENTF_RIGHTDOWN = 0x0008
-            MOUSEEVENTF_RIGHTUP = 0x0010
-            
-            vk_codes = {
-                'w': 0x57, 'a': 0x41, 's': 0x53, 'd': 0x44,
-                'space': 0x20, ' ': 0x20,
-                'shift': 0x10, 'ctrl': 0x11, 'alt': 0x12
-            }
-            
-            is_mouse = action.upper() in ['LMB', 'RMB']
-            
-            if not is_mouse:
-                action_lower = action.lower()
-                if action_lower in vk_codes:
-                    vk_code = vk_codes[action_lower]
-                elif len(action) == 1:
-                    vk_code = ord(action.upper())
-                else:
-                    print(f"[Anti-AFK] Unknown action: {action}")
-                    return
-            
-            roblox_pids = set()
-            for proc in psutil.process_iter(['pid', 'name']):
-                try:
-                    if proc.info['name'] and proc.info['name'].lower() == 'robloxplayerbeta.exe':
-                        roblox_pids.add(proc.info['pid'])
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    pass
-            
-            if not roblox_pids:
-                return
-            
-            roblox_windows = []
-            
-            def enum_windows_callback(hwnd, lParam):
-                if user32.IsWindowVisible(hwnd):
-                    pid = wintypes.DWORD()
-                    user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
-                    if pid.value in roblox_pids:
-                        roblox_windows.append((hwnd, pid.value))
-                return True
-            
-            EnumWindowsProc = ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
-            user32.EnumWindows(EnumWindowsProc(enum_windows_callback), 0)
-            
-            if not roblox_windows:
-                return
-            
-            original_hwnd = user32.GetForegroundWindow()
-            current_thread_id = kernel32.GetCurrentThreadId()
-            
-            for hwnd, pid in roblox_windows:
-                try:
-                    was_minimized = user32.IsIconic(hwnd)
-                    if was_minimized:
-                        user32.ShowWindow(hwnd, SW_RESTORE)
-                        time.sleep(0.05)
-                    
-                    target_thread_id = user32.GetWindowThreadProcessId(hwnd, None)
-                    user32.AttachThreadInput(current_thread_id, target_thread_id, True)
-                    user32.BringWindowToTop(hwnd)
-                    user32.SetForegroundWindow(hwnd)
-                    user32.AttachThreadInput(current_thread_id, target_thread_id, False)
-                    time.sleep(0.1)
-                    
-                    if is_mouse:
-                        if action.upper() == 'LMB':
-                            user32.mouse_event(MOUSEEVENTF_LEFTDOWN, 0, 0, 0, 0)
-                            time.sleep(0.05)
-                            user32.mouse_event(MOUSEEVENTF_LEFTUP, 0, 0, 0, 0)
-                        elif action.upper() == 'RMB':
-                            user32.mouse_event(MOUSEEVENTF_RIGHTDOWN, 0, 0, 0, 0)
-                            time.sleep(0.05)
-                            user32.mouse_event(MOUSEEVENTF_RIGHTUP, 0, 0, 0, 0)
-                        print(f"[Anti-AFK] Sent {action} to PID {pid}")
-                    else:
-                        scan_code = user32.MapVirtualKeyW(vk_code, 0)
-                        user32.keybd_event(vk_code, scan_code, 0, 0)
-                        time.sleep(0.05)
-                        user32.keybd_event(vk_code, scan_code, KEYEVENTF_KEYUP, 0)
-                        print(f"[Anti-AFK] Sent '{action}' to PID {pid}")
-                    
-                    if was_minimized:
-                        user32.ShowWindow(hwnd, SW_MINIMIZE)
-                    
-                    time.sleep(0.1)
-                    
-                except Exception as e:
-                    print(f"[Anti-AFK] Error on PID {pid}: {e}")
-            
-            if original_hwnd:
-                try:
-                    prev_thread_id = user32.GetWindowThreadProcessId(original_hwnd, None)
-                    user32.AttachThreadInput(current_thread_id, prev_thread_id, True)
-                    user32.BringWindowToTop(original_hwnd)
-                    user32.SetForegroundWindow(original_hwnd)
-                    user32.AttachThreadInput(current_thread_id, prev_thread_id, False)
-                except:
-                    pass
-            
-        except Exception as e:
-            print(f"[Anti-AFK] Failed to send action: {e}")
-    
-    def send_key_to_roblox_windows_staggered(self, action, window_timers, current_time):
-        """Send key presses to Roblox windows"""
-        try:
-            user32 = ctypes.windll.user32
-            kernel32 = ctypes.windll.kernel32
-            
-            vk_codes = {
-                'w': 0x57, 'a': 0x41, 's': 0x53, 'd': 0x44,
-                'space': 0x20, ' ': 0x20,
-                'shift': 0x10, 'ctrl': 0x11, 'alt': 0x12
-            }
-            
-            KEYEVENTF_KEYUP = 0x0002
-            SW_RESTORE = 9
-            SW_MINIMIZE = 6
-            
-            is_mouse = action.upper() in ['LMB', 'RMB']
-            
-            if not is_mouse:
-                action_lower = action.lower()
-                if action_lower in vk_codes:
-                    vk_code = vk_codes[action_lower]
-                elif len(action) == 1:
-                    vk_code = ord(action.upper())
-                else:
-                    print(f"[Anti-AFK] Unknown action: {action}")
-                    return
-            
-            roblox_windows = []
-            
-            roblox_pids = set()
-            for proc in psutil.process_iter(['pid', 'name']):
-                try:
-                    if proc.info['name'] and proc.info['name'].lower() == 'robloxplayerbeta.exe':
-                        roblox_pids.add(proc.info['pid'])
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    pass
-            
-            if not roblox_pids:
-                print("[Anti-AFK] No RobloxPlayerBeta.exe processes found")
-                return
-            
-            def enum_windows_callback(hwnd, lParam):
-                if user32.IsWindowVisible(hwnd):
-                    pid = wintypes.DWORD()
-                    user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
-                    if pid.value in roblox_pids:
-                        roblox_windows.append(hwnd)
-                return True
-            
-            EnumWindowsProc = ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
-            user32.EnumWindows(EnumWindowsProc(enum_windows_callback), 0)
-            
-            if not roblox_windows:
-                print("[Anti-AFK] No Roblox game windows found")
-                return
-            
-            original_hwnd = user32.GetForegroundWindow()
-            current_thread_id = kernel32.GetCurrentThreadId()
-            
-            print(f"[Anti-AFK] Found {len(roblox_windows)} Roblox instance(s)")
-            
-            for idx, hwnd in enumerate(roblox_windows):
-                try:
-                    print(f"[Anti-AFK] Processing instance {idx + 1}...")
-                    
-                    was_minimized = user32.IsIconic(hwnd)
-                    if was_minimized:
-                        user32.ShowWindow(hwnd, SW_RESTORE)
-                        time.sleep(0.05)
-                    
-                    user32.SetForegroundWindow(hwnd)
-                    time.sleep(0.05)
-                    
-                    for repeat in range(3):
-                        if is_mouse:
-                            MOUSEEVENTF_LEFTDOWN = 0x0002
-                            MOUSEEVENTF_LEFTUP = 0x0004
-                            MOUSEEVENTF_RIGHTDOWN = 0x0008
-                            MOUSEEVENTF_RIGHTUP = 0x0010
-                            
-                            if action.upper() == 'LMB':
-                                user32.mouse_event(MOUSEEVENTF_LEFTDOWN, 0, 0, 0, 0)
-                                time.sleep(0.015)
-                                user32.mouse_event(MOUSEEVENTF_LEFTUP, 0, 0, 0, 0)
-                            elif action.upper() == 'RMB':
-                                user32.mouse_event(MOUSEEVENTF_RIGHTDOWN, 0, 0, 0, 0)
-                                time.sleep(0.015)
-                                user32.mouse_event(MOUSEEVENTF_RIGHTUP, 0, 0, 0, 0)
-                        else:
-                            scan_code = user32.MapVirtualKeyW(vk_code, 0)
-                            user32.keybd_event(vk_code, scan_code, 0, 0)
-                            time.sleep(0.015)
-                            user32.keybd_event(vk_code, scan_code, KEYEVENTF_KEYUP, 0)
-                    
-                    print(f"[Anti-AFK] Sent '{action}' to Roblox instance {idx + 1}")
-                    
-                    if was_minimized:
-                        user32.ShowWindow(hwnd, SW_MINIMIZE)
-                    
-                except Exception as e:
-                    print(f"[Anti-AFK] Error on instance {idx + 1}: {e}")
-            
-            if original_hwnd:
-                prev_thread_id = user32.GetWindowThreadProcessId(original_hwnd, None)
-                user32.AttachThreadInput(current_thread_id, prev_thread_id, True)
-                user32.BringWindowToTop(original_hwnd)
-                user32.SetForegroundWindow(original_hwnd)
-                user32.AttachThreadInput(current_thread_id, prev_thread_id, False)
-            
-            print(f"[Anti-AFK] Completed for {len(roblox_windows)} instance(s)")
-            
-        except Exception as e:
-            print(f"[Anti-AFK] Failed: {e}")
-            traceback.print_exc()
+    def _list_roblox_windows(self):
+        """Visible windows of running Roblox clients as {pid: [hwnd, ...]}"""
+        return self.window_index.all_windows(max_age=5.0)
     
     def open_roblox_settings_window(self):
         """Open Roblox Settings window to view/edit GlobalBasicSettings_13.xml"""